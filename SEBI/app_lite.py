@@ -1,11 +1,23 @@
 import streamlit as st
-from modules.tutorials import render_tutorials
-from modules.quizzes import render_quizzes
-from modules.simulator_lite import render_simulator
-from modules.utils_lite import ensure_session_state, render_learn_hub, load_state, save_state
-from modules.dashboard import render_dashboard
-from modules.risk_profiler import render_risk_profiler
-
+from modules.persistence import load_state, save_state
+from modules.utils_lite import ensure_session_state
+from modules.metrics import get_metrics
+from modules.pages import admin_enabled, lazy_page, render_page, render_resources
+
+
+# Page modules (and pandas, plotly, NLP libraries behind them) are imported only when their page is opened
+PAGES = {
+	"Dashboard": lazy_page('modules.dashboard', 'render_dashboard'),
+	"Tutorials": lazy_page('modules.tutorials', 'render_tutorials'),
+	"Quizzes": lazy_page('modules.quizzes', 'render_quizzes'),
+	"Virtual Trading": lazy_page('modules.simulator_lite', 'render_simulator'),
+	"Backtest": lazy_page('modules.backtest', 'render_backtest', synthetic=True),
+	"Learn Hub": lazy_page('modules.utils_lite', 'render_learn_hub'),
+	"Risk Profiler": lazy_page('modules.risk_profiler', 'render_risk_profiler'),
+	"Resources": render_resources,
+}
+if admin_enabled():
+	PAGES["Metrics"] = lazy_page('modules.admin', 'render_admin')
 
 st.set_page_config(page_title="Investor Education Prototype", page_icon="📈", layout="wide")
 
@@ -14,37 +26,8 @@ load_state()
 
 st.sidebar.title("Investor Education")
 st.sidebar.info("Educational prototype inspired by SEBI's investor education initiative.")
-page = st.sidebar.radio(
-	"Navigate",
-	[
-		"Dashboard",
-		"Tutorials",
-		"Quizzes",
-		"Virtual Trading",
-		"Learn Hub",
-		"Risk Profiler",
-		"Resources",
-	],
-)
-
-if page == "Dashboard":
-	render_dashboard()
-elif page == "Tutorials":
-	render_tutorials()
-elif page == "Quizzes":
-	render_quizzes()
-elif page == "Virtual Trading":
-	render_simulator()
-elif page == "Learn Hub":
-	render_learn_hub()
-elif page == "Risk Profiler":
-	render_risk_profiler()
-else:
-	st.title('Resources')
-	st.markdown('- [SEBI - Investor Education](https://investor.sebi.gov.in)')
-	st.markdown('- [NISM Certifications](https://www.nism.ac.in)')
-	st.markdown('- [NSE Investor](https://www.nseindia.com/invest)')
-	st.markdown('- [BSE Investor](https://www.bseindia.com/investors)')
+page = st.sidebar.radio("Navigate", list(PAGES))
+render_page(PAGES, page)
 
 # Certificate download when quiz score high
 best = st.session_state.get('best_quiz_score', 0)
@@ -56,8 +39,13 @@ if best >= 4:
 		mime="text/plain",
 	)
 
+st.sidebar.caption(f"Profile: {st.session_state['user_id']} (add ?user=<name> to the URL to switch; profiles are not password-protected)")
 if st.sidebar.button("Save Progress"):
-	save_state()
-	st.sidebar.success("Saved!")
+	if save_state():
+		st.sidebar.success("Saved!")
+	else:
+		st.sidebar.error("Could not save progress. Please try again.")
 
 st.caption("© 2025 Investor Education Prototype • For education only")
+
+get_metrics().export()
@@ -0,0 +1,37 @@
+"""Backtest throughput on a synthetic universe.
+
+Run from the SEBI directory:  python -m benchmarks.bench_backtest --symbols 500 --years 10
+"""
+import argparse
+import time
+
+from modules.backtest import STRATEGIES, run_backtest, summarize, sweep
+from modules.synthetic import generate_prices
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--symbols', type=int, default=500)
+	parser.add_argument('--years', type=int, default=10)
+	parser.add_argument('--workers', type=int, default=None)
+	args = parser.parse_args()
+
+	t0 = time.perf_counter()
+	close = generate_prices([f"SYM{i:04d}" for i in range(args.symbols)], args.years * 252, n_factors=3)
+	print(f"data        {close.shape[1]} symbols x {close.shape[0]} bars in {time.perf_counter() - t0:.2f}s")
+
+	for name, strategy in STRATEGIES.items():
+		t0 = time.perf_counter()
+		summarize(run_backtest(close, strategy(close)))
+		print(f"{name:<12}{(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+	grid = {'fast': list(range(5, 55, 5)), 'slow': list(range(30, 230, 20))}
+	for workers in (1, args.workers):
+		t0 = time.perf_counter()
+		result = sweep(close, 'SMA Crossover', grid, max_workers=workers)
+		label = 'serial' if workers == 1 else f"pool({workers or 'auto'})"
+		print(f"sweep {label:<10}{len(result)} combos in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == '__main__':
+	main()
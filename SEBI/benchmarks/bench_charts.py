@@ -0,0 +1,55 @@
+"""Server-side chart cost and payload for a watchlist, before and after downsampling and point caching.
+
+Run from the SEBI directory:  python -m benchmarks.bench_charts --symbols 50 --days 2500
+Payload is the JSON spec st.plotly_chart sends to the browser; time covers figure
+construction plus that serialisation, which Streamlit repeats on every rerun.
+"""
+import argparse
+import time
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from modules import charts
+from modules.synthetic import generate_prices
+
+
+def _full_figure(dates, close, title: str) -> go.Figure:
+	# The per-rerun chart the simulator drew before
+	fig = go.Figure()
+	fig.add_trace(go.Scatter(x=dates, y=close, mode='lines', name='Close'))
+	fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Price')
+	return fig
+
+
+def _render(closes, build) -> tuple:
+	t0 = time.perf_counter()
+	size = 0
+	for sym in closes.columns:
+		fig = build(closes.index, closes[sym].to_numpy(), sym)
+		# What st.plotly_chart does with a Figure
+		size += len(pio.to_json(fig.to_dict(), validate=False))
+	return time.perf_counter() - t0, size
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--symbols', type=int, default=50)
+	parser.add_argument('--days', type=int, default=2500)
+	args = parser.parse_args()
+
+	closes = generate_prices([f"SYM{i}" for i in range(args.symbols)], args.days)
+	# Warm plotly's validators so neither side pays for them
+	_render(closes.iloc[:10, :1], _full_figure)
+
+	full = _render(closes, _full_figure)
+	cold = _render(closes, charts.price_figure)
+	warm = _render(closes, charts.price_figure)
+	print(f"{args.symbols} symbols x {args.days} days, at most {charts.MAX_POINTS} points per chart")
+	for name, (secs, size) in (('full series', full), ('LTTB, first run', cold), ('LTTB, rerun', warm)):
+		print(f"{name:<18}{secs * 1000:>8.0f} ms {size / 1024:>9.0f} KB")
+	print(f"rerun speed-up     {full[0] / warm[0]:.1f}x, payload {full[1] / warm[1]:.1f}x smaller")
+
+
+if __name__ == '__main__':
+	main()
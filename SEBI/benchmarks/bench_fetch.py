@@ -0,0 +1,103 @@
+"""Streaming page-text extraction against a full download parsed with BeautifulSoup.
+
+Run from the SEBI directory:  python -m benchmarks.bench_fetch --mb 5
+Pages are served from a local HTTP server, so only read and parse costs are measured.
+The BeautifulSoup baseline needs beautifulsoup4, which the app itself no longer
+depends on; without it only the streaming rows are printed.
+"""
+import argparse
+import importlib.util
+import random
+import threading
+import time
+import tempfile
+import tracemalloc
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from modules.textproc import fetch_text_with_stats, http_session
+
+
+def _page(size: int, seed: int = 0) -> str:
+	# A listing-style page: many table rows with links, plus inline scripts and styles
+	rng = random.Random(seed)
+	words = 'circular master investor margin broker settlement disclosure mutual fund order SEBI'.split()
+	rows, total = [], 0
+	while total < size:
+		row = (
+			f"<tr><td>{rng.randint(1, 28)} Jan 2024</td><td><a href='/legal/{len(rows)}.html'>"
+			+ ' '.join(rng.choices(words, k=rng.randint(6, 16)))
+			+ "</a></td></tr>"
+		)
+		if len(rows) % 50 == 0:
+			row += "<script>window.dataLayer.push({'row': %d});</script><style>.r%d{color:#333}</style>" % (len(rows), len(rows))
+		rows.append(row)
+		total += len(row)
+	return "<html><head><title>Circulars</title></head><body><table>" + ''.join(rows) + "</table></body></html>"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+	def log_message(self, *args) -> None:
+		pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+	# The streaming reader hangs up once it has enough text
+	def handle_error(self, request, client_address) -> None:
+		pass
+
+
+def _bs4_fetch(url: str) -> str:
+	from bs4 import BeautifulSoup
+	resp = http_session().get(url, timeout=15)
+	soup = BeautifulSoup(resp.text, 'html.parser')
+	for tag in soup(['script', 'style', 'noscript']):
+		tag.decompose()
+	return ' '.join(soup.get_text(separator=' ').split())[:100000]
+
+
+def _measure(fn):
+	tracemalloc.start()
+	t0 = time.perf_counter()
+	out = fn()
+	elapsed = time.perf_counter() - t0
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return out, elapsed, peak
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--mb', type=float, nargs='+', default=[0.5, 2, 5])
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		for mb in args.mb:
+			(Path(tmp) / f"{mb}.html").write_text(_page(int(mb * 2**20)), encoding='utf-8')
+		server = _QuietServer(('127.0.0.1', 0), partial(_QuietHandler, directory=tmp))
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		base = f"http://127.0.0.1:{server.server_address[1]}"
+		try:
+			baseline = importlib.util.find_spec('bs4') is not None
+			if not baseline:
+				print('beautifulsoup4 is not installed (pip install beautifulsoup4); skipping the bs4 baseline')
+			print(f"{'page':>8} {'method':<10}{'time':>9}{'peak mem':>11}{'read':>10}  stages")
+			for mb in args.mb:
+				url = f"{base}/{mb}.html"
+				if baseline:
+					full, elapsed, peak = _measure(lambda: _bs4_fetch(url))
+					print(f"{mb:>6}MB {'bs4':<10}{elapsed * 1000:>7.0f}ms{peak / 2**20:>9.1f}MB{mb:>8.1f}MB")
+				(text, stats), elapsed, peak = _measure(lambda: fetch_text_with_stats(url))
+				stages = ' '.join(f"{k} {v * 1000:.0f}ms" for k, v in stats['timings'].items())
+				same = f"  same text: {text == full}" if baseline else ''
+				print(
+					f"{mb:>6}MB {'streaming':<10}{elapsed * 1000:>7.0f}ms{peak / 2**20:>9.1f}MB"
+					f"{stats['bytes'] / 2**20:>8.1f}MB  {stages}{same}"
+				)
+		finally:
+			server.shutdown()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,46 @@
+"""Leaderboard insert and query latency at scale.
+
+Run from the SEBI directory:  python -m benchmarks.bench_leaderboard --entries 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from modules.leaderboard import Leaderboard
+
+
+def _timed(label: str, fn, repeat: int) -> None:
+	t0 = time.perf_counter()
+	for _ in range(repeat):
+		fn()
+	per_call = (time.perf_counter() - t0) / repeat
+	print(f"{label:<26}{per_call * 1e6:10.1f} us")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--entries', type=int, default=1_000_000)
+	parser.add_argument('--players', type=int, default=200_000)
+	args = parser.parse_args()
+
+	rng = random.Random(0)
+	with tempfile.TemporaryDirectory() as tmp:
+		board = Leaderboard(Path(tmp) / 'bench.sqlite3')
+		t0 = time.perf_counter()
+		batch = 50_000
+		for lo in range(0, args.entries, batch):
+			n = min(batch, args.entries - lo)
+			board.record_many((f"player{rng.randrange(args.players)}", rng.randint(0, 5), lo + i) for i in range(n))
+		print(f"bulk load {args.entries} entries in {time.perf_counter() - t0:.1f}s ({board.size()} players)")
+
+		_timed('single insert', lambda: board.record(f"player{rng.randrange(args.players)}", rng.randint(0, 5)), 500)
+		_timed('top 10', lambda: board.top(10), 1000)
+		_timed('page 100 (25/page)', lambda: board.page(100), 200)
+		_timed('rank of user', lambda: board.rank_of(f"player{rng.randrange(args.players)}"), 200)
+		_timed('user history', lambda: board.history(f"player{rng.randrange(args.players)}"), 1000)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,329 @@
+"""Concurrent-session load test: N simulated learners walking the real pages in one server process.
+
+Run from the SEBI directory:  python -m benchmarks.bench_load [--app app_lite.py] [--sessions 1,4,16] [--duration 20]
+Each N runs in a fresh interpreter, as ``streamlit run`` would: N threads each drive
+their own ``AppTest`` session (own session state and ``?user=`` profile) while
+``st.cache_data`` and the on-disk stores are shared, so sessions contend for the GIL,
+the caches and SQLite the way browser tabs on one server do. Sessions loop over the
+journeys below until the duration is up; every rerun is timed. Reported per N:
+rerun latency percentiles, reruns per second, and resident memory added per session.
+Prices come from the synthetic provider and translations from the local stand-in.
+The harness patches Streamlit's test internals, so it needs the streamlit pinned in
+requirements.txt and exits with a message on a release that has moved them.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_DOCS = [
+	' '.join(
+		f"Investors must check the {topic} before they trade. SEBI circular {k}.{i} sets out how brokers report {topic}. "
+		f"A margin shortfall on {topic} is settled within two days."
+		for i in range(30)
+	)
+	for k, topic in enumerate(['client margin', 'mutual fund NAV', 'IPO allotment', 'demat pledge', 'stock lending'])
+]
+
+
+def _rss_mb() -> float:
+	try:
+		with open('/proc/self/status', encoding='ascii') as f:
+			for line in f:
+				if line.startswith('VmRSS:'):
+					return int(line.split()[1]) / 1024
+	except OSError:
+		pass
+	import resource
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _goto(at, page: str):
+	radio = at.sidebar.radio[0]
+	label = next((o for o in radio.options if o.startswith(page)), None)
+	return radio.set_value(label).run() if label else None
+
+
+def _widget(items, label: str):
+	return next((w for w in items if w.label == label), None)
+
+
+def journey_dashboard(at, rng: random.Random):
+	yield 'dashboard', lambda: _goto(at, 'Dashboard')
+
+
+def journey_quiz(at, rng: random.Random):
+	yield 'quiz.open', lambda: _goto(at, 'Quizzes')
+
+	def answer():
+		for radio in at.main.radio:
+			# Quiz radios take option indexes
+			radio.set_value(rng.randrange(len(radio.options)))
+		button = _widget(at.main.button, 'Submit Quiz')
+		return button.click().run() if button else at.run()
+
+	yield 'quiz.submit', answer
+
+
+def journey_trade(at, rng: random.Random):
+	yield 'trade.open', lambda: _goto(at, 'Virtual Trading')
+	for side in ('buy', 'sell'):
+		def order(side=side):
+			buttons = [b for b in at.main.button if (b.key or '').startswith(f"{side}_")]
+			return rng.choice(buttons).click().run() if buttons else at.run()
+
+		yield f"trade.{side}", order
+
+
+def journey_learn(at, rng: random.Random):
+	yield 'learn.open', lambda: _goto(at, 'Learn Hub')
+
+	def process():
+		text, button = _widget(at.main.text_area, 'Or paste text'), _widget(at.main.button, 'Process')
+		if text is None or button is None:
+			# The lite app's Learn Hub is a static page
+			return at.run()
+		text.set_value(rng.choice(_DOCS))
+		return button.click().run()
+
+	yield 'learn.process', process
+
+
+JOURNEYS = [journey_dashboard, journey_quiz, journey_trade, journey_learn]
+
+
+# The harness replaces these Streamlit internals (see _share_runtime). They are not
+# public API, so it targets the streamlit pinned in requirements.txt and refuses to
+# run on a release that has moved any of them.
+STREAMLIT_VERSION = '1.37.1'
+_INTERNALS = {
+	'streamlit.config': ('get_option',),
+	'streamlit.runtime': ('Runtime.instance', 'Runtime.exists'),
+	'streamlit.runtime.caching.storage.dummy_cache_storage': ('MemoryCacheStorageManager',),
+	'streamlit.runtime.media_file_manager': ('MediaFileManager',),
+	'streamlit.runtime.memory_media_file_storage': ('MemoryMediaFileStorage',),
+	'streamlit.runtime.scriptrunner.script_cache': ('ScriptCache',),
+	'streamlit.testing.v1.app_test': ('patch_config_options',),
+	'streamlit.testing.v1.local_script_runner': ('ScriptCache',),
+	'streamlit.testing.v1.util': ('build_mock_config_get_option',),
+}
+
+
+def check_streamlit() -> None:
+	"""Exit with a clear message when the installed Streamlit lacks an internal the harness patches."""
+	import streamlit
+
+	missing = []
+	for module, attrs in _INTERNALS.items():
+		try:
+			found = importlib.import_module(module)
+		except ImportError:
+			missing.append(module)
+			continue
+		for attr in attrs:
+			obj = found
+			for part in attr.split('.'):
+				obj = getattr(obj, part, None)
+			if obj is None:
+				missing.append(f"{module}.{attr}")
+	if missing:
+		raise SystemExit(
+			f"bench_load drives Streamlit internals that streamlit {streamlit.__version__} does not have: {', '.join(missing)}. "
+			f"It targets streamlit=={STREAMLIT_VERSION}; install that version (pip install -r requirements.txt) to run it."
+		)
+	if streamlit.__version__ != STREAMLIT_VERSION:
+		print(f"warning: bench_load targets streamlit {STREAMLIT_VERSION}, found {streamlit.__version__}", file=sys.stderr)
+
+
+def _share_runtime() -> None:
+	"""Let many AppTest sessions run at once in one process.
+
+	Every ``AppTest.run`` installs its own mock Runtime and config patch and removes
+	them when it finishes, which pulls them out from under sessions running on
+	other threads, and compiles the script afresh (concurrent compiles can fail on
+	CPython 3.11). Install one runtime, config patch and script cache for the whole
+	process instead, as a server has for all its sessions.
+	"""
+	check_streamlit()
+	from contextlib import nullcontext
+	from unittest.mock import MagicMock
+
+	from streamlit import config
+	from streamlit.runtime import Runtime
+	from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+	from streamlit.runtime.media_file_manager import MediaFileManager
+	from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+	from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+	from streamlit.testing.v1 import app_test, local_script_runner, util
+
+	runtime = MagicMock(spec=Runtime)
+	runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+	runtime.cache_storage_manager = MemoryCacheStorageManager()
+	Runtime.instance = classmethod(lambda cls: runtime)
+	Runtime.exists = classmethod(lambda cls: True)
+	config.get_option = util.build_mock_config_get_option({'global.appTest': True})
+	app_test.patch_config_options = lambda overrides: nullcontext()
+	script_cache = ScriptCache()
+	local_script_runner.ScriptCache = lambda: script_cache
+
+
+def _session(k: int, app: str, clock: dict, think: float, samples: list, errors: list, ready: threading.Barrier) -> None:
+	from streamlit.testing.v1 import AppTest
+
+	rng = random.Random(k)
+	at = AppTest.from_file(app, default_timeout=300)
+	at.query_params['user'] = f"load{k}"
+	at.run()
+	ready.wait()
+	deadline = clock['deadline']
+	while time.perf_counter() < deadline:
+		for name, step in rng.choice(JOURNEYS)(at, rng):
+			t0 = time.perf_counter()
+			try:
+				step()
+			except Exception as e:
+				errors.append(f"{name}: {type(e).__name__}: {e}")
+			samples.append((name, time.perf_counter() - t0))
+			if at.exception:
+				errors.append(f"{name}: {at.exception[0].message}")
+			if think:
+				time.sleep(think * rng.uniform(0.5, 1.5))
+			if time.perf_counter() >= deadline:
+				break
+
+
+def _warm_up(app: str) -> None:
+	# Imports, price downloads and summaries once, so memory per session counts only session state
+	from streamlit.testing.v1 import AppTest
+
+	at = AppTest.from_file(app, default_timeout=300)
+	at.query_params['user'] = 'warmup'
+	at.run()
+	rng = random.Random(-1)
+	for journey in JOURNEYS:
+		for _, step in journey(at, rng):
+			step()
+
+
+def child(app: str, sessions: int, duration: float, think: float) -> dict:
+	sys.path.insert(0, str(ROOT))
+	_share_runtime()
+	_warm_up(app)
+	rss_before = _rss_mb()
+	samples, errors = [], []
+	clock = {}
+
+	def start_clock() -> None:
+		# Runs once every session has loaded its first page, before any is released
+		clock['start'] = time.perf_counter()
+		clock['deadline'] = clock['start'] + duration
+		clock['rss_loaded'] = _rss_mb()
+
+	ready = threading.Barrier(sessions + 1, action=start_clock)
+	threads = [
+		threading.Thread(target=_session, args=(k, app, clock, think, samples, errors, ready), daemon=True)
+		for k in range(sessions)
+	]
+	for t in threads:
+		t.start()
+	ready.wait()
+	for t in threads:
+		t.join()
+	elapsed = time.perf_counter() - clock['start']
+	return {
+		'sessions': sessions,
+		'elapsed': elapsed,
+		'samples': samples,
+		'errors': errors[:20],
+		'error_count': len(errors),
+		'rss_before_mb': rss_before,
+		'rss_loaded_mb': clock['rss_loaded'],
+		'rss_after_mb': _rss_mb(),
+	}
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+	if not sorted_values:
+		return 0.0
+	return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run(app: str, sessions: int, duration: float, think: float) -> dict:
+	env = dict(os.environ, SEBI_MARKET_DATA='synthetic', SEBI_TRANSLATOR='local', PYTHONWARNINGS='ignore')
+	with tempfile.TemporaryDirectory(prefix='sebi-load-', ignore_cleanup_errors=True) as home:
+		env['HOME'] = home
+		proc = subprocess.run(
+			[sys.executable, '-m', 'benchmarks.bench_load', '--child', '--app', app,
+			 '--sessions', str(sessions), '--duration', str(duration), '--think', str(think)],
+			cwd=ROOT, env=env, capture_output=True, text=True,
+		)
+	if proc.returncode:
+		raise SystemExit(f"{sessions} sessions failed:\n{proc.stderr[-2000:]}")
+	return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--app', default='app.py')
+	parser.add_argument('--sessions', default='1,2,4,8,16', help='comma-separated session counts')
+	parser.add_argument('--duration', type=float, default=20.0, help='seconds of load per session count')
+	parser.add_argument('--think', type=float, default=0.0, help='mean pause between clicks, seconds (0 = back to back)')
+	parser.add_argument('--detail', action='store_true', help='per-step latency at each session count')
+	parser.add_argument('--save', help='write the summary to this JSON file')
+	parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		print(json.dumps(child(args.app, int(args.sessions), args.duration, args.think)))
+		return
+
+	check_streamlit()
+	print(f"{args.app}: {args.duration:.0f}s per run, think time {args.think}s, {os.cpu_count()} CPU(s)")
+	print(f"{'sessions':>8}{'reruns':>8}{'per s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}{'RSS':>9}{'per session':>13}")
+	summary = []
+	for n in (int(s) for s in args.sessions.split(',')):
+		result = run(args.app, n, args.duration, args.think)
+		latencies = sorted(s for _, s in result['samples'])
+		row = {
+			'sessions': n,
+			'reruns': len(latencies),
+			'throughput': len(latencies) / result['elapsed'],
+			'p50_ms': _percentile(latencies, 0.50) * 1000,
+			'p95_ms': _percentile(latencies, 0.95) * 1000,
+			'p99_ms': _percentile(latencies, 0.99) * 1000,
+			'errors': result['error_count'],
+			'rss_mb': result['rss_after_mb'],
+			'mb_per_session': (result['rss_after_mb'] - result['rss_before_mb']) / n,
+		}
+		summary.append(row)
+		print(
+			f"{n:>8}{row['reruns']:>8}{row['throughput']:>8.1f}{row['p50_ms']:>7.0f}ms{row['p95_ms']:>7.0f}ms"
+			f"{row['p99_ms']:>7.0f}ms{row['errors']:>8}{row['rss_mb']:>7.0f}MB{row['mb_per_session']:>11.1f}MB"
+		)
+		for error in result['errors'][:3]:
+			print(f"{'':>8}  {error}")
+		if args.detail:
+			steps = {}
+			for name, secs in result['samples']:
+				steps.setdefault(name, []).append(secs)
+			for name, values in sorted(steps.items()):
+				values.sort()
+				print(f"{'':>8}  {name:<16}{len(values):>6}{_percentile(values, 0.5) * 1000:>9.0f}ms{_percentile(values, 0.95) * 1000:>7.0f}ms")
+	if args.save:
+		with open(args.save, 'w', encoding='utf-8') as f:
+			json.dump({'app': args.app, 'duration': args.duration, 'think': args.think, 'runs': summary}, f, indent='\t')
+			f.write('\n')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,55 @@
+"""Risk-profile optimizer on large universes: covariance estimate (cold and cached), risk parity, mean-variance.
+
+Run from the SEBI directory:  python -m benchmarks.bench_optimizer [--symbols 50,200,500,800] [--days 365]
+"cached" and "rerun" are a repeat of the estimate and of a whole allocation with unchanged prices.
+Prices are synthetic with three common factors, so the sample covariance is far
+from diagonal and, at several hundred symbols, close to singular.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from modules import optimizer
+from modules.synthetic import generate_prices
+
+
+def _ms(fn, repeat: int = 3):
+	best, out = float('inf'), None
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		out = fn()
+		best = min(best, time.perf_counter() - t0)
+	return best * 1000, out
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--symbols', default='50,200,500,800')
+	parser.add_argument('--days', type=int, default=365)
+	args = parser.parse_args()
+
+	print(f"{'symbols':>8}{'estimate':>10}{'cached':>9}{'risk par':>10}{'mean-var':>10}{'rerun':>8}{'shrink':>8}{'cond':>10}{'sample cond':>13}")
+	for n in (int(s) for s in args.symbols.split(',')):
+		close = generate_prices([f"SYM{k}" for k in range(n)], args.days, n_factors=3)
+		cold, est = _ms(lambda: optimizer.estimate(close), 1)
+		optimizer.cached_estimate(close)
+		warm, _ = _ms(lambda: optimizer.cached_estimate(close))
+		limits = optimizer.PROFILE_LIMITS['Balanced']
+		rp_ms, rp = _ms(lambda: optimizer.risk_parity(est.cov, limits['max_weight']))
+		mv_ms, mv = _ms(lambda: optimizer.mean_variance(
+			est.mu * optimizer.TRADING_DAYS, est.cov * optimizer.TRADING_DAYS, limits['risk_aversion'], limits['max_weight']))
+		optimizer.cached_allocation(close, 'Balanced', 'Mean-variance')
+		rerun, _ = _ms(lambda: optimizer.cached_allocation(close, 'Balanced', 'Mean-variance'))
+		contributions = rp * (est.cov @ rp)
+		assert abs(rp.sum() - 1) < 1e-9 and abs(mv.sum() - 1) < 1e-6 and mv.max() <= limits['max_weight'] + 1e-12
+		assert contributions.max() / contributions.min() < 1.001, 'risk contributions should be equal'
+		returns = np.diff(np.log(close.to_numpy()), axis=0)
+		print(
+			f"{n:>8}{cold:>8.1f}ms{warm:>7.1f}ms{rp_ms:>8.1f}ms{mv_ms:>8.1f}ms{rerun:>6.1f}ms{est.shrinkage:>8.2f}"
+			f"{np.linalg.cond(est.cov):>10.0f}{np.linalg.cond(np.cov(returns, rowvar=False)):>13.2e}"
+		)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,99 @@
+"""Order submission and matching throughput of the simulator's order books.
+
+Run from the SEBI directory:  python -m benchmarks.bench_orderbook --orders 100000 --symbols 50 --bars 250
+Resting limit and stop orders are spread around each symbol's price, then a year of
+bars is replayed; a linear scan over every open order per bar is timed for comparison.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.orderbook import MatchingEngine, last_bar
+from modules.synthetic import generate_prices
+
+
+def _bars(closes: pd.DataFrame, rng: np.random.Generator) -> dict:
+	out = {}
+	for sym in closes.columns:
+		close = closes[sym].to_numpy()
+		spread = np.abs(rng.normal(0, 0.01, len(close))) * close
+		out[sym] = pd.DataFrame({
+			'Date': closes.index, 'Open': np.roll(close, 1), 'High': close + spread, 'Low': close - spread,
+			'Close': close, 'Volume': rng.integers(50_000, 500_000, len(close)).astype(float),
+		})
+	return out
+
+
+def _orders(closes: pd.DataFrame, n: int, rng: np.random.Generator) -> list:
+	start = closes.iloc[0]
+	syms = rng.choice(closes.columns.to_numpy(), n)
+	kinds = rng.choice(['limit', 'stop'], n, p=[0.7, 0.3])
+	sides = rng.choice([1, -1], n)
+	offset = rng.uniform(0.01, 0.3, n)
+	out = []
+	for sym, kind, side, off in zip(syms, kinds, sides, offset):
+		# Limits rest below (buys) / above (sells) the market, stops the other way round
+		away = -side if kind == 'limit' else side
+		out.append((sym, int(side), int(rng.integers(1, 100)), kind, float(start[sym] * (1 + away * off))))
+	return out
+
+
+def _naive_replay(orders: list, bars: dict) -> int:
+	# Every open order checked against every bar
+	high = {sym: df['High'].to_numpy() for sym, df in bars.items()}
+	low = {sym: df['Low'].to_numpy() for sym, df in bars.items()}
+	open_orders, fills = list(orders), 0
+	for i in range(1, len(next(iter(bars.values())))):
+		still = []
+		for order in open_orders:
+			sym, side, _, kind, price = order
+			h, l = high[sym][i], low[sym][i]
+			hit = (l <= price if side > 0 else h >= price) if kind == 'limit' else (h >= price if side > 0 else l <= price)
+			if hit:
+				fills += 1
+			else:
+				still.append(order)
+		open_orders = still
+	return fills
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--orders', type=int, default=100_000)
+	parser.add_argument('--symbols', type=int, default=50)
+	parser.add_argument('--bars', type=int, default=250)
+	args = parser.parse_args()
+
+	rng = np.random.default_rng(0)
+	closes = generate_prices([f"SYM{i}" for i in range(args.symbols)], args.bars)
+	bars = _bars(closes, rng)
+	orders = _orders(closes, args.orders, rng)
+	settle = lambda order, qty, price: None
+
+	engine = MatchingEngine()
+	first = {sym: last_bar(df.iloc[:1]) for sym, df in bars.items()}
+	t0 = time.perf_counter()
+	for sym, side, qty, kind, price in orders:
+		engine.submit(sym, side, qty, kind, price, first[sym], settle)
+	submit = time.perf_counter() - t0
+	resting = sum(book.resting for book in engine.books.values())
+
+	t0 = time.perf_counter()
+	fills = engine.replay_all(bars, settle)
+	replay = time.perf_counter() - t0
+	filled = len({f[0] for f in fills})
+
+	t0 = time.perf_counter()
+	_naive_replay(orders, bars)
+	naive = time.perf_counter() - t0
+
+	print(f"{args.orders} orders on {args.symbols} symbols, {resting} resting after submit, {args.bars} bars")
+	print(f"submit        {submit:8.2f}s  {args.orders / submit:>12,.0f} orders/s")
+	print(f"replay        {replay:8.2f}s  {len(fills):>12,} fills for {filled:,} orders, {filled / replay:,.0f} orders matched/s")
+	print(f"linear scan   {naive:8.2f}s  (every open order checked on every bar, no fills applied)")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,87 @@
+"""Adaptive quiz selection from a large question bank: index load, selection and fetch latency.
+
+Run from the SEBI directory:  python -m benchmarks.bench_question_bank [--questions 50000] [--languages 4]
+The bank is built in a temporary directory; the app's own bank is not touched.
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from modules.engine.adaptive import DIFFICULTIES
+from modules.question_bank import QuestionBank, lesson_topics
+
+LANGUAGES = ('en', 'hi', 'mr', 'ta', 'te', 'bn', 'gu', 'kn')
+
+
+def make_questions(n: int, languages, seed: int = 0):
+	rng = random.Random(seed)
+	topics = lesson_topics()
+	for i in range(n):
+		topic = topics[i % len(topics)]
+		yield {
+			'lang': languages[i % len(languages)],
+			'topic': topic,
+			'difficulty': DIFFICULTIES[(i // len(topics)) % len(DIFFICULTIES)],
+			'q': f"[{topic}] Question {i}: which statement about {topic} holds?",
+			'options': [f"Option {k} for question {i}" for k in range(4)],
+			'answer': rng.randrange(4),
+			'expl': f"Explanation for question {i}.",
+		}
+
+
+def _ms(values) -> str:
+	values = sorted(values)
+	p50, p99 = values[len(values) // 2], values[min(len(values) - 1, int(0.99 * len(values)))]
+	return f"p50 {p50 * 1000:6.3f}ms  p99 {p99 * 1000:6.3f}ms"
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--questions', type=int, default=50_000)
+	parser.add_argument('--languages', type=int, default=4)
+	parser.add_argument('--quizzes', type=int, default=2_000)
+	args = parser.parse_args()
+
+	languages = LANGUAGES[:args.languages]
+	path = Path(tempfile.mkdtemp(prefix='sebi-qbank-')) / 'questions.sqlite3'
+	t0 = time.perf_counter()
+	bank = QuestionBank(path)
+	bank.add(make_questions(args.questions, languages))
+	print(f"build    {bank.count():>8,} questions, {len(languages)} languages: {time.perf_counter() - t0:6.2f}s")
+
+	bank = QuestionBank(path)
+	t0 = time.perf_counter()
+	buckets = bank.buckets(languages[-1])
+	ids = sum(len(b) for b in buckets.values())
+	print(f"index    {languages[-1]}: {ids:,} ids in {len(buckets)} buckets, {sum(b.itemsize * len(b) for b in buckets.values()) / 1024:.0f} KiB: "
+		f"{(time.perf_counter() - t0) * 1000:.1f}ms (first quiz in a language only)")
+
+	for lang in languages:
+		bank.buckets(lang)
+	rng = random.Random(1)
+	topics = lesson_topics()
+	select, fetch_cold, fetch_warm = [], [], []
+	seen = []
+	for k in range(args.quizzes):
+		mastery = {t: (c, c + rng.randrange(6)) for t in topics for c in [rng.randrange(12)]}
+		lang = languages[k % len(languages)]
+		t0 = time.perf_counter()
+		quiz = bank.select(mastery, lang, 5, rng, exclude=seen)
+		select.append(time.perf_counter() - t0)
+		t0 = time.perf_counter()
+		bank.questions(quiz)
+		fetch_cold.append(time.perf_counter() - t0)
+		t0 = time.perf_counter()
+		bank.questions(quiz)
+		fetch_warm.append(time.perf_counter() - t0)
+		assert len(quiz) == 5 and not set(quiz) & set(seen[-200:]), quiz
+		seen = (seen + quiz)[-200:]
+	print(f"select   {args.quizzes:>8,} quizzes of 5, 200 excluded:   {_ms(select)}")
+	print(f"fetch    by id, from SQLite:                   {_ms(fetch_cold)}")
+	print(f"fetch    by id, cached:                        {_ms(fetch_warm)}")
+
+
+if __name__ == '__main__':
+	main()
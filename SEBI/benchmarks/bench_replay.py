@@ -0,0 +1,89 @@
+"""Bulk replay of recorded trades and quiz attempts through modules.engine, checked against PortfolioLedger.
+
+Run from the SEBI directory:  python -m benchmarks.bench_replay [--trades 2000000] [--users 20000] [--workers 4]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.engine.quiz import QUESTIONS, grade
+from modules.engine.replay import replay, replay_quizzes, replay_trades
+from modules.ledger import PortfolioLedger
+
+
+def make_trades(n: int, users: int, symbols: int = 50, seed: int = 0) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	# Mostly buys of a few lots, with sells large enough that some are rejected
+	qty = rng.integers(1, 10, n) * np.where(rng.random(n) < 0.55, 1, -1)
+	return pd.DataFrame({
+		'user_id': np.char.add('user', rng.integers(0, users, n).astype(str)),
+		'seq': np.arange(n),
+		'symbol': np.char.add('SYM', rng.integers(0, symbols, n).astype(str)),
+		'qty': qty,
+		'price': np.round(rng.uniform(50, 3000, n), 2),
+	})
+
+
+def make_attempts(n: int, users: int, seed: int = 1) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	answers = rng.integers(-1, 4, (n, len(QUESTIONS)))
+	frame = pd.DataFrame(answers, columns=[f"q{i}" for i in range(len(QUESTIONS))])
+	frame.insert(0, 'user_id', np.char.add('user', rng.integers(0, users, n).astype(str)))
+	return frame
+
+
+def check_against_ledger(trades: pd.DataFrame, result, sample: int = 50) -> None:
+	"""Replay a sample of users one trade at a time through PortfolioLedger and compare."""
+	accounts = result.accounts.set_index('user_id')
+	for user in accounts.index[:sample]:
+		rows = trades[trades['user_id'] == user].sort_values('seq')
+		ledger = PortfolioLedger()
+		accepted = [ledger.apply(s, int(q), float(p)) is None for s, q, p in zip(rows['symbol'], rows['qty'], rows['price'])]
+		assert accepted == result.accepted[rows.index.to_numpy()].tolist(), user
+		assert abs(ledger.cash - accounts.at[user, 'cash']) < 1e-6 * max(1.0, abs(ledger.cash)), user
+		assert abs(ledger.total_value - accounts.at[user, 'total_value']) < 1e-6 * max(1.0, ledger.total_value), user
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--trades', type=int, default=2_000_000)
+	parser.add_argument('--attempts', type=int, default=1_000_000)
+	parser.add_argument('--users', type=int, default=20_000)
+	parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+	args = parser.parse_args()
+
+	trades = make_trades(args.trades, args.users)
+	attempts = make_attempts(args.attempts, args.users)
+
+	for workers in sorted({1, args.workers}):
+		t0 = time.perf_counter()
+		result = replay_trades(trades, workers=workers)
+		secs = time.perf_counter() - t0
+		print(f"trades   {args.trades:>10,} rows, {workers} worker(s): {secs:6.2f}s  {args.trades / secs:>12,.0f} trades/s  "
+			f"({int(result.accepted.sum()):,} applied, {len(result.positions):,} open positions)")
+	check_against_ledger(trades, result)
+	print('         matches PortfolioLedger.apply on a sample of users')
+
+	t0 = time.perf_counter()
+	quizzes = replay_quizzes(attempts)
+	secs = time.perf_counter() - t0
+	print(f"quizzes  {args.attempts:>10,} rows:              {secs:6.2f}s  {args.attempts / secs:>12,.0f} attempts/s  "
+		f"({len(quizzes):,} users, mean best score {quizzes['best_score'].mean():.2f})")
+	assert quizzes['attempts'].sum() == args.attempts and quizzes['user_id'].is_unique
+	sample = attempts.iloc[:1000]
+	expected = [grade([None if a < 0 else a for a in row]).score for row in sample.iloc[:, 1:].to_numpy().tolist()]
+	assert (replay_quizzes(sample).set_index('user_id')['best_score']
+		== pd.Series(expected).groupby(sample['user_id'].to_numpy()).max()).all()
+
+	t0 = time.perf_counter()
+	summary = replay(trades, attempts, workers=args.workers)
+	secs = time.perf_counter() - t0
+	print(f"summary  {len(summary):>10,} users:             {secs:6.2f}s")
+	print(summary.head().to_string(index=False))
+
+
+if __name__ == '__main__':
+	main()
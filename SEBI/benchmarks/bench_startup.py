@@ -0,0 +1,131 @@
+"""Cold-start import cost and first-render time per page, checked against a committed budget.
+
+Run from the SEBI directory:  python -m benchmarks.bench_startup [--app app_lite.py] [--check]
+Each page is opened in a fresh interpreter under ``python -X importtime``: the app's first
+run (the default page) is the cold start, then the page is selected and its imports are
+counted on their own. ``--check`` exits non-zero when a page goes over its budget in
+``startup_budget.json`` or imports a module its budget forbids.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).with_name('startup_budget.json')
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, '.')
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+times = {}
+print('@@startup', file=sys.stderr, flush=True)
+t0 = time.perf_counter()
+at.run()
+times['startup'] = time.perf_counter() - t0
+print('@@page', file=sys.stderr, flush=True)
+t0 = time.perf_counter()
+at.sidebar.radio[0].set_value(sys.argv[2]).run()
+times['page'] = time.perf_counter() - t0
+times['errors'] = len(at.exception)
+print(json.dumps(times))
+"""
+
+_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+
+def page_labels(app: str) -> list:
+	tree = ast.parse((ROOT / app).read_text(encoding='utf-8'))
+	for node in tree.body:
+		if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'PAGES':
+			return [key.value for key in node.value.keys]
+	raise SystemExit(f"{app} has no PAGES registry")
+
+
+def _sections(stderr: str) -> dict:
+	"""Per phase: total top-level import time in ms, every module imported, and the slowest top-level imports."""
+	out, current = {}, None
+	for line in stderr.splitlines():
+		if line.startswith('@@'):
+			current = out.setdefault(line[2:], {'import_ms': 0.0, 'modules': set(), 'top': []})
+			continue
+		match = _LINE.match(line)
+		if current is None or not match:
+			continue
+		cumulative, indent, name = int(match.group(1)), match.group(2), match.group(3)
+		current['modules'].add(name)
+		if not indent:
+			current['import_ms'] += cumulative / 1000
+			current['top'].append((cumulative / 1000, name))
+	return out
+
+
+def measure(app: str, label: str) -> dict:
+	env = dict(os.environ, SEBI_MARKET_DATA='synthetic', SEBI_TRANSLATOR='local', PYTHONWARNINGS='ignore')
+	proc = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', _CHILD, app, label],
+		cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+	)
+	result = _sections(proc.stderr)
+	result['times'] = json.loads(proc.stdout.strip().splitlines()[-1])
+	return result
+
+
+def _forbidden(modules: set, forbidden: list) -> list:
+	return sorted(f for f in forbidden if f in modules)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--app', default='app.py')
+	parser.add_argument('--check', action='store_true', help='fail when over budget')
+	args = parser.parse_args()
+
+	budget = json.loads(BUDGET_FILE.read_text(encoding='utf-8'))
+	app_budget = budget['apps'][args.app]
+	failures = []
+	startup = None
+	print(f"{'page':<36}{'imports':>10}{'render':>9}  slowest imports")
+	for label in page_labels(args.app):
+		result = measure(args.app, label)
+		if startup is None:
+			startup = result['startup']
+			failures += _check('startup', startup, result['times']['startup'], app_budget['startup'], budget['forbidden'])
+			print(_row('(cold start)', startup, result['times']['startup']))
+		page = result['page']
+		failures += _check(label, page, result['times']['page'], app_budget['pages'][label], budget['forbidden'])
+		if result['times']['errors']:
+			failures.append(f"{label}: the page raised an exception")
+		print(_row(label, page, result['times']['page']))
+
+	for failure in failures:
+		print(f"OVER BUDGET  {failure}")
+	if args.check and failures:
+		sys.exit(1)
+
+
+def _row(label: str, section: dict, seconds: float) -> str:
+	slowest = ', '.join(f"{name} {ms:.0f}ms" for ms, name in sorted(section['top'], reverse=True)[:3])
+	return f"{label:<36}{section['import_ms']:>8.0f}ms{seconds * 1000:>7.0f}ms  {slowest}"
+
+
+def _check(label: str, section: dict, seconds: float, limits: dict, forbidden: list) -> list:
+	failures = []
+	if section['import_ms'] > limits['import_ms']:
+		failures.append(f"{label}: imports took {section['import_ms']:.0f}ms, budget {limits['import_ms']}ms")
+	if seconds * 1000 > limits['render_ms']:
+		failures.append(f"{label}: first render took {seconds * 1000:.0f}ms, budget {limits['render_ms']}ms")
+	if not limits.get('heavy'):
+		leaked = _forbidden(section['modules'], forbidden)
+		if leaked:
+			failures.append(f"{label}: imports {', '.join(leaked)}")
+	return failures
+
+
+if __name__ == '__main__':
+	main()
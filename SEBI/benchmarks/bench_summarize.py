@@ -0,0 +1,103 @@
+"""Latency, peak memory and agreement of the fast summarizer against sumy's LsaSummarizer.
+
+Run from the SEBI directory:  python -m benchmarks.bench_summarize --sizes 10000 50000 100000
+Each measurement runs in a fresh process so peak RSS is not polluted by earlier runs.
+"""
+import argparse
+import multiprocessing as mp
+import random
+import re
+import resource
+import time
+import tracemalloc
+
+from modules.fast_summary import split_sentences
+
+
+class _RegexTokenizer:
+	# Same segmentation as the fast summarizer, and no dependency on NLTK's punkt data
+	language = 'english'
+
+	def to_sentences(self, paragraph):
+		return split_sentences(paragraph)
+
+	def to_words(self, sentence):
+		return re.findall(r"[A-Za-z][A-Za-z0-9']+", sentence)
+
+
+def _document(chars: int, seed: int = 0) -> str:
+	# A few topics of very different prevalence, so there is a dominant theme to find
+	rng = random.Random(seed)
+	topics = [[f"t{t}w{i}" for i in range(200)] for t in range(8)]
+	common = [f"common{i}" for i in range(300)]
+	prevalence = [2 ** -t for t in range(len(topics))]
+	out, size = [], 0
+	while size < chars:
+		topic = rng.choices(topics, prevalence)[0]
+		words = rng.choices(topic, k=rng.randint(6, 20)) + rng.choices(common, k=rng.randint(2, 10))
+		rng.shuffle(words)
+		sentence = ' '.join(words).capitalize() + '.'
+		out.append(sentence)
+		size += len(sentence) + 1
+	return ' '.join(out)
+
+
+def _run(method: str, chars: int, sentences: int, queue) -> None:
+	text = _document(chars)
+	if method == 'lsa':
+		from sumy.parsers.plaintext import PlaintextParser
+		from sumy.summarizers.lsa import LsaSummarizer
+		summarize = lambda: ' '.join(str(s) for s in LsaSummarizer()(PlaintextParser.from_string(text, _RegexTokenizer()).document, sentences))
+	else:
+		from modules.fast_summary import summarize as fast
+		summarize = lambda: fast(text, sentences)
+	base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	tracemalloc.start()
+	t0 = time.perf_counter()
+	summary = summarize()
+	elapsed = time.perf_counter() - t0
+	_, traced = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+	queue.put((elapsed, traced, rss, summary))
+
+
+def _measure(method: str, chars: int, sentences: int):
+	ctx = mp.get_context('spawn')
+	queue = ctx.Queue()
+	proc = ctx.Process(target=_run, args=(method, chars, sentences, queue))
+	proc.start()
+	result = queue.get()
+	proc.join()
+	return result
+
+
+def _jaccard(a: set, b: set) -> str:
+	return f"{len(a & b) / max(len(a | b), 1):.0%}"
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 50_000, 100_000])
+	parser.add_argument('--sentences', type=int, default=5)
+	args = parser.parse_args()
+
+	# Sentence overlap is strict when many sentences say the same thing, so term overlap is shown too
+	print(f"{'chars':>8} {'method':<6}{'latency':>10}{'traced peak':>14}{'RSS growth':>13}{'sentences':>11}{'terms':>7}")
+	for chars in args.sizes:
+		picked, terms = {}, {}
+		for method in ('lsa', 'fast'):
+			elapsed, traced, rss, summary = _measure(method, chars, args.sentences)
+			picked[method] = set(split_sentences(summary))
+			terms[method] = set(summary.lower().split())
+			overlap = ('', '')
+			if method == 'fast':
+				overlap = (_jaccard(picked['fast'], picked['lsa']), _jaccard(terms['fast'], terms['lsa']))
+			print(
+				f"{chars:>8} {method:<6}{elapsed * 1000:>8.0f}ms{traced / 2**20:>12.1f}MB{rss / 1024:>11.1f}MB"
+				f"{overlap[0]:>11}{overlap[1]:>7}"
+			)
+
+
+if __name__ == '__main__':
+	main()
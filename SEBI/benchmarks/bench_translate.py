@@ -0,0 +1,57 @@
+"""Chunked translation throughput against the offline backend.
+
+Run from the SEBI directory:  python -m benchmarks.bench_translate --chars 60000 --latency 0.2
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from modules.content_cache import ContentCache
+from modules.translation import LocalBackend, split_chunks, translate_document
+
+
+def _document(chars: int, seed: int = 0) -> str:
+	rng = random.Random(seed)
+	words = 'investor market risk circular SEBI order broker margin settlement disclosure fund'.split()
+	paragraphs, size = [], 0
+	while size < chars:
+		sentences = [' '.join(rng.choice(words) for _ in range(rng.randint(8, 25))).capitalize() + '.' for _ in range(rng.randint(3, 8))]
+		paragraphs.append(' '.join(sentences))
+		size += len(paragraphs[-1]) + 2
+	return '\n\n'.join(paragraphs)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--chars', type=int, default=60_000)
+	parser.add_argument('--latency', type=float, default=0.2, help='simulated seconds per provider request')
+	args = parser.parse_args()
+
+	text = _document(args.chars)
+	print(f"document    {len(text)} chars in {len(split_chunks(text))} chunks")
+	with tempfile.TemporaryDirectory() as tmp:
+		for workers in (1, 4, 8):
+			cache = ContentCache(Path(tmp) / f"cold{workers}.sqlite3")
+			backend = LocalBackend(latency=args.latency)
+			t0 = time.perf_counter()
+			translate_document(text, 'hi', backend=backend, max_workers=workers, cache=cache)
+			elapsed = time.perf_counter() - t0
+			print(f"cold x{workers:<4}{elapsed:7.2f}s  {len(text) / elapsed:10.0f} chars/s  {backend.calls} requests")
+
+		backend = LocalBackend(latency=args.latency)
+		t0 = time.perf_counter()
+		translate_document(text, 'hi', backend=backend, cache=cache)
+		print(f"warm        {time.perf_counter() - t0:7.2f}s  {backend.calls} requests")
+
+		paragraphs = text.split('\n\n')
+		paragraphs[len(paragraphs) // 2] = 'Edited: ' + paragraphs[len(paragraphs) // 2]
+		backend = LocalBackend(latency=args.latency)
+		t0 = time.perf_counter()
+		translate_document('\n\n'.join(paragraphs), 'hi', backend=backend, cache=cache)
+		print(f"one edit    {time.perf_counter() - t0:7.2f}s  {backend.calls} requests")
+
+
+if __name__ == '__main__':
+	main()
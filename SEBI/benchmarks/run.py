@@ -0,0 +1,276 @@
+"""Hot-path benchmark suite over the app's own functions, run headless against a Streamlit stub.
+
+Run from the SEBI directory:
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+Every case runs at a realistic and a stress size. Data goes to a throwaway HOME,
+removed on exit; prices come from the synthetic provider and translations from
+the local stand-in.
+``--compare`` exits non-zero when a median is more than ``--threshold`` slower
+than the baseline.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Before any app module is imported: modules.db fixes its data directory at import time
+_HOME = tempfile.TemporaryDirectory(prefix='sebi-bench-', ignore_cleanup_errors=True)
+os.environ['HOME'] = _HOME.name
+os.environ['SEBI_MARKET_DATA'] = 'synthetic'
+os.environ['SEBI_TRANSLATOR'] = 'local'
+
+from benchmarks import st_stub  # noqa: E402
+
+st_stub.install()
+
+from modules import learn_hub, persistence, simulator, simulator_lite, utils  # noqa: E402
+from modules.cohort import get_cohort_stats, percentile_rank  # noqa: E402
+from modules.db import connect  # noqa: E402
+from modules.leaderboard import get_leaderboard  # noqa: E402
+from modules.metrics import get_metrics  # noqa: E402
+from modules.state_store import DB_FILE, get_state_store  # noqa: E402
+
+st = st_stub
+
+# Noise floor: differences smaller than this are never reported as regressions
+_MIN_DELTA_US = 5.0
+
+
+def _session(positions: int) -> dict:
+	st.reset()
+	utils.ensure_session_state()
+	portfolio = st.session_state['portfolio']
+	portfolio['cash'] = 1e12
+	portfolio['positions'] = {f"S{k}": {'qty': 10, 'avg': 100.0} for k in range(positions)}
+	st.session_state['progress'] = {f"lesson{k}": True for k in range(8)}
+	st.session_state['user_id'] = st.query_params['user'] = 'bench'
+	return portfolio
+
+
+def _text(chars: int, salt: int = 0) -> str:
+	words = 'investor market risk circular SEBI order broker margin settlement disclosure fund'.split()
+	out, size, i = [], 0, salt
+	while size < chars:
+		sentence = ' '.join(words[(i * 7 + k) % len(words)] for k in range(8 + i % 17)).capitalize() + '.'
+		out.append(sentence)
+		size += len(sentence) + 1
+		i += 1
+	return ' '.join(out)
+
+
+def case_update_position(positions: int) -> Callable[[int], None]:
+	portfolio = _session(positions)
+	return lambda i: simulator_lite._update_position(portfolio, f"S{i % positions}", 1 if i % 2 else -1, 100.0)
+
+
+def case_portfolio_value(positions: int) -> Callable[[int], None]:
+	portfolio = _session(positions)
+	prices = {f"S{k}": 100.0 + k % 7 for k in range(positions)}
+	return lambda i: simulator_lite._portfolio_value(portfolio, prices)
+
+
+def case_generate_synthetic_data(days: int) -> Callable[[int], None]:
+	# A new symbol every call, so the per-day price cache never hits
+	return lambda i: simulator_lite._generate_synthetic_data(f"BENCH{days}_{i}", days)
+
+
+def case_fetch_history(symbols: int) -> Callable[[int], None]:
+	tickers = tuple(f"T{k}.NS" for k in range(symbols))
+	simulator._fetch_history_batch(tickers, 365)
+	if symbols == 1:
+		return lambda i: simulator._fetch_history(tickers[0], 120)
+	return lambda i: simulator._fetch_history_batch(tickers, 365)
+
+
+def case_summarize_text(chars: int) -> Callable[[int], None]:
+	# Distinct text every call, so the content cache always misses and the summary is computed
+	return lambda i: learn_hub._summarize_text(_text(chars, salt=i), 5, 'fast')
+
+
+def case_summarize_text_lsa(chars: int) -> Callable[[int], None]:
+	# The Learn Hub's default method; without NLTK's punkt data this times the raw-text fallback
+	return lambda i: learn_hub._summarize_text(_text(chars, salt=i), 5, 'lsa')
+
+
+def case_summarize_cached(chars: int) -> Callable[[int], None]:
+	text = _text(chars)
+	learn_hub._summarize_text(text, 5, 'fast')
+	return lambda i: learn_hub._summarize_text(text, 5, 'fast')
+
+
+def case_save_state(positions: int) -> Callable[[int], None]:
+	portfolio = _session(positions)
+	persistence.save_state()
+
+	def run(i: int) -> None:
+		portfolio['positions'][f"S{i % positions}"]['qty'] += 1
+		persistence.save_state()
+
+	return run
+
+
+def case_save_progress(positions: int) -> Callable[[int], None]:
+	# A save that changes the quiz score and a lesson, so the cohort counters are adjusted too
+	_session(positions)
+	persistence.save_state()
+
+	def run(i: int) -> None:
+		st.session_state['best_quiz_score'] = i % 6
+		st.session_state['progress'][f"lesson{i % 8}"] = not st.session_state['progress'][f"lesson{i % 8}"]
+		persistence.save_state()
+
+	return run
+
+
+def case_cohort_counts(users: int) -> Callable[[int], None]:
+	get_state_store()
+	stats = get_cohort_stats()
+	missing = users - stats.counts().get('users', {}).get('all', 0)
+	if missing > 0:
+		# Seed saved users directly, then count them once as an existing database would be
+		conn = connect(DB_FILE)
+		with conn:
+			conn.executemany('INSERT OR REPLACE INTO user_state VALUES (?, ?, ?)', (
+				row for k in range(missing) for row in (
+					(f"seed{users}_{k}", 'best_quiz_score', str(k % 6)),
+					(f"seed{users}_{k}", f"progress:lesson{k % 8}", 'true'),
+				)
+			))
+		stats.rebuild()
+
+	def run(i: int) -> None:
+		percentile_rank(stats.counts().get('score', {}), i % 6)
+
+	return run
+
+
+def case_load_state(positions: int) -> Callable[[int], None]:
+	_session(positions)
+	persistence.save_state()
+
+	def run(i: int) -> None:
+		st.session_state['_state_loaded'] = False
+		persistence.load_state()
+
+	return run
+
+
+def case_append_leaderboard_entry(entries: int) -> Callable[[int], None]:
+	board = get_leaderboard()
+	missing = entries - board.size()
+	if missing > 0:
+		board.record_many((f"seed{board.size() + k}", k % 6, float(k)) for k in range(missing))
+	return lambda i: persistence.append_leaderboard_entry(f"player{i % 500}", i % 6)
+
+
+def case_metrics_timer(series: int) -> Callable[[int], None]:
+	# The per-call cost every instrumented page render and loader pays
+	metrics = get_metrics()
+
+	def run(i: int) -> None:
+		with metrics.timer('bench_seconds', series=str(i % series)):
+			pass
+
+	return run
+
+
+# name -> (setup, {size label: size})
+CASES: Dict[str, Tuple[Callable[[int], Callable[[int], None]], Dict[str, int]]] = {
+	'update_position': (case_update_position, {'10 positions': 10, '2000 positions': 2000}),
+	'portfolio_value': (case_portfolio_value, {'10 positions': 10, '2000 positions': 2000}),
+	'generate_synthetic_data': (case_generate_synthetic_data, {'120 days': 120, '2500 days': 2500}),
+	'fetch_history': (case_fetch_history, {'1 symbol': 1, '200 symbols': 200}),
+	'summarize_text': (case_summarize_text, {'10k chars': 10_000, '100k chars': 100_000}),
+	'summarize_text_lsa': (case_summarize_text_lsa, {'10k chars': 10_000, '100k chars': 100_000}),
+	'summarize_text_cached': (case_summarize_cached, {'10k chars': 10_000, '100k chars': 100_000}),
+	'save_state': (case_save_state, {'10 positions': 10, '2000 positions': 2000}),
+	'save_progress': (case_save_progress, {'10 positions': 10, '2000 positions': 2000}),
+	'cohort_counts': (case_cohort_counts, {'1k users': 1_000, '100k users': 100_000}),
+	'load_state': (case_load_state, {'10 positions': 10, '2000 positions': 2000}),
+	'append_leaderboard_entry': (case_append_leaderboard_entry, {'1k entries': 1_000, '200k entries': 200_000}),
+	'metrics_timer': (case_metrics_timer, {'1 series': 1, '500 series': 500}),
+}
+
+
+def measure(fn: Callable[[int], None], min_time: float, max_iter: int = 5000) -> dict:
+	for i in range(2):
+		fn(-1 - i)
+	samples: List[float] = []
+	start = time.perf_counter()
+	i = 0
+	while i < 5 or (time.perf_counter() - start < min_time and i < max_iter):
+		t0 = time.perf_counter()
+		fn(i)
+		samples.append(time.perf_counter() - t0)
+		i += 1
+	samples.sort()
+	return {
+		'median_us': statistics.median(samples) * 1e6,
+		'p95_us': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e6,
+		'iterations': len(samples),
+	}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+	regressions = []
+	print(f"\n{'case':<50}{'baseline':>12}{'now':>12}{'change':>9}")
+	for key, now in results.items():
+		base = baseline.get('results', {}).get(key)
+		if base is None:
+			print(f"{key:<50}{'-':>12}{now['median_us']:>10.1f}us{'new':>9}")
+			continue
+		ratio = now['median_us'] / base['median_us'] if base['median_us'] else 1.0
+		flag = ratio > 1 + threshold and now['median_us'] - base['median_us'] > _MIN_DELTA_US
+		print(f"{key:<50}{base['median_us']:>10.1f}us{now['median_us']:>10.1f}us{ratio - 1:>+8.0%}{'  REGRESSION' if flag else ''}")
+		if flag:
+			regressions.append(key)
+	return regressions
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--only', default='*', help='glob over case names, e.g. "*state*"')
+	parser.add_argument('--min-time', type=float, default=0.5, help='seconds spent timing each case')
+	parser.add_argument('--save', help='write results to this JSON file')
+	parser.add_argument('--compare', help='baseline JSON to compare against')
+	parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before flagging, 0.25 = 25%%')
+	args = parser.parse_args()
+
+	results = {}
+	print(f"{'case':<50}{'median':>12}{'p95':>12}{'runs':>7}")
+	for name, (setup, sizes) in CASES.items():
+		if not fnmatch.fnmatch(name, args.only):
+			continue
+		for label, size in sizes.items():
+			key = f"{name}[{label}]"
+			stats = results[key] = measure(setup(size), args.min_time)
+			print(f"{key:<50}{stats['median_us']:>10.1f}us{stats['p95_us']:>10.1f}us{stats['iterations']:>7}")
+
+	if args.save:
+		payload = {
+			'meta': {'python': platform.python_version(), 'machine': platform.machine(), 'created': time.strftime('%Y-%m-%d')},
+			'results': results,
+		}
+		with open(args.save, 'w', encoding='utf-8') as f:
+			json.dump(payload, f, indent='\t', sort_keys=True)
+			f.write('\n')
+	if args.compare:
+		with open(args.compare, encoding='utf-8') as f:
+			regressions = compare(results, json.load(f), args.threshold)
+		if regressions:
+			print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+			sys.exit(1)
+
+
+if __name__ == '__main__':
+	try:
+		main()
+	finally:
+		_HOME.cleanup()
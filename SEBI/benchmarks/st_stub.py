@@ -0,0 +1,82 @@
+"""Headless stand-in for the parts of ``streamlit`` the app modules use outside a running server.
+
+``install()`` registers this module as ``streamlit`` in ``sys.modules``; it must run
+before any ``modules.*`` import. ``session_state`` and ``query_params`` are plain
+dicts (with attribute access), ``cache_data``/``cache_resource`` call straight
+through so benchmarks measure the work behind the cache, and every other ``st.*``
+call is accepted and ignored.
+"""
+import sys
+from typing import Any, Callable
+
+
+class _State(dict):
+	def __getattr__(self, name: str) -> Any:
+		try:
+			return self[name]
+		except KeyError:
+			raise AttributeError(name) from None
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		self[name] = value
+
+
+class _Noop:
+	"""Returned for any UI call: callable, usable as a context manager, falsy."""
+
+	def __call__(self, *args, **kwargs) -> '_Noop':
+		return self
+
+	def __getattr__(self, name: str) -> '_Noop':
+		return self
+
+	def __enter__(self) -> '_Noop':
+		return self
+
+	def __exit__(self, *exc) -> bool:
+		return False
+
+	def __bool__(self) -> bool:
+		return False
+
+	def __iter__(self):
+		return iter(())
+
+
+_NOOP = _Noop()
+
+session_state = _State()
+query_params = _State()
+
+
+def _passthrough(func: Callable = None, **kwargs) -> Callable:
+	def wrap(f: Callable) -> Callable:
+		f.clear = lambda *a, **k: None
+		return f
+
+	return wrap(func) if callable(func) else wrap
+
+
+cache_data = _passthrough
+cache_resource = _passthrough
+
+
+def columns(spec, **kwargs) -> list:
+	return [_NOOP] * (spec if isinstance(spec, int) else len(spec))
+
+
+def tabs(labels, **kwargs) -> list:
+	return [_NOOP] * len(labels)
+
+
+def reset() -> None:
+	session_state.clear()
+	query_params.clear()
+
+
+def __getattr__(name: str) -> _Noop:
+	return _NOOP
+
+
+def install() -> None:
+	sys.modules['streamlit'] = sys.modules[__name__]
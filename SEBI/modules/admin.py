@@ -0,0 +1,74 @@
+import pandas as pd
+import streamlit as st
+
+from modules.metrics import METRICS_FILE, get_metrics
+
+
+def _histogram_table(metrics) -> pd.DataFrame:
+	rows = []
+	for (name, labels), hist in sorted(metrics.histograms().items()):
+		rows.append({
+			'Metric': name,
+			'Labels': ', '.join(f"{k}={v}" for k, v in labels),
+			'Calls': hist.count,
+			'Mean ms': hist.total / hist.count * 1000 if hist.count else 0.0,
+			'p50 ms ≤': hist.quantile(0.5) * 1000,
+			'p95 ms ≤': hist.quantile(0.95) * 1000,
+			'p99 ms ≤': hist.quantile(0.99) * 1000,
+			'Total s': hist.total,
+		})
+	return pd.DataFrame(rows)
+
+
+def _hit_rates(samples) -> pd.DataFrame:
+	counts = {}
+	for name, labels, value in samples:
+		if name == 'cache_requests_total':
+			counts.setdefault(labels['loader'], {'hit': 0, 'miss': 0})[labels['result']] += value
+		elif name == 'content_cache_requests_total':
+			counts.setdefault(f"content cache: {labels['kind']}", {'hit': 0, 'miss': 0})[labels['result']] += value
+		elif name == 'price_store_lookups_total':
+			counts.setdefault('price store', {'hit': 0, 'miss': 0})['hit' if labels['result'] == 'hit' else 'miss'] += value
+	rows = [
+		{'Cache': cache, 'Hits': c['hit'], 'Misses': c['miss'], 'Hit rate': c['hit'] / (c['hit'] + c['miss']) if c['hit'] + c['miss'] else 0.0}
+		for cache, c in sorted(counts.items())
+	]
+	return pd.DataFrame(rows)
+
+
+def render_admin() -> None:
+	st.title('Metrics')
+	st.caption('Since this server process started. Percentiles are histogram bucket upper bounds.')
+	metrics = get_metrics()
+	samples = metrics.counters()
+
+	st.subheader('Latency')
+	table = _histogram_table(metrics)
+	if table.empty:
+		st.info('Nothing recorded yet.')
+	else:
+		st.dataframe(table, use_container_width=True, hide_index=True, column_config={
+			c: st.column_config.NumberColumn(format='%.1f') for c in ('Mean ms', 'p50 ms ≤', 'p95 ms ≤', 'p99 ms ≤')
+		})
+
+	st.subheader('Caches')
+	rates = _hit_rates(samples)
+	if not rates.empty:
+		st.dataframe(rates, use_container_width=True, hide_index=True, column_config={
+			'Hit rate': st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format='%.2f'),
+		})
+
+	st.subheader('Prometheus')
+	text = metrics.prometheus_text()
+	st.caption(f"Also written to `{METRICS_FILE}` at most every few seconds, for a node_exporter textfile collector.")
+	c1, c2 = st.columns(2)
+	with c1:
+		if st.button('Write file now'):
+			if metrics.export(force=True):
+				st.success('Written.')
+			else:
+				st.error('Could not write the metrics file.')
+	with c2:
+		st.download_button('Download metrics', data=text, file_name='sebi.prom', mime='text/plain')
+	with st.expander('Exposition text'):
+		st.code(text, language='text')
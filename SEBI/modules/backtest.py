@@ -0,0 +1,222 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# Indicative delivery-trade charges, as a fraction of traded value per side
+BROKERAGE = 0.0003
+STT = 0.001
+
+TRADING_DAYS = 252
+
+
+def buy_and_hold(close: pd.DataFrame) -> pd.DataFrame:
+	return pd.DataFrame(1.0, index=close.index, columns=close.columns)
+
+
+def _running_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	missing = np.isnan(values)
+	return np.cumsum(np.where(missing, 0.0, values), axis=0), np.cumsum(missing, axis=0)
+
+
+def _sma(sums: np.ndarray, gaps: np.ndarray, window: int) -> np.ndarray:
+	# Whole-matrix rolling mean from running sums; windows touching a NaN stay NaN
+	out = np.full(sums.shape, np.nan)
+	if window <= len(sums):
+		total = sums[window - 1:].copy()
+		total[1:] -= sums[:-window]
+		gap = gaps[window - 1:].copy()
+		gap[1:] -= gaps[:-window]
+		out[window - 1:] = np.where(gap == 0, total / window, np.nan)
+	return out
+
+
+def sma_crossover(close: pd.DataFrame, fast: int = 20, slow: int = 50) -> pd.DataFrame:
+	return _crossover(close, *_running_sums(close.to_numpy(dtype=float)), fast, slow)
+
+
+def _crossover(close: pd.DataFrame, sums: np.ndarray, gaps: np.ndarray, fast: int, slow: int) -> pd.DataFrame:
+	signal = _sma(sums, gaps, fast) > _sma(sums, gaps, slow)
+	return pd.DataFrame(signal.astype(float), index=close.index, columns=close.columns)
+
+
+def momentum(close: pd.DataFrame, lookback: int = 60) -> pd.DataFrame:
+	return (close.pct_change(lookback, fill_method=None) > 0).astype(float)
+
+
+STRATEGIES: Dict[str, Callable[..., pd.DataFrame]] = {
+	'Buy & Hold': buy_and_hold,
+	'SMA Crossover': sma_crossover,
+	'Momentum': momentum,
+}
+
+
+def run_backtest(
+	close: pd.DataFrame,
+	target: pd.DataFrame,
+	brokerage: float = BROKERAGE,
+	stt: float = STT,
+	rets: Optional[np.ndarray] = None,
+) -> Dict[str, pd.DataFrame]:
+	"""Simulate target exposures (0..1 per symbol) with costs.
+
+	Everything is a whole-matrix operation: a signal at bar t is filled at the
+	close of bar t, paying costs on that bar, and earns returns from bar t+1
+	on. ``rets`` may be passed in when the same prices are backtested repeatedly.
+	"""
+	if rets is None:
+		rets = _returns(close)
+	signal = target.to_numpy()
+	held = np.vstack([np.zeros((1, signal.shape[1])), signal[:-1]])
+	fills = np.diff(np.vstack([np.zeros((1, signal.shape[1])), signal]), axis=0)
+	costs = np.abs(fills) * (brokerage + stt)
+	net = held * rets - costs
+	equity = np.cumprod(1.0 + net, axis=0)
+	drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1.0
+
+	def frame(values: np.ndarray) -> pd.DataFrame:
+		return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+	return {
+		'returns': frame(net),
+		'fills': frame(fills),
+		'costs': frame(costs),
+		'equity': frame(equity),
+		'drawdown': frame(drawdown),
+	}
+
+
+def _returns(close: pd.DataFrame) -> np.ndarray:
+	return close.pct_change(fill_method=None).fillna(0.0).to_numpy()
+
+
+def summarize(result: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+	net = result['returns'].to_numpy()
+	equity = result['equity'].to_numpy()
+	years = max(len(net) / TRADING_DAYS, 1e-9)
+	std = net.std(axis=0)
+	sharpe = np.divide(net.mean(axis=0), std, out=np.zeros_like(std), where=std > 0) * np.sqrt(TRADING_DAYS)
+	return pd.DataFrame({
+		'Total Return %': (equity[-1] - 1.0) * 100,
+		'CAGR %': (equity[-1] ** (1 / years) - 1.0) * 100,
+		'Max Drawdown %': result['drawdown'].to_numpy().min(axis=0) * 100,
+		'Sharpe': sharpe,
+		'Trades': (result['fills'].to_numpy() != 0).sum(axis=0),
+		'Costs %': result['costs'].to_numpy().sum(axis=0) * 100,
+	}, index=result['equity'].columns).round(2)
+
+
+def portfolio_equity(result: Dict[str, pd.DataFrame]) -> pd.Series:
+	"""Equal-weight, daily-rebalanced combination of the per-symbol returns."""
+	return (1.0 + result['returns'].mean(axis=1)).cumprod()
+
+
+# ---------- Parameter sweeps ----------
+_SWEEP: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(close: pd.DataFrame) -> None:
+	# Prices and everything derived from them once per worker, not once per task
+	_SWEEP.clear()
+	_SWEEP['close'] = close
+	_SWEEP['rets'] = _returns(close)
+	_SWEEP['sums'] = _running_sums(close.to_numpy(dtype=float))
+
+
+def _sweep_task(strategy: str, params: dict, brokerage: float, stt: float) -> dict:
+	close = _SWEEP['close']
+	if strategy == 'SMA Crossover':
+		target = _crossover(close, *_SWEEP['sums'], params['fast'], params['slow'])
+	else:
+		target = STRATEGIES[strategy](close, **params)
+	stats = summarize(run_backtest(close, target, brokerage, stt, rets=_SWEEP['rets']))
+	return {**params, 'Mean Return %': stats['Total Return %'].mean(), 'Mean Sharpe': stats['Sharpe'].mean(),
+		'Worst Drawdown %': stats['Max Drawdown %'].min()}
+
+
+def sweep(
+	close: pd.DataFrame,
+	strategy: str,
+	grid: Dict[str, List],
+	brokerage: float = BROKERAGE,
+	stt: float = STT,
+	max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+	"""Backtest every parameter combination in ``grid``, fanning out over processes."""
+	keys = list(grid)
+	combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+	if strategy == 'SMA Crossover':
+		combos = [c for c in combos if c.get('fast', 0) < c.get('slow', 1)]
+	workers = min(max_workers or os.cpu_count() or 1, len(combos))
+	if workers <= 1:
+		_init_sweep_worker(close)
+		rows = [_sweep_task(strategy, c, brokerage, stt) for c in combos]
+	else:
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker, initargs=(close,)) as pool:
+			rows = list(pool.map(_sweep_task, [strategy] * len(combos), combos, [brokerage] * len(combos), [stt] * len(combos)))
+	return pd.DataFrame(rows).sort_values('Mean Sharpe', ascending=False, ignore_index=True)
+
+
+# ---------- UI ----------
+def _load_closes(symbols: List[str], days: int, synthetic: bool) -> pd.DataFrame:
+	if synthetic:
+		from modules.synthetic import generate_prices
+		return generate_prices(symbols, days)
+	from modules.market_data import close_matrix
+	from modules.simulator import _fetch_history_batch
+	return close_matrix(_fetch_history_batch(tuple(symbols), days))
+
+
+def render_backtest(synthetic: bool = False) -> None:
+	st.title('Strategy Backtester')
+	st.write('Test simple rules on historical (or synthetic) prices. Past performance is not indicative of future results.')
+
+	default = 'STOCK1, STOCK2, STOCK3' if synthetic else 'INFY.NS, ITC.NS, SBIN.NS'
+	symbols = st.text_input('Symbols (comma-separated)', default, key='bt_symbols')
+	symbol_list = [s.strip() for s in symbols.split(',') if s.strip()]
+	days = st.slider('History (days)', 120, 3650, 730, step=30)
+	strategy = st.selectbox('Strategy', list(STRATEGIES))
+
+	params: dict = {}
+	if strategy == 'SMA Crossover':
+		c1, c2 = st.columns(2)
+		params['fast'] = c1.number_input('Fast SMA', 2, 200, 20)
+		params['slow'] = c2.number_input('Slow SMA', 5, 400, 50)
+	elif strategy == 'Momentum':
+		params['lookback'] = st.number_input('Lookback (days)', 5, 250, 60)
+
+	c1, c2 = st.columns(2)
+	brokerage = c1.number_input('Brokerage % per side', 0.0, 1.0, BROKERAGE * 100, step=0.01) / 100
+	stt = c2.number_input('STT % per side', 0.0, 1.0, STT * 100, step=0.01) / 100
+
+	if not symbol_list:
+		st.warning('Enter at least one symbol.')
+		return
+	close = _load_closes(symbol_list, days, synthetic)
+	if close.empty:
+		st.warning('No data available')
+		return
+
+	if st.button('Run Backtest'):
+		result = run_backtest(close, STRATEGIES[strategy](close, **params), brokerage, stt)
+		st.subheader('Equal-weight equity curve')
+		st.line_chart(portfolio_equity(result))
+		st.subheader('Drawdown')
+		st.area_chart(result['drawdown'])
+		st.dataframe(summarize(result), use_container_width=True)
+
+	if strategy != 'Buy & Hold':
+		with st.expander('Parameter sweep'):
+			if strategy == 'SMA Crossover':
+				grid = {'fast': list(range(5, 55, 5)), 'slow': list(range(30, 230, 20))}
+			else:
+				grid = {'lookback': list(range(10, 260, 10))}
+			st.caption(f"{int(np.prod([len(v) for v in grid.values()]))} combinations")
+			if st.button('Run Sweep'):
+				with st.spinner('Sweeping parameters...'):
+					st.dataframe(sweep(close, strategy, grid, brokerage, stt), use_container_width=True)
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+
+# More points than this per line are downsampled before they are sent to the browser
+MAX_POINTS = 400
+
+# History the simulator charts can show, in calendar days; the longer ones are downsampled
+CHART_RANGES = {'3 months': 90, '1 year': 365, '5 years': 1825}
+DEFAULT_RANGE = '1 year'
+
+# Downsampled (x, y) per series; figures are built fresh from them, as sessions must not share one
+_SERIES: 'OrderedDict[str, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+_SERIES_SIZE = 512
+_lock = threading.Lock()
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+	"""Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+	The first and last points are always kept; every bucket in between keeps the
+	point forming the largest triangle with the previous pick and the next
+	bucket's mean, so peaks and troughs survive.
+	"""
+	n = len(y)
+	if threshold >= n or threshold < 3:
+		return np.arange(n)
+	x = np.asarray(x, dtype=float)
+	y = np.asarray(y, dtype=float)
+	edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+	edges[-1] = n - 1
+	# Mean of each bucket, and of the final point as the bucket after the last
+	sizes = np.diff(edges)
+	mean_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])
+	mean_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])
+
+	picked = np.empty(threshold, dtype=np.int64)
+	picked[0], picked[-1] = 0, n - 1
+	a = 0
+	for i in range(threshold - 2):
+		lo, hi = edges[i], edges[i + 1]
+		ax, ay = x[a], y[a]
+		area = np.abs((ax - mean_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[i + 1] - ay))
+		a = lo + int(area.argmax())
+		picked[i + 1] = a
+	return picked
+
+
+def _series_key(dates: np.ndarray, close: np.ndarray, max_points: int) -> str:
+	h = hashlib.sha256(str(max_points).encode('utf-8'))
+	h.update(dates.tobytes())
+	h.update(close.tobytes())
+	return h.hexdigest()
+
+
+def chart_series(dates, close, max_points: int = MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+	"""The points to plot for a price series, computed once per distinct series and then served from a cache.
+
+	Series longer than ``max_points`` are reduced with LTTB; dates are returned as
+	plain ``YYYY-MM-DD`` strings when they carry no time of day. Treat the arrays as read-only.
+	"""
+	dates = pd.DatetimeIndex(dates).to_numpy(dtype='datetime64[ns]')
+	close = np.ascontiguousarray(close, dtype=float)
+	key = _series_key(dates, close, max_points)
+	with _lock:
+		series = _SERIES.get(key)
+		if series is not None:
+			_SERIES.move_to_end(key)
+			return series
+
+	keep = lttb(dates.astype(np.int64), close, max_points)
+	days = dates[keep].astype('datetime64[D]')
+	x = np.datetime_as_string(days) if (days == dates[keep]).all() else np.datetime_as_string(dates[keep], unit='s')
+	series = (x, np.round(close[keep], 2))
+	with _lock:
+		_SERIES[key] = series
+		if len(_SERIES) > _SERIES_SIZE:
+			_SERIES.popitem(last=False)
+	return series
+
+
+def price_figure(dates, close, title: str, max_points: int = MAX_POINTS) -> go.Figure:
+	"""Line chart of a price series, a new figure on every call built from the cached points."""
+	x, y = chart_series(dates, close, max_points)
+	# Built in one call; add_trace and update_layout each re-validate the figure
+	return go.Figure(
+		data=[go.Scatter(x=x, y=y, mode='lines', name='Close')],
+		layout={'title': title, 'xaxis_title': 'Date', 'yaxis_title': 'Price'},
+	)
+
+
+def chart_range() -> Tuple[str, int]:
+	"""Range picker for the simulator's price charts; returns the label and its length in days."""
+	label = st.radio('Chart range', list(CHART_RANGES), index=list(CHART_RANGES).index(DEFAULT_RANGE), horizontal=True, key='chart_range')
+	return label, CHART_RANGES[label]
+
+
+def plot_price(df: pd.DataFrame, title: str, max_points: int = MAX_POINTS) -> None:
+	if df.empty:
+		st.warning('No data available')
+		return
+	st.plotly_chart(price_figure(df['Date'], df['Close'].to_numpy(), title, max_points), use_container_width=True)
@@ -0,0 +1,167 @@
+import json
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from modules.db import connect
+from modules.engine.badges import earned_badges
+from modules.state_store import DB_FILE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cohort_counts (
+	metric TEXT NOT NULL,
+	bucket TEXT NOT NULL,
+	n INTEGER NOT NULL,
+	PRIMARY KEY (metric, bucket)
+) WITHOUT ROWID;
+"""
+
+# user_state keys the aggregates are derived from; saves touching nothing else skip them
+_SCORE_KEY = 'best_quiz_score'
+_PROGRESS_PREFIX = 'progress:'
+# Sorts just after every 'progress:' key
+_PROGRESS_END = 'progress;'
+
+_UPSERT = """
+INSERT INTO cohort_counts VALUES (?, ?, ?)
+ON CONFLICT (metric, bucket) DO UPDATE SET n = n + excluded.n
+"""
+
+# Progress flags are stored as JSON booleans; anything else is decoded
+_FLAGS = {'true': True, 'false': False}
+
+# A learner as the aggregates see them: best quiz score and completed lessons
+Summary = Tuple[int, FrozenSet[str]]
+Counts = Dict[Tuple[str, str], int]
+
+
+def tracked(key: str) -> bool:
+	return key == _SCORE_KEY or key.startswith(_PROGRESS_PREFIX)
+
+
+def summarize(items: Dict[str, str]) -> Optional[Summary]:
+	"""Summary of one user's flattened state rows, or None for a user with no saved state."""
+	if not items:
+		return None
+	score = int(json.loads(items.get(_SCORE_KEY, '0')) or 0)
+	done = frozenset(
+		k[len(_PROGRESS_PREFIX):] for k, v in items.items()
+		if k.startswith(_PROGRESS_PREFIX) and (_FLAGS[v] if v in _FLAGS else json.loads(v))
+	)
+	return score, done
+
+
+def contributions(summary: Summary) -> List[Tuple[str, str]]:
+	"""The (metric, bucket) counters one learner adds 1 to."""
+	score, done = summary
+	rows = [('users', 'all'), ('score', str(score)), ('lessons_done', str(len(done)))]
+	rows.extend(('lesson', key) for key in sorted(done))
+	rows.extend(('badge', name) for name in earned_badges(dict.fromkeys(done, True), score))
+	return rows
+
+
+def deltas(before: Optional[Summary], after: Optional[Summary]) -> Counts:
+	out: Counts = {}
+	for summary, sign in ((before, -1), (after, 1)):
+		if summary is not None:
+			for key in contributions(summary):
+				out[key] = out.get(key, 0) + sign
+	return {key: n for key, n in out.items() if n}
+
+
+def apply(conn: sqlite3.Connection, counts: Counts) -> None:
+	"""Add counter deltas inside the caller's transaction."""
+	conn.executemany(_UPSERT, [(metric, bucket, n) for (metric, bucket), n in counts.items()])
+
+
+def tracked_items(conn: sqlite3.Connection, user_id: str) -> Dict[str, str]:
+	"""A user's rows that feed the aggregates, read off the (user_id, key) primary key."""
+	rows = conn.execute(
+		'SELECT key, value FROM user_state WHERE user_id = ? AND (key = ? OR (key >= ? AND key < ?))',
+		(user_id, _SCORE_KEY, _PROGRESS_PREFIX, _PROGRESS_END),
+	)
+	return dict(rows.fetchall())
+
+
+class CohortStats:
+	"""Counters over every saved learner: users, best-score histogram, lessons completed and badges.
+
+	``StateStore.save`` adjusts them in the same transaction as the state rows it
+	writes, by the difference between the learner's old and new summary, so
+	reads cost the same at any number of users. Quiz scores are small integers,
+	so a count per score is an exact distribution; counts from several databases
+	merge by adding them.
+	"""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		self.path = Path(path) if path is not None else DB_FILE
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+		conn = self._conn()
+		if conn.execute('SELECT 1 FROM cohort_counts LIMIT 1').fetchone() is None and self._has_users():
+			self.rebuild()
+
+	def _conn(self):
+		return connect(self.path)
+
+	def _has_users(self) -> bool:
+		conn = self._conn()
+		if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'user_state'").fetchone() is None:
+			return False
+		return conn.execute('SELECT 1 FROM user_state LIMIT 1').fetchone() is not None
+
+	def rebuild(self) -> None:
+		"""Recount from every user's saved state, once, for databases saved before the counters existed."""
+		conn = self._conn()
+		with conn:
+			conn.execute('BEGIN IMMEDIATE')
+			conn.execute('DELETE FROM cohort_counts')
+			counts: Counts = {}
+			for items in _per_user(conn.execute('SELECT user_id, key, value FROM user_state ORDER BY user_id')):
+				# A learner who has traded but never saved has only cash and position rows, and is not counted yet
+				summary = summarize({k: v for k, v in items.items() if tracked(k)})
+				if summary is None:
+					continue
+				for key in contributions(summary):
+					counts[key] = counts.get(key, 0) + 1
+			apply(conn, counts)
+
+	def counts(self) -> Dict[str, Dict[str, int]]:
+		"""Counter values by metric, then bucket."""
+		out: Dict[str, Dict[str, int]] = {}
+		for metric, bucket, n in self._conn().execute('SELECT metric, bucket, n FROM cohort_counts WHERE n > 0'):
+			out.setdefault(metric, {})[bucket] = n
+		return out
+
+
+def percentile_rank(histogram: Dict[str, int], score: int) -> Optional[float]:
+	"""Share of learners below ``score`` plus half of those on it, in percent (None with no learners)."""
+	total = sum(histogram.values())
+	if not total:
+		return None
+	below = sum(n for bucket, n in histogram.items() if int(bucket) < score)
+	return 100.0 * (below + histogram.get(str(score), 0) / 2) / total
+
+
+def at_least(histogram: Dict[str, int], upto: int) -> List[int]:
+	"""Learners with a value of at least k, for k = 1..upto (a funnel from a histogram)."""
+	return [sum(n for bucket, n in histogram.items() if int(bucket) >= k) for k in range(1, upto + 1)]
+
+
+def _per_user(rows: Iterable[Tuple[str, str, str]]) -> Iterable[Dict[str, str]]:
+	user, items = None, {}
+	for user_id, key, value in rows:
+		if user_id != user and items:
+			yield items
+			items = {}
+		user = user_id
+		items[key] = value
+	if items:
+		yield items
+
+
+@lru_cache(maxsize=None)
+def get_cohort_stats() -> CohortStats:
+	return CohortStats()
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from modules.db import APP_DIR, connect
+from modules.metrics import Sample, get_metrics
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_cache (
+	key TEXT PRIMARY KEY,
+	kind TEXT NOT NULL,
+	value TEXT NOT NULL,
+	size INTEGER NOT NULL,
+	last_access REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS content_cache_lru ON content_cache (last_access);
+CREATE TABLE IF NOT EXISTS content_cache_meta (
+	name TEXT PRIMARY KEY,
+	value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO content_cache_meta VALUES ('bytes', 0);
+"""
+
+# Refresh an entry's LRU timestamp at most this often, to keep hits read-mostly
+_TOUCH_INTERVAL = 60.0
+
+
+def content_key(kind: str, text: str, **params) -> str:
+	h = hashlib.sha256(kind.encode('utf-8'))
+	for name in sorted(params):
+		h.update(f"\x00{name}={params[name]!r}".encode('utf-8'))
+	h.update(b'\x00')
+	h.update(text.encode('utf-8'))
+	return h.hexdigest()
+
+
+class ContentCache:
+	"""Disk-backed results keyed by a SHA-256 of the input text and parameters.
+
+	Shared by every process through SQLite; once the stored values exceed
+	``max_bytes`` the least recently used entries are evicted.
+	"""
+
+	def __init__(self, path: Optional[Path] = None, max_bytes: int = 64 * 1024 * 1024) -> None:
+		self.path = Path(path) if path is not None else APP_DIR / 'cache.sqlite3'
+		self.max_bytes = max_bytes
+		self._lock = threading.Lock()
+		self._counts: Dict[str, Dict[str, int]] = {}
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+
+	def _conn(self):
+		return connect(self.path)
+
+	def _count(self, kind: str, outcome: str) -> None:
+		with self._lock:
+			counts = self._counts.setdefault(kind, {'hits': 0, 'misses': 0})
+			counts[outcome] += 1
+
+	def get(self, kind: str, text: str, **params) -> Optional[str]:
+		key = content_key(kind, text, **params)
+		conn = self._conn()
+		row = conn.execute('SELECT value, last_access FROM content_cache WHERE key = ?', (key,)).fetchone()
+		if row is None:
+			self._count(kind, 'misses')
+			return None
+		self._count(kind, 'hits')
+		now = time.time()
+		if now - row[1] > _TOUCH_INTERVAL:
+			with conn:
+				conn.execute('UPDATE content_cache SET last_access = ? WHERE key = ?', (now, key))
+		return row[0]
+
+	def put(self, kind: str, text: str, value: str, **params) -> None:
+		key = content_key(kind, text, **params)
+		size = len(value.encode('utf-8'))
+		with self._conn() as conn:
+			# Hold the write lock from reading the old size on, so concurrent puts of one key keep the byte count exact
+			conn.execute('BEGIN IMMEDIATE')
+			old = conn.execute('SELECT size FROM content_cache WHERE key = ?', (key,)).fetchone()
+			conn.execute('INSERT OR REPLACE INTO content_cache VALUES (?, ?, ?, ?, ?)', (key, kind, value, size, time.time()))
+			conn.execute(
+				"UPDATE content_cache_meta SET value = value + ? WHERE name = 'bytes'", (size - (old[0] if old else 0),)
+			)
+			self._evict(conn)
+
+	def _evict(self, conn) -> None:
+		total = conn.execute("SELECT value FROM content_cache_meta WHERE name = 'bytes'").fetchone()[0]
+		if total <= self.max_bytes:
+			return
+		# Evict down to 90% so a full cache does not evict on every insert
+		target = int(self.max_bytes * 0.9)
+		freed = 0
+		rows = conn.execute('SELECT key, size FROM content_cache ORDER BY last_access')
+		doomed = []
+		for key, size in rows:
+			if total - freed <= target:
+				break
+			doomed.append((key,))
+			freed += size
+		conn.executemany('DELETE FROM content_cache WHERE key = ?', doomed)
+		conn.execute("UPDATE content_cache_meta SET value = value - ? WHERE name = 'bytes'", (freed,))
+
+	def get_or_compute(
+		self,
+		kind: str,
+		text: str,
+		compute: Callable[[], str],
+		store_if: Callable[[str], bool] = lambda value: True,
+		**params,
+	) -> str:
+		value = self.get(kind, text, **params)
+		if value is None:
+			value = compute()
+			if store_if(value):
+				self.put(kind, text, value, **params)
+		return value
+
+	def stats(self) -> Dict[str, Dict[str, float]]:
+		with self._lock:
+			out = {kind: dict(c) for kind, c in self._counts.items()}
+		for counts in out.values():
+			lookups = counts['hits'] + counts['misses']
+			counts['hit_rate'] = counts['hits'] / lookups if lookups else 0.0
+		conn = self._conn()
+		entries = conn.execute('SELECT COUNT(*) FROM content_cache').fetchone()[0]
+		size = conn.execute("SELECT value FROM content_cache_meta WHERE name = 'bytes'").fetchone()[0]
+		out['_store'] = {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
+		return out
+
+	def metric_samples(self) -> List[Sample]:
+		stats = self.stats()
+		store = stats.pop('_store')
+		samples = [
+			('content_cache_requests_total', {'kind': kind, 'result': result}, counts[f"{result}es" if result == 'miss' else f"{result}s"])
+			for kind, counts in stats.items() for result in ('hit', 'miss')
+		]
+		samples.append(('content_cache_entries', {}, store['entries']))
+		samples.append(('content_cache_bytes', {}, store['bytes']))
+		return samples
+
+
+@lru_cache(maxsize=None)
+def get_content_cache() -> ContentCache:
+	cache = ContentCache()
+	get_metrics().register_collector('content_cache', cache.metric_samples)
+	return cache
@@ -1,40 +1,65 @@
+import sqlite3
+
 import streamlit as st
 from typing import List
-
-
-BADGE_RULES = [
-	('Learner', lambda progress, score: len([k for k,v in progress.items() if v]) >= 1),
-	('Quiz Novice', lambda progress, score: score >= 2),
-	('Quiz Pro', lambda progress, score: score >= 4),
-	('Diversifier', lambda progress, score: progress.get('portfolio')),
-]
-
-
-def _compute_strengths_weaknesses(score: int, total: int) -> str:
-	if total == 0:
-		return 'No quiz attempts yet.'
-	ratio = score / total
-	if ratio >= 0.8:
-		return 'Strong grasp. Consider advanced topics: options basics, ETFs.'
-	elif ratio >= 0.5:
-		return 'Decent understanding. Review risk, orders, psychology.'
-	else:
-		return 'Start with basics and risk assessment lessons first.'
+from modules.cohort import at_least, get_cohort_stats, percentile_rank
+from modules.engine.badges import BADGE_RULES, earned_badges, strengths_weaknesses
+from modules.engine.quiz import QUIZ_LENGTH
+from modules.tutorials import LESSONS
 
 
 def render_dashboard():
 	st.title('Dashboard')
 	progress = st.session_state.get('progress', {})
 	score = st.session_state.get('best_quiz_score', 0)
-	total = 5
+	total = QUIZ_LENGTH
 
 	st.metric('Lessons Completed', sum(1 for v in progress.values() if v))
 	st.metric('Best Quiz Score', score)
-	st.write(_compute_strengths_weaknesses(score, total))
+	st.write(strengths_weaknesses(score, total))
 
 	st.subheader('Badges')
-	badges: List[str] = [name for name, rule in BADGE_RULES if rule(progress, score)]
+	badges: List[str] = earned_badges(progress, score)
 	if badges:
 		st.write(', '.join(badges))
 	else:
 		st.write('No badges yet. Complete lessons and quizzes to earn some!')
+
+	render_cohort(score)
+
+
+def render_cohort(score: int) -> None:
+	try:
+		counts = get_cohort_stats().counts()
+	except sqlite3.Error:
+		return
+	users = counts.get('users', {}).get('all', 0)
+	if not users:
+		return
+	st.subheader(f"All learners ({users:,})")
+	scores = counts.get('score', {})
+	rank = percentile_rank(scores, score)
+	if rank is not None:
+		st.metric('Quiz Score Percentile', f"{rank:.0f}", help='Share of learners with saved progress scoring below you, counting ties as half.')
+
+	cols = st.columns(3)
+	with cols[0]:
+		st.markdown('**Lessons completed**')
+		done = counts.get('lesson', {})
+		for lesson in LESSONS:
+			n = done.get(lesson['key'], 0)
+			st.progress(n / users, text=f"{lesson['title']}: {n / users:.0%}")
+		for k, n in enumerate(at_least(counts.get('lessons_done', {}), len(LESSONS)), start=1):
+			if n:
+				st.caption(f"{k}+ lessons: {n:,} learners ({n / users:.0%})")
+	with cols[1]:
+		st.markdown('**Best quiz scores**')
+		for value in range(QUIZ_LENGTH, -1, -1):
+			n = scores.get(str(value), 0)
+			st.progress(n / users, text=f"{value} / {QUIZ_LENGTH}: {n:,}")
+	with cols[2]:
+		st.markdown('**Badges earned**')
+		earned = counts.get('badge', {})
+		for name, _ in BADGE_RULES:
+			n = earned.get(name, 0)
+			st.progress(n / users, text=f"{name}: {n / users:.0%}")
@@ -0,0 +1,30 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict
+
+
+APP_DIR = Path.home() / ".sebi_app"
+
+_local = threading.local()
+
+
+def connect(path: Path) -> sqlite3.Connection:
+	"""Return this thread's connection to ``path``, opened in WAL mode.
+
+	WAL lets several app processes read while one writes; the busy timeout makes
+	concurrent writers wait for each other instead of failing.
+	"""
+	conns: Dict[str, sqlite3.Connection] = getattr(_local, 'conns', None)
+	if conns is None:
+		conns = _local.conns = {}
+	key = str(path)
+	conn = conns.get(key)
+	if conn is None:
+		Path(path).parent.mkdir(parents=True, exist_ok=True)
+		conn = sqlite3.connect(key, timeout=30)
+		conn.execute('PRAGMA journal_mode=WAL')
+		conn.execute('PRAGMA synchronous=NORMAL')
+		conn.execute('PRAGMA busy_timeout=30000')
+		conns[key] = conn
+	return conn
@@ -0,0 +1,40 @@
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Per topic: (correct answers, questions attempted)
+Mastery = Dict[str, Tuple[int, int]]
+
+DIFFICULTIES = (1, 2, 3)
+
+# Mean mastery at which questions step up to the next difficulty
+_STEP_UP = (0.5, 0.75)
+
+
+def mastery_mean(correct: int, attempts: int) -> float:
+	"""Posterior mean of a Beta(1 + correct, 1 + wrong) belief that the learner knows the topic."""
+	return (1 + correct) / (2 + attempts)
+
+
+def difficulty_for(mean: float) -> int:
+	for difficulty, threshold in zip(DIFFICULTIES, _STEP_UP):
+		if mean < threshold:
+			return difficulty
+	return DIFFICULTIES[-1]
+
+
+def pick_topics(mastery: Mastery, topics: Sequence[str], n: int, rng: Optional[random.Random] = None) -> List[str]:
+	"""Thompson sampling towards weak topics.
+
+	For each question, draw once from every topic's Beta posterior and take the
+	lowest draw: weak and rarely practised topics come up most, strong ones still
+	now and then.
+	"""
+	rng = rng or random.Random()
+	picks = []
+	for _ in range(n):
+		draws = []
+		for topic in topics:
+			correct, attempts = mastery.get(topic, (0, 0))
+			draws.append((rng.betavariate(1 + correct, 1 + attempts - correct), topic))
+		picks.append(min(draws)[1])
+	return picks
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+
+Rule = Callable[[Dict[str, bool], int], bool]
+
+BADGE_RULES: List[Tuple[str, Rule]] = [
+	('Learner', lambda progress, score: len([k for k, v in progress.items() if v]) >= 1),
+	('Quiz Novice', lambda progress, score: score >= 2),
+	('Quiz Pro', lambda progress, score: score >= 4),
+	('Diversifier', lambda progress, score: bool(progress.get('portfolio'))),
+]
+
+
+def earned_badges(progress: Dict[str, bool], score: int) -> List[str]:
+	return list(_earned(frozenset(k for k, v in progress.items() if v), score))
+
+
+@lru_cache(maxsize=4096)
+def _earned(done: FrozenSet[str], score: int) -> Tuple[str, ...]:
+	# Rules only look at completed lessons, so learners on the same lessons and score share one evaluation
+	progress = dict.fromkeys(done, True)
+	return tuple(name for name, rule in BADGE_RULES if rule(progress, score))
+
+
+def strengths_weaknesses(score: int, total: int) -> str:
+	if total == 0:
+		return 'No quiz attempts yet.'
+	ratio = score / total
+	if ratio >= 0.8:
+		return 'Strong grasp. Consider advanced topics: options basics, ETFs.'
+	elif ratio >= 0.5:
+		return 'Decent understanding. Review risk, orders, psychology.'
+	else:
+		return 'Start with basics and risk assessment lessons first.'
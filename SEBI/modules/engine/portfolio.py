@@ -0,0 +1,21 @@
+from typing import Optional
+
+from modules.ledger import PortfolioLedger
+
+
+def apply_trade(portfolio: dict, ledger: PortfolioLedger, symbol: str, qty: int, price: float) -> Optional[str]:
+	"""Apply a fill to the ledger and mirror it into the portfolio dict.
+
+	Returns an error message, and changes nothing, if the fill is not allowed.
+	Recording the trade (journal, history) is left to the caller.
+	"""
+	error = ledger.apply(symbol, qty, price)
+	if error:
+		return error
+	portfolio['cash'] = ledger.cash
+	pos = ledger.position(symbol)
+	if pos:
+		portfolio['positions'][symbol] = pos
+	else:
+		portfolio['positions'].pop(symbol, None)
+	return None
@@ -0,0 +1,69 @@
+from typing import List, NamedTuple, Optional, Sequence
+
+
+QUESTIONS = [
+	{
+		'q': 'Which of these best describes diversification?',
+		'options': ['Putting all money in one stock', 'Spreading investments across assets', 'Timing the market', 'Day trading daily'],
+		'answer': 1,
+		'expl': 'Diversification reduces unsystematic risk by spreading exposure.',
+		'topic': 'portfolio',
+		'difficulty': 1,
+	},
+	{
+		'q': 'Higher expected return usually comes with…',
+		'options': ['Lower risk', 'No risk', 'Higher risk', 'Guaranteed profit'],
+		'answer': 2,
+		'expl': 'Risk-return tradeoff: higher return potential requires higher risk.',
+		'topic': 'risk',
+		'difficulty': 1,
+	},
+	{
+		'q': 'HFT strategies are most sensitive to…',
+		'options': ['Long-term fundamentals', 'Transaction latency', 'P/E ratio', 'Dividend yield'],
+		'answer': 1,
+		'expl': 'HFT depends on low latency infrastructure and microstructure.',
+		'topic': 'algo',
+		'difficulty': 1,
+	},
+	{
+		'q': 'A limit order will…',
+		'options': ['Execute at any price immediately', 'Execute at your specified price or better', 'Never execute', 'Always execute worse than market'],
+		'answer': 1,
+		'expl': 'Limit orders control execution price but may miss fills.',
+		'topic': 'orders',
+		'difficulty': 1,
+	},
+	{
+		'q': 'What helps reduce impact of behavioral biases?',
+		'options': ['Impulse trading', 'No plan', 'Rules-based approach', 'Chasing hot tips'],
+		'answer': 2,
+		'expl': 'Rules and checklists reduce impulsive decisions.',
+		'topic': 'psych',
+		'difficulty': 1,
+	},
+]
+
+# Questions per quiz, and so the best possible score
+QUIZ_LENGTH = 5
+
+
+class QuizResult(NamedTuple):
+	score: int
+	total: int
+	# Per question: True correct, False incorrect, None unanswered
+	outcomes: List[Optional[bool]]
+
+
+def grade(answers: Sequence[Optional[int]], questions=QUESTIONS) -> QuizResult:
+	"""Score chosen option indexes (None for unanswered) against the answer key."""
+	outcomes = [None if a is None else a == q['answer'] for a, q in zip(answers, questions)]
+	return QuizResult(sum(1 for o in outcomes if o), len(questions), outcomes)
+
+
+def grade_many(answers, questions=QUESTIONS):
+	"""Scores for an (attempts x questions) array of option indexes, -1 for unanswered."""
+	import numpy as np
+
+	key = np.array([q['answer'] for q in questions])
+	return (np.asarray(answers) == key).sum(axis=1)
@@ -0,0 +1,193 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.engine.badges import earned_badges
+from modules.engine.quiz import QUESTIONS, grade_many
+from modules.state_store import DEFAULT_CASH
+
+
+# Shards per worker, so one user-heavy shard does not leave the other workers idle
+_SHARDS_PER_WORKER = 4
+
+# Columns of a quiz attempts frame that are not answers
+_QUIZ_META = ('user_id', 'seq', 'ts')
+
+_Shard = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]
+
+
+class TradeReplay(NamedTuple):
+	# One row per user: cash, market_value, total_value, trades, rejected
+	accounts: pd.DataFrame
+	# One row per open position: user_id, symbol, qty, avg, mark
+	positions: pd.DataFrame
+	# Per input row, whether the trade was applied
+	accepted: np.ndarray
+
+
+def _replay_shard(shard: _Shard) -> Tuple[np.ndarray, List[float], List[Tuple[int, int, int, float, float]]]:
+	"""Apply each user's trades in order with PortfolioLedger.apply's rules, on plain Python values."""
+	symbols, qty, price, bounds, cash = shard
+	symbols, qty, price, bounds = symbols.tolist(), qty.tolist(), price.tolist(), bounds.tolist()
+	accepted = np.zeros(len(symbols), dtype=bool)
+	cash_out: List[float] = []
+	positions = []
+	for u in range(len(bounds) - 1):
+		c = cash
+		held: Dict[int, list] = {}
+		for i in range(bounds[u], bounds[u + 1]):
+			s, n, px = symbols[i], qty[i], price[i]
+			cost = n * px
+			if n > 0 and c < cost:
+				continue
+			pos = held.get(s)
+			h = pos[0] if pos else 0
+			new = h + n
+			if new < 0:
+				continue
+			if pos is None:
+				pos = held[s] = [0, 0.0, 0.0]
+			if n > 0:
+				pos[1] += cost
+			elif h:
+				pos[1] *= new / h
+			c -= cost
+			pos[0], pos[2] = new, px
+			accepted[i] = True
+		cash_out.append(c)
+		positions.extend((u, s, n, cost / n, mark) for s, (n, cost, mark) in held.items() if n)
+	return accepted, cash_out, positions
+
+
+def _shards(user_starts: np.ndarray, n_rows: int, parts: int) -> List[Tuple[int, int]]:
+	"""Split users into ``parts`` runs of roughly equal trade counts; returns (first user, end user) pairs."""
+	targets = np.linspace(0, n_rows, parts + 1)[1:-1]
+	cuts = np.unique(np.concatenate([[0], np.searchsorted(user_starts, targets), [len(user_starts)]]))
+	return list(zip(cuts[:-1].tolist(), cuts[1:].tolist()))
+
+
+def replay_trades(trades: pd.DataFrame, cash: float = DEFAULT_CASH, workers: int = 1) -> TradeReplay:
+	"""Replay recorded trades for many users, each from ``cash`` and an empty portfolio.
+
+	``trades`` needs ``user_id``, ``symbol``, ``qty`` and ``price`` columns in the
+	order the trades happened (or a ``seq`` column to sort by within a user).
+	Trades the simulator would reject (not enough cash, selling more than held)
+	are skipped, exactly as ``PortfolioLedger.apply`` does. Users are split into
+	shards of similar size, run on ``workers`` processes when more than one.
+	"""
+	user_codes, users = pd.factorize(trades['user_id'], sort=True)
+	sym_codes, symbols = pd.factorize(trades['symbol'])
+	keys = (trades['seq'].to_numpy(), user_codes) if 'seq' in trades else (user_codes,)
+	order = np.lexsort(keys)
+	sorted_users = user_codes[order]
+	user_starts = np.flatnonzero(np.r_[True, sorted_users[1:] != sorted_users[:-1]]) if len(order) else np.zeros(0, int)
+	bounds = np.r_[user_starts, len(order)]
+	sym = sym_codes[order]
+	qty = trades['qty'].to_numpy(dtype=np.int64)[order]
+	price = trades['price'].to_numpy(dtype=float)[order]
+
+	spans = _shards(user_starts, len(order), max(1, workers) * _SHARDS_PER_WORKER) if len(order) else []
+	shards = [
+		(sym[bounds[a]:bounds[b]], qty[bounds[a]:bounds[b]], price[bounds[a]:bounds[b]], bounds[a:b + 1] - bounds[a], float(cash))
+		for a, b in spans
+	]
+	if workers > 1 and len(shards) > 1:
+		with ProcessPoolExecutor(max_workers=workers) as pool:
+			results = list(pool.map(_replay_shard, shards))
+	else:
+		results = [_replay_shard(shard) for shard in shards]
+
+	accepted_sorted = np.concatenate([r[0] for r in results]) if results else np.zeros(0, dtype=bool)
+	accepted = np.empty(len(order), dtype=bool)
+	accepted[order] = accepted_sorted
+	cash_out = np.array([c for r in results for c in r[1]], dtype=float)
+	rows = [(a + u, s, n, avg, mark) for (a, _), r in zip(spans, results) for u, s, n, avg, mark in r[2]]
+	pos = pd.DataFrame(rows, columns=['user', 'symbol', 'qty', 'avg', 'mark'])
+
+	present = sorted_users[user_starts]
+	counts = np.diff(bounds)
+	applied = np.add.reduceat(accepted_sorted.astype(np.int64), user_starts) if len(order) else np.zeros(0, np.int64)
+	market = np.zeros(len(present))
+	if len(pos):
+		np.add.at(market, pos['user'].to_numpy(), pos['qty'].to_numpy() * pos['mark'].to_numpy())
+	accounts = pd.DataFrame({
+		'user_id': users[present],
+		'cash': cash_out,
+		'market_value': market,
+		'total_value': cash_out + market,
+		'trades': applied,
+		'rejected': counts - applied,
+	})
+	positions = pd.DataFrame({
+		'user_id': users[present][pos['user'].to_numpy()] if len(pos) else pd.Series([], dtype=object),
+		'symbol': symbols[pos['symbol'].to_numpy()] if len(pos) else pd.Series([], dtype=object),
+		'qty': pos['qty'].to_numpy(dtype=np.int64),
+		'avg': pos['avg'].to_numpy(dtype=float),
+		'mark': pos['mark'].to_numpy(dtype=float),
+	})
+	return TradeReplay(accounts, positions, accepted)
+
+
+def replay_quizzes(attempts: pd.DataFrame, questions=QUESTIONS) -> pd.DataFrame:
+	"""Score quiz attempts in one pass and summarise them per user.
+
+	``attempts`` has a ``user_id`` column and one column per question holding the
+	chosen option index (-1 for unanswered), in question order, one row per
+	attempt in the order taken (or sorted by an optional ``seq`` column). Returns
+	``user_id``, ``attempts``, ``last_score`` and ``best_score`` per user.
+	"""
+	if 'seq' in attempts:
+		attempts = attempts.sort_values(['user_id', 'seq'], kind='stable')
+	answer_columns = [c for c in attempts.columns if c not in _QUIZ_META]
+	scores = grade_many(attempts[answer_columns].to_numpy(), questions)
+	per_user = pd.DataFrame({'user_id': attempts['user_id'].to_numpy(), 'score': scores}).groupby('user_id', sort=True)['score']
+	return pd.DataFrame({
+		'attempts': per_user.size(),
+		'last_score': per_user.last(),
+		'best_score': per_user.max(),
+	}).reset_index()
+
+
+def replay(
+	trades: Optional[pd.DataFrame] = None,
+	quizzes: Optional[pd.DataFrame] = None,
+	progress: Optional[Dict[str, Dict[str, bool]]] = None,
+	cash: float = DEFAULT_CASH,
+	workers: int = 1,
+) -> pd.DataFrame:
+	"""Per-user outcome of recorded trades and quiz attempts, with the badges the dashboard would show.
+
+	``progress`` maps a user to their completed lessons, as kept in session state.
+	"""
+	frames = []
+	if trades is not None:
+		frames.append(replay_trades(trades, cash, workers).accounts.set_index('user_id'))
+	if quizzes is not None:
+		frames.append(replay_quizzes(quizzes).set_index('user_id'))
+	summary = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+	progress = progress or {}
+	users = summary.index.union(pd.Index(list(progress), dtype=object))
+	summary = summary.reindex(users)
+	# Users with no trades keep the starting cash; users with no attempts score zero
+	if trades is not None:
+		summary['cash'] = summary['cash'].fillna(cash)
+		summary['total_value'] = summary['total_value'].fillna(cash)
+		summary[['market_value', 'trades', 'rejected']] = summary[['market_value', 'trades', 'rejected']].fillna(0)
+		summary[['trades', 'rejected']] = summary[['trades', 'rejected']].astype(int)
+	for column in ('attempts', 'last_score', 'best_score'):
+		summary[column] = summary[column].fillna(0).astype(int) if column in summary else 0
+	summary['badges'] = [
+		earned_badges(progress.get(user, {}), score) for user, score in zip(summary.index, summary['best_score'])
+	]
+	return summary.rename_axis('user_id').reset_index()
+
+
+def journal_trades(journal=None) -> pd.DataFrame:
+	"""Every user's journaled trades, in order, ready for replay_trades."""
+	from modules.journal import get_journal
+
+	journal = journal or get_journal()
+	rows = [row for batch in journal.iter_all_batches() for row in batch]
+	return pd.DataFrame(rows, columns=['user_id', 'seq', 'ts', 'symbol', 'qty', 'price'])
@@ -0,0 +1,33 @@
+from typing import Optional, Sequence
+
+
+QUESTIONS = [
+	('Time horizon for investments?', ['<1 year', '1-3 years', '3-5 years', '5+ years'], [0,1,2,3]),
+	('How do you react to 10% drop?', ['Sell all', 'Sell some', 'Hold', 'Buy more'], [0,1,2,3]),
+	('Primary goal?', ['Capital preservation', 'Income', 'Growth', 'Aggressive growth'], [0,1,2,3]),
+	('Experience level?', ['New', 'Some', 'Experienced', 'Expert'], [0,1,2,3]),
+]
+
+PROFILES = ('Conservative', 'Balanced', 'Aggressive')
+
+# Highest score for each profile but the last
+_UPPER = (3, 7)
+
+
+def risk_score(answers: Sequence[Optional[int]], questions=QUESTIONS) -> int:
+	"""Sum of the weights of the chosen options (indexes); unanswered questions count zero."""
+	return sum(weights[a] for a, (_, _, weights) in zip(answers, questions) if a is not None)
+
+
+def classify(score: int) -> str:
+	for profile, upper in zip(PROFILES, _UPPER):
+		if score <= upper:
+			return profile
+	return PROFILES[-1]
+
+
+def classify_many(scores):
+	"""Profile names for an array of scores."""
+	import numpy as np
+
+	return np.asarray(PROFILES)[np.searchsorted(_UPPER, np.asarray(scores), side='left')]
@@ -0,0 +1,86 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+
+_SENTENCE = re.compile(r'(?<=[.!?।])\s+')
+_WORD = re.compile(r"[a-z][a-z0-9']+")
+
+_STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you your
+shall may also per said such upon within without via
+""".split())
+
+# Bounds the term-sentence matrix on very long inputs
+MAX_SENTENCES = 4000
+
+
+def split_sentences(text: str) -> List[str]:
+	return [s.strip() for s in _SENTENCE.split(text) if len(s.strip()) > 1]
+
+
+def _tfidf(sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+	"""Sparse TF-IDF in coordinate form: (rows, cols, values, n_terms), rows L2-normalised."""
+	vocab = {}
+	rows: List[int] = []
+	cols: List[int] = []
+	counts: List[int] = []
+	for i, sentence in enumerate(sentences):
+		for word, n in Counter(w for w in _WORD.findall(sentence.lower()) if w not in _STOP_WORDS).items():
+			rows.append(i)
+			cols.append(vocab.setdefault(word, len(vocab)))
+			counts.append(n)
+	rows_a = np.array(rows, dtype=np.int64)
+	cols_a = np.array(cols, dtype=np.int64)
+	df = np.bincount(cols_a, minlength=len(vocab))
+	values = (1.0 + np.log(np.array(counts, dtype=float))) * (np.log(len(sentences) / np.maximum(df, 1)) + 1.0)[cols_a]
+	norms = np.sqrt(np.bincount(rows_a, weights=values ** 2, minlength=len(sentences)))
+	values /= np.maximum(norms, 1e-12)[rows_a]
+	return rows_a, cols_a, values, len(vocab)
+
+
+def _matmul(rows: np.ndarray, cols: np.ndarray, values: np.ndarray, dense: np.ndarray, n_out: int) -> np.ndarray:
+	# (sparse n_out x m) @ (dense m x k), one bincount per output column
+	out = np.empty((n_out, dense.shape[1]))
+	for j in range(dense.shape[1]):
+		out[:, j] = np.bincount(rows, weights=values * dense[cols, j], minlength=n_out)
+	return out
+
+
+def _randomized_svd(rows, cols, values, shape, rank: int, oversample: int = 5, power_iters: int = 2, seed: int = 0):
+	"""Top singular triplets of a sparse matrix (Halko et al.), never forming it densely."""
+	n_rows, n_cols = shape
+	k = min(rank + oversample, n_rows, n_cols)
+	omega = np.random.default_rng(seed).standard_normal((n_cols, k))
+	q, _ = np.linalg.qr(_matmul(rows, cols, values, omega, n_rows))
+	for _ in range(power_iters):
+		z, _ = np.linalg.qr(_matmul(cols, rows, values, q, n_cols))
+		q, _ = np.linalg.qr(_matmul(rows, cols, values, z, n_rows))
+	b = _matmul(cols, rows, values, q, n_cols).T
+	u_b, sigma, _ = np.linalg.svd(b, full_matrices=False)
+	return (q @ u_b)[:, :rank], sigma[:rank]
+
+
+def summarize(text: str, sentences: int = 5, rank: int = 10) -> str:
+	"""LSA-style extractive summary from a sparse TF-IDF matrix and a randomized truncated SVD.
+
+	Sentences are ranked by the length of their vector in the top-``rank``
+	latent space (the Steinberger-Ježek scoring sumy's LSA uses), and the best
+	ones are returned in document order.
+	"""
+	sents = split_sentences(text)[:MAX_SENTENCES]
+	if len(sents) <= sentences:
+		return ' '.join(sents)
+	rows, cols, values, n_terms = _tfidf(sents)
+	if n_terms == 0:
+		return ' '.join(sents[:sentences])
+	u, sigma = _randomized_svd(rows, cols, values, (len(sents), n_terms), rank)
+	scores = np.sqrt(((u * sigma) ** 2).sum(axis=1))
+	best = np.sort(np.argsort(-scores, kind='stable')[:sentences])
+	return ' '.join(sents[i] for i in best)
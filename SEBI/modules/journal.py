@@ -0,0 +1,174 @@
+import csv
+import importlib.util
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+from modules.db import connect
+from modules.state_store import DB_FILE, account_items
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+	user_id TEXT NOT NULL,
+	seq INTEGER NOT NULL,
+	ts TEXT NOT NULL,
+	symbol TEXT NOT NULL,
+	qty INTEGER NOT NULL,
+	price REAL NOT NULL,
+	PRIMARY KEY (user_id, seq)
+) WITHOUT ROWID;
+"""
+
+# Trades kept in session state; older ones are read back from the journal only for export
+RECENT_TRADES = 200
+
+COLUMNS = ('ts', 'symbol', 'qty', 'price')
+
+Trade = Tuple[str, str, int, float]
+
+
+def parquet_available() -> bool:
+	return importlib.util.find_spec('pyarrow') is not None
+
+
+class TradeJournal:
+	"""Append-only per-user trade log in the app database.
+
+	Each trade is written in its own short transaction as it happens, together
+	with the cash and position rows it changed in ``user_state``; reads either
+	take the most recent window or stream everything in batches.
+	"""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		self.path = Path(path) if path is not None else DB_FILE
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+
+	def _conn(self):
+		return connect(self.path)
+
+	def append(
+		self, user_id: str, ts: str, symbol: str, qty: int, price: float, account: Optional[Dict[str, Optional[str]]] = None,
+	) -> None:
+		self.append_many(user_id, [(ts, symbol, qty, price)], account)
+
+	def append_many(self, user_id: str, trades: Iterable[Trade], account: Optional[Dict[str, Optional[str]]] = None) -> None:
+		"""Append trades, and with ``account`` (from ``state_store.account_items``) the rows they moved."""
+		with self._conn() as conn:
+			# Take the write lock before reading the next seq, so two tabs on one profile cannot both claim it
+			conn.execute('BEGIN IMMEDIATE')
+			start = conn.execute('SELECT COALESCE(MAX(seq) + 1, 0) FROM trades WHERE user_id = ?', (user_id,)).fetchone()[0]
+			conn.executemany(
+				'INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?)',
+				((user_id, start + i, ts, sym, int(qty), float(price)) for i, (ts, sym, qty, price) in enumerate(trades)),
+			)
+			if account:
+				# Cash and positions are not tracked by the cohort counters, so StateStore.save's bookkeeping is not needed
+				conn.executemany('INSERT OR REPLACE INTO user_state VALUES (?, ?, ?)', [(user_id, k, v) for k, v in account.items() if v is not None])
+				conn.executemany('DELETE FROM user_state WHERE user_id = ? AND key = ?', [(user_id, k) for k, v in account.items() if v is None])
+
+	def count(self, user_id: str) -> int:
+		# Sequence numbers are dense and never deleted, so this is a primary-key lookup, not a scan
+		return self._conn().execute('SELECT COALESCE(MAX(seq) + 1, 0) FROM trades WHERE user_id = ?', (user_id,)).fetchone()[0]
+
+	def recent(self, user_id: str, limit: int = RECENT_TRADES) -> List[dict]:
+		rows = self._conn().execute(
+			'SELECT ts, symbol, qty, price FROM trades WHERE user_id = ? ORDER BY seq DESC LIMIT ?', (user_id, limit)
+		).fetchall()
+		return [dict(zip(COLUMNS, row)) for row in reversed(rows)]
+
+	def iter_batches(self, user_id: str, batch: int = 10000) -> Iterator[List[Trade]]:
+		cursor = self._conn().execute(
+			'SELECT ts, symbol, qty, price FROM trades WHERE user_id = ? ORDER BY seq', (user_id,)
+		)
+		while True:
+			rows = cursor.fetchmany(batch)
+			if not rows:
+				return
+			yield rows
+
+	def iter_all_batches(self, batch: int = 10000) -> Iterator[List[Tuple[str, int, str, str, int, float]]]:
+		"""Every user's trades as (user_id, seq, ts, symbol, qty, price), ordered by user then sequence."""
+		cursor = self._conn().execute('SELECT user_id, seq, ts, symbol, qty, price FROM trades ORDER BY user_id, seq')
+		while True:
+			rows = cursor.fetchmany(batch)
+			if not rows:
+				return
+			yield rows
+
+	def export(self, user_id: str, fmt: str = 'csv') -> Path:
+		"""Write the user's full history to a temporary file, one batch at a time; returns its path."""
+		suffix = '.parquet' if fmt == 'parquet' else '.csv'
+		with tempfile.NamedTemporaryFile(prefix='trades_', suffix=suffix, delete=False) as tmp:
+			path = Path(tmp.name)
+		if fmt == 'parquet':
+			self._write_parquet(user_id, path)
+		else:
+			with path.open('w', newline='', encoding='utf-8') as f:
+				writer = csv.writer(f)
+				writer.writerow(COLUMNS)
+				for rows in self.iter_batches(user_id):
+					writer.writerows(rows)
+		return path
+
+	def _write_parquet(self, user_id: str, path: Path) -> None:
+		import pyarrow as pa
+		import pyarrow.parquet as pq
+
+		schema = pa.schema([('ts', pa.string()), ('symbol', pa.string()), ('qty', pa.int64()), ('price', pa.float64())])
+		with pq.ParquetWriter(path, schema) as writer:
+			written = False
+			for rows in self.iter_batches(user_id):
+				columns = list(zip(*rows))
+				writer.write_table(pa.Table.from_arrays([pa.array(c, type=f.type) for c, f in zip(columns, schema)], schema=schema))
+				written = True
+			if not written:
+				writer.write_table(schema.empty_table())
+
+
+@lru_cache(maxsize=None)
+def get_journal() -> TradeJournal:
+	return TradeJournal()
+
+
+def record_trade(portfolio: dict, ts: str, symbol: str, qty: int, price: float) -> None:
+	"""Journal a fill with the account rows it changed, and keep the session's save snapshot in step with them."""
+	account = account_items(portfolio, [symbol])
+	get_journal().append(st.session_state.get('user_id', 'default'), ts, symbol, qty, price, account)
+	saved = st.session_state.get('_saved')
+	if saved is not None:
+		for key, value in account.items():
+			if value is None:
+				saved['items'].pop(key, None)
+			else:
+				saved['items'][key] = value
+
+
+def render_trade_export(user_id: str) -> None:
+	"""Export button for the full journal; the file is only written when asked for."""
+	journal = get_journal()
+	total = journal.count(user_id)
+	if not total:
+		return
+	formats = ['CSV'] + (['Parquet'] if parquet_available() else [])
+	c1, c2 = st.columns([2, 1])
+	with c1:
+		fmt = st.radio('Trade history format', formats, horizontal=True, key='export_format').lower()
+	with c2:
+		prepare = st.button(f"Export {total:,} trades")
+	if prepare:
+		path = journal.export(user_id, fmt)
+		try:
+			with path.open('rb') as f:
+				st.download_button(
+					'Download Trade History',
+					data=f,
+					file_name=f"trade_history.{'parquet' if fmt == 'parquet' else 'csv'}",
+					mime='application/octet-stream' if fmt == 'parquet' else 'text/csv',
+				)
+		finally:
+			path.unlink(missing_ok=True)
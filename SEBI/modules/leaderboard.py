@@ -0,0 +1,100 @@
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.db import connect
+from modules.state_store import DB_FILE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard_entries (
+	id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL,
+	score INTEGER NOT NULL,
+	ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_entries_name ON leaderboard_entries (name, ts);
+CREATE TABLE IF NOT EXISTS leaderboard_best (
+	name TEXT PRIMARY KEY,
+	score INTEGER NOT NULL,
+	ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_best_rank ON leaderboard_best (score DESC, ts);
+CREATE TABLE IF NOT EXISTS leaderboard_counts (
+	score INTEGER PRIMARY KEY,
+	n INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS leaderboard_best_insert AFTER INSERT ON leaderboard_best BEGIN
+	INSERT INTO leaderboard_counts VALUES (NEW.score, 1) ON CONFLICT (score) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS leaderboard_best_update AFTER UPDATE OF score ON leaderboard_best BEGIN
+	UPDATE leaderboard_counts SET n = n - 1 WHERE score = OLD.score;
+	INSERT INTO leaderboard_counts VALUES (NEW.score, 1) ON CONFLICT (score) DO UPDATE SET n = n + 1;
+END;
+"""
+
+# Keep a name's best score; on a tie the earlier attempt keeps its place
+_UPSERT_BEST = """
+INSERT INTO leaderboard_best (name, score, ts) VALUES (?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET score = excluded.score, ts = excluded.ts
+WHERE excluded.score > leaderboard_best.score
+"""
+
+
+class Leaderboard:
+	"""Every quiz submission plus each name's best score, ranked by an index on (score DESC, ts).
+
+	Inserts are B-tree upserts, top-K and pages read the rank index in order,
+	and a per-score player count (kept by triggers) answers rank queries. All
+	writes are SQLite transactions, so several processes can share the board.
+	"""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		self.path = Path(path) if path is not None else DB_FILE
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+
+	def _conn(self):
+		return connect(self.path)
+
+	def record(self, name: str, score: int, ts: Optional[float] = None) -> None:
+		self.record_many([(name, score, ts if ts is not None else time.time())])
+
+	def record_many(self, entries: Iterable[Tuple[str, int, float]]) -> None:
+		rows = [(name, int(score), float(ts)) for name, score, ts in entries]
+		with self._conn() as conn:
+			conn.executemany('INSERT INTO leaderboard_entries (name, score, ts) VALUES (?, ?, ?)', rows)
+			conn.executemany(_UPSERT_BEST, rows)
+
+	def top(self, k: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+		rows = self._conn().execute(
+			'SELECT name, score FROM leaderboard_best ORDER BY score DESC, ts LIMIT ? OFFSET ?', (k, offset)
+		)
+		return [{'name': name, 'score': score} for name, score in rows]
+
+	def page(self, page: int, per_page: int = 25) -> List[Dict[str, Any]]:
+		return self.top(per_page, max(page - 1, 0) * per_page)
+
+	def rank_of(self, name: str) -> Optional[int]:
+		"""Competition rank of the name's best score: players on the same score share a rank."""
+		conn = self._conn()
+		best = conn.execute('SELECT score FROM leaderboard_best WHERE name = ?', (name,)).fetchone()
+		if best is None:
+			return None
+		higher = conn.execute('SELECT COALESCE(SUM(n), 0) FROM leaderboard_counts WHERE score > ?', best).fetchone()[0]
+		return higher + 1
+
+	def size(self) -> int:
+		return self._conn().execute('SELECT COALESCE(SUM(n), 0) FROM leaderboard_counts').fetchone()[0]
+
+	def history(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+		rows = self._conn().execute(
+			'SELECT score, ts FROM leaderboard_entries WHERE name = ? ORDER BY ts DESC LIMIT ?', (name, limit)
+		)
+		return [{'score': score, 'ts': ts} for score, ts in rows]
+
+
+@lru_cache(maxsize=None)
+def get_leaderboard() -> Leaderboard:
+	return Leaderboard()
@@ -0,0 +1,107 @@
+import streamlit as st
+from functools import partial
+from typing import Tuple
+from modules.learn_pipeline import run_batch
+from modules.metrics import cached, timed
+from modules.textproc import SUMMARIZERS, fetch_text_with_stats, summarize, translate
+
+
+@cached('fetch_text_from_url', st.cache_data(show_spinner=False, ttl=600))
+def _fetch_text_from_url(url: str) -> Tuple[str, dict]:
+	return fetch_text_with_stats(url)
+
+
+def _fetch_caption(stats: dict) -> str:
+	stages = ', '.join(f"{stage} {secs:.2f}s" for stage, secs in stats['timings'].items())
+	capped = ' (stopped early)' if stats['truncated'] else ''
+	return f"Read {stats['bytes'] / 1024:,.0f} KB for {stats['chars']:,} characters{capped} • {stages}"
+
+
+# Hits and misses for these two are counted by the content cache (content_cache_requests_total)
+@timed('summarize_text')
+def _summarize_text(text: str, sentences: int = 5, method: str = 'lsa') -> str:
+	return summarize(text, sentences, method)
+
+
+@timed('translate_text')
+def _translate_text(text: str, target_lang: str) -> str:
+	return translate(text, target_lang)
+
+
+def render_learn_hub() -> None:
+	st.title('Learn Hub: Translate & Summarize')
+	st.write('Provide a URL (SEBI/NISM/Exchanges) or paste text. Choose language to translate.')
+
+	col1, col2 = st.columns(2)
+	with col1:
+		url = st.text_input('Source URL (optional)')
+		raw_text = st.text_area('Or paste text', height=160)
+	with col2:
+		lang = st.selectbox('Target language', ['hi', 'bn', 'ta'], index=0)
+		do_summarize = st.checkbox('Summarize before translating', value=True)
+		num_sentences = st.slider('Summary sentences', 3, 10, 5)
+		method = st.selectbox('Summarizer', list(SUMMARIZERS), format_func=SUMMARIZERS.get)
+
+	st.markdown('**Quick demo (SEBI circular):**')
+	c1, c2, c3 = st.columns(3)
+	with c1:
+		if st.button('Demo in Hindi'):
+			_demo_process('https://www.sebi.gov.in/legal/circulars', 'hi', do_summarize, num_sentences, method)
+	with c2:
+		if st.button('Demo in Tamil'):
+			_demo_process('https://www.sebi.gov.in/legal/circulars', 'ta', do_summarize, num_sentences, method)
+	with c3:
+		if st.button('Demo in Bengali'):
+			_demo_process('https://www.sebi.gov.in/legal/circulars', 'bn', do_summarize, num_sentences, method)
+
+	if st.button('Process'):
+		source_text = ''
+		if url:
+			source_text, stats = _fetch_text_from_url(url)
+			if source_text.startswith('ERROR:'):
+				st.error(source_text)
+				return
+			st.caption(_fetch_caption(stats))
+		elif raw_text.strip():
+			source_text = raw_text.strip()
+		else:
+			st.warning('Enter a URL or paste some text.')
+			return
+
+		to_translate = _summarize_text(source_text, sentences=num_sentences, method=method) if do_summarize else source_text
+		translated = _translate_text(to_translate, lang)
+
+		st.subheader('Original (truncated)')
+		st.write(to_translate[:1500] + ('…' if len(to_translate) > 1500 else ''))
+
+		st.subheader('Translated')
+		st.write(translated)
+
+	with st.expander('Batch mode: many circulars at once'):
+		batch = st.text_area('URLs (one per line)', height=120, key='batch_urls')
+		if st.button('Process batch'):
+			urls = list(dict.fromkeys(u.strip() for u in batch.splitlines() if u.strip()))
+			if not urls:
+				st.warning('Enter at least one URL.')
+				return
+			progress = st.progress(0.0)
+			for i, doc in enumerate(run_batch(urls, lang, do_summarize, num_sentences, summarizer=partial(summarize, method=method)), start=1):
+				progress.progress(i / len(urls), text=f"{i} of {len(urls)} done")
+				with st.container(border=True):
+					st.markdown(f"**{doc['url']}**")
+					if 'error' in doc:
+						st.error(doc['error'])
+						continue
+					st.write(doc['translated'])
+					st.caption(' • '.join(f"{stage} {secs:.2f}s" for stage, secs in doc['timings'].items()))
+
+
+def _demo_process(url: str, lang: str, do_summarize: bool, num_sentences: int, method: str) -> None:
+	text, _ = _fetch_text_from_url(url)
+	if text.startswith('ERROR:'):
+		st.error(text)
+		return
+	to_translate = _summarize_text(text, sentences=num_sentences, method=method) if do_summarize else text
+	translated = _translate_text(to_translate, lang)
+	st.subheader('Translated Demo')
+	st.write(translated)
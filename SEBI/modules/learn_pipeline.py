@@ -0,0 +1,92 @@
+import multiprocessing
+import queue
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+from modules import textproc
+
+
+def _timed(fn: Callable, *args) -> tuple:
+	t0 = time.perf_counter()
+	return fn(*args), time.perf_counter() - t0
+
+
+def run_batch(
+	urls: List[str],
+	target_lang: str,
+	summarize: bool = True,
+	sentences: int = 5,
+	fetch: Callable[[str], str] = textproc.fetch_text,
+	summarizer: Callable[[str, int], str] = textproc.summarize,
+	translator: Callable[[str, str], str] = textproc.translate,
+	fetch_workers: int = 8,
+	summary_workers: Optional[int] = None,
+	translate_workers: int = 4,
+) -> Iterator[dict]:
+	"""Fetch, summarize and translate many URLs as a pipeline, yielding each document as it finishes.
+
+	Fetches and translations are I/O-bound and run on thread pools (fetches
+	share one pooled HTTP session); summarisation is CPU-bound and runs in
+	worker processes, so ``summarizer`` must be picklable. Workers are
+	spawned rather than forked, as the app server is multi-threaded. Pass
+	``summary_workers=0`` to summarise on a thread instead. Duplicate URLs are
+	fetched once.
+	"""
+	unique = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
+	done: 'queue.Queue[dict]' = queue.Queue()
+	fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='learn-fetch')
+	translate_pool = ThreadPoolExecutor(max_workers=translate_workers, thread_name_prefix='learn-translate')
+	summary_pool: Executor = (
+		ThreadPoolExecutor(max_workers=1) if summary_workers == 0
+		else ProcessPoolExecutor(max_workers=summary_workers, mp_context=multiprocessing.get_context('spawn'))
+	)
+
+	def fail(doc: dict, error: str) -> None:
+		doc['error'] = error
+		done.put(doc)
+
+	def on_translated(doc: dict, fut: Future) -> None:
+		try:
+			doc['translated'], doc['timings']['translate'] = fut.result()
+			done.put(doc)
+		except Exception as e:
+			fail(doc, f'Translation error: {e}')
+
+	def translate(doc: dict) -> None:
+		translate_pool.submit(_timed, translator, doc['summary'], target_lang).add_done_callback(
+			lambda f: on_translated(doc, f)
+		)
+
+	def on_summary(doc: dict, fut: Future) -> None:
+		try:
+			doc['summary'], doc['timings']['summarize'] = fut.result()
+			translate(doc)
+		except Exception as e:
+			fail(doc, f'Summary error: {e}')
+
+	def on_fetched(doc: dict, fut: Future) -> None:
+		try:
+			text, doc['timings']['fetch'] = fut.result()
+			if text.startswith('ERROR:'):
+				return fail(doc, text)
+			doc['text'] = text
+			if summarize:
+				summary_pool.submit(_timed, summarizer, text, sentences).add_done_callback(lambda f: on_summary(doc, f))
+			else:
+				doc['summary'] = text
+				translate(doc)
+		except Exception as e:
+			# Includes RuntimeError from a pool already shut down because the consumer stopped early
+			fail(doc, f'ERROR: {e}')
+
+	try:
+		for url in unique:
+			doc = {'url': url, 'timings': {}}
+			fetch_pool.submit(_timed, fetch, url).add_done_callback(lambda f, doc=doc: on_fetched(doc, f))
+		for _ in unique:
+			yield done.get()
+	finally:
+		fetch_pool.shutdown(wait=False, cancel_futures=True)
+		summary_pool.shutdown(wait=False, cancel_futures=True)
+		translate_pool.shutdown(wait=False, cancel_futures=True)
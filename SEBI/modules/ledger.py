@@ -0,0 +1,114 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PortfolioLedger:
+	"""Positions held in parallel NumPy arrays indexed by a per-symbol id.
+
+	Cash, cost basis and market value are kept up to date on every trade and
+	price mark, so valuation never walks the positions. ``to_portfolio`` and
+	``from_portfolio`` convert to and from the JSON dict kept in session state.
+	"""
+
+	__slots__ = ('cash', 'market_value', 'symbols', '_index', '_qty', '_cost', '_mark')
+
+	def __init__(self, cash: float = 100000.0, capacity: int = 16) -> None:
+		self.cash = float(cash)
+		self.market_value = 0.0
+		self.symbols: List[str] = []
+		self._index: Dict[str, int] = {}
+		self._qty = np.zeros(capacity, dtype=np.int64)
+		self._cost = np.zeros(capacity)
+		self._mark = np.zeros(capacity)
+
+	@classmethod
+	def from_portfolio(cls, portfolio: dict) -> 'PortfolioLedger':
+		positions = portfolio.get('positions', {})
+		ledger = cls(portfolio.get('cash', 100000.0), capacity=max(16, len(positions)))
+		for sym, pos in positions.items():
+			i = ledger._slot(sym)
+			ledger._qty[i] = pos['qty']
+			ledger._cost[i] = pos['qty'] * pos['avg']
+			ledger._mark[i] = pos['avg']
+		n = len(ledger.symbols)
+		ledger.market_value = float(ledger._qty[:n] @ ledger._mark[:n])
+		return ledger
+
+	def _slot(self, symbol: str) -> int:
+		i = self._index.get(symbol)
+		if i is not None:
+			return i
+		i = len(self.symbols)
+		if i == len(self._qty):
+			self._qty = np.resize(self._qty, 2 * i)
+			self._cost = np.resize(self._cost, 2 * i)
+			self._mark = np.resize(self._mark, 2 * i)
+			self._qty[i:] = 0
+			self._cost[i:] = 0.0
+			self._mark[i:] = 0.0
+		self._index[symbol] = i
+		self.symbols.append(symbol)
+		return i
+
+	def qty(self, symbol: str) -> int:
+		i = self._index.get(symbol)
+		return int(self._qty[i]) if i is not None else 0
+
+	def apply(self, symbol: str, qty: int, price: float) -> Optional[str]:
+		"""Apply a fill; returns an error message instead of mutating if it is not allowed."""
+		cost = qty * price
+		if qty > 0 and self.cash < cost:
+			return 'Not enough cash'
+		held = self.qty(symbol)
+		new_qty = held + qty
+		if new_qty < 0:
+			return 'Cannot sell more than held'
+		i = self._slot(symbol)
+		if qty > 0:
+			self._cost[i] += cost
+		elif held:
+			self._cost[i] *= new_qty / held
+		self.cash -= cost
+		self.market_value += new_qty * price - held * self._mark[i]
+		self._qty[i] = new_qty
+		self._mark[i] = price
+		return None
+
+	def mark(self, prices: Dict[str, float]) -> None:
+		idx = [self._index[s] for s in prices if s in self._index]
+		if not idx:
+			return
+		idx = np.array(idx)
+		new = np.array([prices[self.symbols[i]] for i in idx], dtype=float)
+		self.market_value += float(self._qty[idx] @ (new - self._mark[idx]))
+		self._mark[idx] = new
+
+	@property
+	def total_value(self) -> float:
+		return self.cash + self.market_value
+
+	def position(self, symbol: str) -> Optional[dict]:
+		i = self._index.get(symbol)
+		if i is None or self._qty[i] == 0:
+			return None
+		return {'qty': int(self._qty[i]), 'avg': float(self._cost[i] / self._qty[i])}
+
+	def positions_frame(self) -> pd.DataFrame:
+		n = len(self.symbols)
+		held = np.flatnonzero(self._qty[:n])
+		qty = self._qty[held]
+		avg = self._cost[held] / qty
+		mark = self._mark[held]
+		return pd.DataFrame({
+			'Symbol': [self.symbols[i] for i in held],
+			'Qty': qty,
+			'Avg Price': np.round(avg, 2),
+			'Market': np.round(mark, 2),
+			'Unrealized PnL': np.round((mark - avg) * qty, 2),
+		})
+
+	def to_portfolio(self, history: Optional[list] = None) -> dict:
+		positions = {s: self.position(s) for s in self.symbols if self.qty(s)}
+		return {'cash': self.cash, 'positions': positions, 'history': history if history is not None else []}
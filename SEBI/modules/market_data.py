@@ -0,0 +1,118 @@
+import os
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# A provider takes (tickers, days, start) and returns the raw frame yfinance would:
+# columns grouped per ticker (MultiIndex) for batches, flat for a single ticker.
+Provider = Callable[[Sequence[str], int, Optional[date]], pd.DataFrame]
+
+_PROVIDER_ENV = 'SEBI_MARKET_DATA'
+
+
+def yfinance_provider(tickers: Sequence[str], days: int, start: Optional[date] = None) -> pd.DataFrame:
+	import yfinance as yf
+	kwargs = {'start': start.isoformat()} if start is not None else {'period': f"{days}d"}
+	return yf.download(
+		list(tickers),
+		interval='1d',
+		group_by='ticker',
+		threads=True,
+		progress=False,
+		auto_adjust=True,
+		**kwargs,
+	)
+
+
+def synthetic_provider(tickers: Sequence[str], days: int, start: Optional[date] = None) -> pd.DataFrame:
+	"""Offline stand-in with the same shape as a grouped yfinance batch."""
+	end = pd.Timestamp.today().normalize()
+	dates = pd.bdate_range(start=start if start is not None else end - pd.Timedelta(days=days), end=end)
+	frames = {}
+	for ticker in tickers:
+		frames[ticker] = synthetic_history(len(dates), dates=dates).set_index('Date')
+	if not frames:
+		return pd.DataFrame()
+	return pd.concat(frames, axis=1)
+
+
+_PROVIDERS: Dict[str, Provider] = {
+	'yfinance': yfinance_provider,
+	'synthetic': synthetic_provider,
+}
+
+
+def get_provider() -> Provider:
+	return _PROVIDERS.get(os.environ.get(_PROVIDER_ENV, 'yfinance'), yfinance_provider)
+
+
+def synthetic_history(days: int, dates: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+	# Random-walk fallback for demo stability
+	if dates is None:
+		dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq='D')
+	prices = np.cumprod(1 + np.random.normal(0, 0.01, size=days)) * 100
+	df = pd.DataFrame({'Date': dates, 'Close': prices})
+	df.attrs['synthetic'] = True
+	return df
+
+
+def split_batch(raw: pd.DataFrame, tickers: Sequence[str]) -> Dict[str, pd.DataFrame]:
+	"""Split a grouped download into one ``Date``/OHLCV frame per ticker, dropping empty ones."""
+	out: Dict[str, pd.DataFrame] = {}
+	if raw is None or raw.empty:
+		return out
+	grouped = isinstance(raw.columns, pd.MultiIndex)
+	for ticker in tickers:
+		if grouped:
+			if ticker not in raw.columns.get_level_values(0):
+				continue
+			df = raw[ticker]
+		elif len(tickers) == 1:
+			df = raw
+		else:
+			continue
+		df = df.dropna(how='all')
+		if 'Close' not in df.columns or df['Close'].dropna().empty:
+			continue
+		df = df.reset_index()
+		df.columns.name = None
+		out[ticker] = df.rename(columns={df.columns[0]: 'Date'})
+	return out
+
+
+def fetch_history_batch(
+	tickers: Sequence[str],
+	days: int = 60,
+	provider: Optional[Provider] = None,
+	start: Optional[date] = None,
+	fallback: bool = True,
+) -> Dict[str, pd.DataFrame]:
+	"""Download the whole watchlist in one provider call.
+
+	Symbols missing from the response get synthetic data individually (unless
+	``fallback`` is off, in which case they are simply absent).
+	"""
+	unique: List[str] = list(dict.fromkeys(tickers))
+	if not unique:
+		return {}
+	provider = provider or get_provider()
+	try:
+		frames = split_batch(provider(unique, days, start), unique)
+	except Exception:
+		frames = {}
+	if fallback:
+		for ticker in unique:
+			if ticker not in frames:
+				frames[ticker] = synthetic_history(days)
+	return frames
+
+
+def close_matrix(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+	"""Align per-symbol frames into one date x symbol matrix of closes."""
+	if not frames:
+		return pd.DataFrame()
+	closes = {sym: df.set_index('Date')['Close'] for sym, df in frames.items() if not df.empty}
+	return pd.concat(closes, axis=1).sort_index().ffill()
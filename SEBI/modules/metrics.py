@@ -0,0 +1,237 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from modules.db import APP_DIR
+
+
+PREFIX = 'sebi_'
+
+# Upper bounds in seconds, from a cache hit to a slow provider download
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# The text file is rewritten at most this often, at the end of a rerun
+EXPORT_INTERVAL = 15.0
+
+METRICS_FILE = Path(os.environ.get('SEBI_METRICS_FILE') or APP_DIR / 'metrics.prom')
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+_HELP = {
+	'page_render_seconds': 'Time to render a page, per rerun.',
+	'loader_seconds': 'Latency of a cached loader call, hit or miss.',
+	'cache_requests_total': 'Cached loader calls by result.',
+	'external_call_seconds': 'Time spent waiting on a price provider, web page or translation backend.',
+}
+
+
+class Histogram:
+	"""Cumulative-bucket latency histogram in the Prometheus layout."""
+
+	__slots__ = ('counts', 'total', 'count')
+
+	def __init__(self) -> None:
+		self.counts = [0] * (len(BUCKETS) + 1)
+		self.total = 0.0
+		self.count = 0
+
+	def observe(self, seconds: float) -> None:
+		self.counts[bisect_left(BUCKETS, seconds)] += 1
+		self.total += seconds
+		self.count += 1
+
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the q-th observation (inf past the last bucket)."""
+		if not self.count:
+			return 0.0
+		rank, seen = q * self.count, 0
+		for bound, n in zip(BUCKETS + (float('inf'),), self.counts):
+			seen += n
+			if seen >= rank:
+				return bound
+		return float('inf')
+
+
+class Metrics:
+	"""In-process histograms and counters, cheap enough to leave on (a lock and a bisect per observation).
+
+	Values live for the life of the server process. Collectors registered with
+	``register_collector`` are only called when a snapshot or export is taken.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+		self._counters: Dict[Tuple[str, Labels], float] = {}
+		self._collectors: Dict[str, Callable[[], List[Sample]]] = {}
+		self._exported = 0.0
+
+	def observe(self, name: str, seconds: float, **labels: str) -> None:
+		key = (name, tuple(sorted(labels.items())))
+		with self._lock:
+			hist = self._histograms.get(key)
+			if hist is None:
+				hist = self._histograms[key] = Histogram()
+			hist.observe(seconds)
+
+	def inc(self, name: str, n: float = 1, **labels: str) -> None:
+		key = (name, tuple(sorted(labels.items())))
+		with self._lock:
+			self._counters[key] = self._counters.get(key, 0) + n
+
+	def timer(self, name: str, **labels: str) -> '_Timer':
+		return _Timer(self, name, labels)
+
+	def register_collector(self, name: str, collect: Callable[[], List[Sample]]) -> None:
+		self._collectors[name] = collect
+
+	def histograms(self) -> Dict[Tuple[str, Labels], Histogram]:
+		with self._lock:
+			out = {}
+			for key, hist in self._histograms.items():
+				copy = out[key] = Histogram()
+				copy.counts, copy.total, copy.count = list(hist.counts), hist.total, hist.count
+			return out
+
+	def counters(self) -> List[Sample]:
+		with self._lock:
+			samples = [(name, dict(labels), value) for (name, labels), value in self._counters.items()]
+		for collect in list(self._collectors.values()):
+			samples.extend(collect())
+		return samples
+
+	def prometheus_text(self) -> str:
+		lines: List[str] = []
+		described = set()
+
+		def header(name: str, kind: str) -> None:
+			if name not in described:
+				described.add(name)
+				if name in _HELP:
+					lines.append(f"# HELP {PREFIX}{name} {_HELP[name]}")
+				lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+		for (name, labels), hist in sorted(self.histograms().items()):
+			header(name, 'histogram')
+			seen = 0
+			for bound, n in zip(BUCKETS + (float('inf'),), hist.counts):
+				seen += n
+				le = '+Inf' if bound == float('inf') else repr(bound)
+				lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', le),))} {seen}")
+			lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {hist.total!r}")
+			lines.append(f"{PREFIX}{name}_count{_labels(labels)} {hist.count}")
+		for name, labels, value in sorted(self.counters(), key=lambda s: (s[0], sorted(s[1].items()))):
+			header(name, 'counter' if name.endswith('_total') else 'gauge')
+			lines.append(f"{PREFIX}{name}{_labels(tuple(sorted(labels.items())))} {value!r}")
+		return '\n'.join(lines) + '\n'
+
+	def export(self, path: Path = METRICS_FILE, force: bool = False) -> bool:
+		"""Rewrite the Prometheus text file (atomically) if ``EXPORT_INTERVAL`` has passed; returns whether it was written."""
+		now = time.monotonic()
+		with self._lock:
+			if not force and now - self._exported < EXPORT_INTERVAL:
+				return False
+			self._exported = now
+		path = Path(path)
+		tmp = path.with_name(f".{path.name}.{os.getpid()}")
+		try:
+			path.parent.mkdir(parents=True, exist_ok=True)
+			tmp.write_text(self.prometheus_text(), encoding='utf-8')
+			os.replace(tmp, path)
+		except OSError:
+			# Metrics must never break a page; the next export retries
+			return False
+		return True
+
+
+class _Timer:
+	# A plain context manager costs less than half of a @contextmanager generator
+	__slots__ = ('metrics', 'name', 'labels', 'start')
+
+	def __init__(self, metrics: Metrics, name: str, labels: Dict[str, str]) -> None:
+		self.metrics, self.name, self.labels = metrics, name, labels
+
+	def __enter__(self) -> None:
+		self.start = time.perf_counter()
+
+	def __exit__(self, *exc) -> bool:
+		self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+		return False
+
+
+def _labels(labels: Labels) -> str:
+	if not labels:
+		return ''
+	body = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in labels)
+	return '{' + body + '}'
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+	return _metrics
+
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+	_metrics.observe(name, seconds, **labels)
+
+
+def timer(name: str, **labels: str) -> _Timer:
+	return _metrics.timer(name, **labels)
+
+
+_calls = threading.local()
+
+
+def cached(loader: str, cache: Callable[[Callable], Callable]) -> Callable[[Callable], Callable]:
+	"""Apply a cache decorator (e.g. ``st.cache_data(...)``) and count its hits and misses.
+
+	The wrapped function only runs on a miss, so a flag it sets tells the two
+	apart; every call's latency goes to ``loader_seconds``.
+	"""
+
+	def wrap(func: Callable) -> Callable:
+		@functools.wraps(func)
+		def compute(*args, **kwargs):
+			_calls.stack[-1] = True
+			return func(*args, **kwargs)
+
+		inner = cache(compute)
+
+		@functools.wraps(func)
+		def call(*args, **kwargs):
+			stack = getattr(_calls, 'stack', None)
+			if stack is None:
+				stack = _calls.stack = []
+			stack.append(False)
+			t0 = time.perf_counter()
+			try:
+				return inner(*args, **kwargs)
+			finally:
+				_metrics.observe('loader_seconds', time.perf_counter() - t0, loader=loader)
+				_metrics.inc('cache_requests_total', loader=loader, result='miss' if stack.pop() else 'hit')
+
+		call.clear = inner.clear
+		return call
+
+	return wrap
+
+
+def timed(loader: str) -> Callable[[Callable], Callable]:
+	"""Record every call's latency under ``loader_seconds``, for loaders cached elsewhere."""
+
+	def wrap(func: Callable) -> Callable:
+		@functools.wraps(func)
+		def call(*args, **kwargs):
+			with _metrics.timer('loader_seconds', loader=loader):
+				return func(*args, **kwargs)
+
+		return call
+
+	return wrap
@@ -0,0 +1,342 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.metrics import get_metrics
+from modules.risk_engine import PROFILE_VAR_LIMITS
+
+
+TRADING_DAYS = 252
+
+# Horizon of the VaR limits in PROFILE_VAR_LIMITS, in trading days (as the risk panel's default)
+VAR_HORIZON = 20
+_Z_95 = 1.6449
+
+# Per profile: largest weight in any one symbol, and the return/risk trade-off for mean-variance
+PROFILE_LIMITS = {
+	'Conservative': {'max_weight': 0.10, 'risk_aversion': 10.0},
+	'Balanced': {'max_weight': 0.20, 'risk_aversion': 4.0},
+	'Aggressive': {'max_weight': 0.35, 'risk_aversion': 1.5},
+}
+
+METHODS = ('Risk parity', 'Mean-variance')
+
+# Symbols with fewer daily closes than this are left out of the estimate
+MIN_DAYS = 60
+
+_ITERATIONS = 500
+_TOL = 1e-10
+
+# Per price refresh: the estimate, and the allocations built from it by (profile, method)
+_CACHE: 'OrderedDict[str, Tuple[Estimate, Dict[Tuple[str, str], Allocation]]]' = OrderedDict()
+_CACHE_SIZE = 16
+_CACHE_LOCK = threading.Lock()
+
+
+class Estimate(NamedTuple):
+	symbols: List[str]
+	# Daily mean log return per symbol
+	mu: np.ndarray
+	# Shrunk daily covariance of log returns
+	cov: np.ndarray
+	# Weight on the scaled-identity target, 0 (sample) to 1 (target only)
+	shrinkage: float
+	last: np.ndarray
+
+
+class Allocation(NamedTuple):
+	weights: pd.Series
+	cash_weight: float
+	expected_return: float
+	volatility: float
+	var_95: float
+	shrinkage: float
+
+
+def ledoit_wolf(returns: np.ndarray) -> Tuple[np.ndarray, float]:
+	"""Ledoit-Wolf (2004) shrinkage of the sample covariance towards a scaled identity.
+
+	The intensity is estimated from the data in closed form, so the result stays
+	well-conditioned with as many symbols as days, where the sample covariance is
+	singular.
+	"""
+	t, n = returns.shape
+	x = returns - returns.mean(axis=0)
+	sample = x.T @ x / t
+	mean_var = np.trace(sample) / n
+	target_dist = (np.sum(sample ** 2) - 2 * mean_var * np.trace(sample) + n * mean_var ** 2) / n
+	if target_dist <= 0:
+		return sample, 0.0
+	sq_norms = np.sum(x ** 2, axis=1)
+	# sum over days of ||x x' - S||^2 = ||x||^4 - 2 x'Sx + ||S||^2
+	spread = (np.sum(sq_norms ** 2) - 2 * np.sum((x @ sample) * x) + t * np.sum(sample ** 2)) / (t * t * n)
+	shrinkage = min(spread, target_dist) / target_dist
+	cov = shrinkage * mean_var * np.eye(n) + (1 - shrinkage) * sample
+	return cov, float(shrinkage)
+
+
+def estimate(close: pd.DataFrame) -> Estimate:
+	"""Mean and shrunk covariance of daily log returns from a date x symbol close matrix."""
+	close = close.loc[:, close.notna().sum() >= MIN_DAYS].dropna()
+	if close.shape[1] == 0 or len(close) < 2:
+		return Estimate([], np.zeros(0), np.zeros((0, 0)), 0.0, np.zeros(0))
+	values = close.to_numpy(dtype=float)
+	returns = np.diff(np.log(values), axis=0)
+	cov, shrinkage = ledoit_wolf(returns)
+	return Estimate([str(c) for c in close.columns], returns.mean(axis=0), cov, shrinkage, values[-1])
+
+
+def _fingerprint(close: pd.DataFrame) -> str:
+	# Symbols, date range and the first and last closes change whenever prices are refreshed;
+	# hashing the whole matrix would cost as much as estimating from it
+	h = hashlib.sha256()
+	h.update(repr((list(close.columns), close.shape, str(close.index[0]), str(close.index[-1]))).encode('utf-8'))
+	h.update(close.iloc[[0, -1]].to_numpy(dtype=float).tobytes())
+	return h.hexdigest()
+
+
+def _cached(close: pd.DataFrame) -> Tuple[Estimate, Dict[Tuple[str, str], Allocation]]:
+	key = _fingerprint(close)
+	with _CACHE_LOCK:
+		entry = _CACHE.get(key)
+		if entry is not None:
+			_CACHE.move_to_end(key)
+	get_metrics().inc('cache_requests_total', loader='covariance', result='miss' if entry is None else 'hit')
+	if entry is not None:
+		return entry
+	with get_metrics().timer('loader_seconds', loader='covariance'):
+		entry = (estimate(close), {})
+	with _CACHE_LOCK:
+		entry = _CACHE.setdefault(key, entry)
+		while len(_CACHE) > _CACHE_SIZE:
+			_CACHE.popitem(last=False)
+	return entry
+
+
+def cached_estimate(close: pd.DataFrame) -> Estimate:
+	""":func:`estimate`, computed once per price refresh; treat the result as read-only."""
+	return _cached(close)[0] if not close.empty else estimate(close)
+
+
+def cached_allocation(close: pd.DataFrame, profile: str, method: str = METHODS[0]) -> Tuple[Estimate, Allocation]:
+	""":func:`target_allocation` on the cached estimate, itself kept until prices are refreshed."""
+	if close.empty:
+		est = estimate(close)
+		return est, target_allocation(est, profile, method)
+	est, allocations = _cached(close)
+	alloc = allocations.get((profile, method))
+	if alloc is None:
+		alloc = allocations[(profile, method)] = target_allocation(est, profile, method)
+	return est, alloc
+
+
+def cap_weights(weights: np.ndarray, max_weight: float) -> np.ndarray:
+	"""Scale weights to sum to 1 with none above ``max_weight``; excess goes to the uncapped ones.
+
+	If every symbol is at the cap the weights sum to less than 1 and the rest is cash.
+	"""
+	w = np.maximum(weights, 0.0)
+	w = w / w.sum() if w.sum() > 0 else np.full(len(w), 1.0 / len(w))
+	capped = np.zeros(len(w), dtype=bool)
+	for _ in range(len(w)):
+		over = ~capped & (w > max_weight)
+		if not over.any():
+			break
+		capped |= over
+		free = w[~capped].sum()
+		room = 1.0 - max_weight * capped.sum()
+		w[capped] = max_weight
+		if free > 0 and room > 0:
+			w[~capped] *= room / free
+		else:
+			w[~capped] = 0.0
+	return w
+
+
+def risk_parity(cov: np.ndarray, max_weight: float = 1.0) -> np.ndarray:
+	"""Long-only weights with equal risk contributions w_i (Σw)_i, then capped at ``max_weight``.
+
+	Newton's method on the convex problem min ½y'Σy - Σ log(y_i)/n, whose solution
+	normalised to sum 1 is the equal-risk portfolio; a handful of N x N solves at
+	any universe size.
+	"""
+	n = len(cov)
+	budget = 1.0 / n
+	y = 1.0 / np.sqrt(np.diag(cov))
+	y /= np.sqrt(n * (y @ cov @ y))
+
+	def objective(y: np.ndarray) -> float:
+		return 0.5 * y @ cov @ y - budget * np.log(y).sum()
+
+	for _ in range(_ITERATIONS):
+		grad = cov @ y - budget / y
+		direction = np.linalg.solve(cov + np.diag(budget / (y * y)), grad)
+		decrement = grad @ direction
+		if decrement < _TOL:
+			break
+		t, f = 1.0, objective(y)
+		# Backtrack to stay positive and decrease enough (Armijo)
+		while np.any(y - t * direction <= 0) or objective(y - t * direction) > f - 0.25 * t * decrement:
+			t *= 0.5
+		y = y - t * direction
+	return cap_weights(y / y.sum(), max_weight)
+
+
+def _project(v: np.ndarray, max_weight: float) -> np.ndarray:
+	"""Euclidean projection onto {0 <= w <= max_weight, sum(w) = min(1, n * max_weight)}.
+
+	The projection is clip(v - tau, 0, max_weight) for the tau that hits the sum;
+	that sum is piecewise linear in tau with breakpoints at v and v - max_weight,
+	so all breakpoints are evaluated at once from prefix sums and tau is read off
+	the segment that crosses the target.
+	"""
+	total = min(1.0, len(v) * max_weight)
+	ordered = np.sort(v)
+	prefix = np.concatenate([[0.0], np.cumsum(ordered)])
+	taus = np.sort(np.concatenate([ordered, ordered - max_weight]))
+	full = np.searchsorted(ordered, taus + max_weight, side='left')
+	above = np.searchsorted(ordered, taus, side='right')
+	sums = max_weight * (len(v) - full) + prefix[full] - prefix[above] - taus * (full - above)
+	k = int(np.searchsorted(-sums, -total, side='left'))
+	if k == 0:
+		tau = taus[0]
+	elif k == len(taus):
+		tau = taus[-1]
+	else:
+		t0, t1, s0, s1 = taus[k - 1], taus[k], sums[k - 1], sums[k]
+		tau = t1 if s0 == s1 else t0 + (s0 - total) * (t1 - t0) / (s0 - s1)
+	return np.clip(v - tau, 0.0, max_weight)
+
+
+def mean_variance(mu: np.ndarray, cov: np.ndarray, risk_aversion: float, max_weight: float = 1.0) -> np.ndarray:
+	"""Long-only weights maximising mu'w - risk_aversion/2 w'Σw under a per-symbol cap.
+
+	Accelerated projected gradient (FISTA, restarted whenever the momentum points
+	uphill); each step is one matrix-vector product and an O(n log n) projection.
+	Weights are settled to 1e-7, far below what whole shares can express.
+	"""
+	n = len(mu)
+	step = 1.0 / (risk_aversion * np.linalg.eigvalsh(cov)[-1])
+	w = _project(np.full(n, 1.0 / n), max_weight)
+	z, momentum = w, 1.0
+	for _ in range(_ITERATIONS * 4):
+		nxt = _project(z + step * (mu - risk_aversion * (cov @ z)), max_weight)
+		if np.abs(nxt - w).max() < 1e-7:
+			return nxt
+		if (z - nxt) @ (nxt - w) > 0:
+			z, momentum, w = nxt, 1.0, nxt
+			continue
+		following = (1 + np.sqrt(1 + 4 * momentum * momentum)) / 2
+		z = nxt + (momentum - 1) / following * (nxt - w)
+		w, momentum = nxt, following
+	return w
+
+
+def target_allocation(est: Estimate, profile: str, method: str = METHODS[0]) -> Allocation:
+	"""Weights per symbol for a risk profile: position caps from PROFILE_LIMITS, then scaled into cash
+	until the parametric 95% VaR over VAR_HORIZON days is within the profile's PROFILE_VAR_LIMITS.
+	"""
+	limits = PROFILE_LIMITS.get(profile, PROFILE_LIMITS['Balanced'])
+	if not est.symbols:
+		return Allocation(pd.Series(dtype=float), 1.0, 0.0, 0.0, 0.0, est.shrinkage)
+	if method == 'Mean-variance':
+		# Daily figures annualised so the risk aversion reads on the usual scale
+		w = mean_variance(est.mu * TRADING_DAYS, est.cov * TRADING_DAYS, limits['risk_aversion'], limits['max_weight'])
+	else:
+		w = risk_parity(est.cov, limits['max_weight'])
+	var = _var_95(w, est)
+	limit = PROFILE_VAR_LIMITS.get(profile, PROFILE_VAR_LIMITS['Balanced'])
+	if var > limit:
+		w = w * (limit / var)
+		var = _var_95(w, est)
+	return Allocation(
+		weights=pd.Series(w, index=est.symbols),
+		cash_weight=float(max(0.0, 1.0 - w.sum())),
+		expected_return=float(w @ est.mu * TRADING_DAYS),
+		volatility=float(np.sqrt(w @ est.cov @ w * TRADING_DAYS)),
+		var_95=var,
+		shrinkage=est.shrinkage,
+	)
+
+
+def _var_95(w: np.ndarray, est: Estimate) -> float:
+	sigma = np.sqrt(max(float(w @ est.cov @ w), 0.0) * VAR_HORIZON)
+	return float(max(0.0, _Z_95 * sigma - float(w @ est.mu) * VAR_HORIZON))
+
+
+def rebalance_orders(positions: Dict[str, dict], cash: float, prices: Dict[str, float], weights: pd.Series) -> List[Tuple[str, int, float]]:
+	"""(symbol, qty, price) trades from current holdings to whole-share target weights; sells come first.
+
+	Holdings outside ``weights`` are left alone, and only held value in the
+	optimised symbols plus cash is reallocated.
+	"""
+	held = {s: p['qty'] for s, p in positions.items() if s in weights.index and s in prices}
+	budget = cash + sum(qty * prices[s] for s, qty in held.items())
+	orders = []
+	for symbol, weight in weights.items():
+		price = prices.get(symbol)
+		if not price or price <= 0:
+			continue
+		delta = int(weight * budget // price) - held.get(symbol, 0)
+		if delta:
+			orders.append((symbol, delta, price))
+	orders.sort(key=lambda o: o[1] > 0)
+	return orders
+
+
+def render_optimizer_panel(
+	portfolio: dict,
+	load_close: Callable[[], pd.DataFrame],
+	trade: Callable[[str, int, float], Optional[str]],
+) -> None:
+	"""Target allocation for the learner's risk profile over the symbols in ``load_close()``, with a rebalance button.
+
+	``trade`` places one market trade and returns an error message or None.
+	"""
+	with st.expander('Target allocation (risk-profile optimizer)'):
+		own = st.session_state.get('risk_profile', 'Unprofiled')
+		profiles = list(PROFILE_LIMITS)
+		c1, c2 = st.columns(2)
+		profile = c1.selectbox('Risk profile', profiles, index=profiles.index(own) if own in profiles else 1, key='opt_profile')
+		method = c2.selectbox('Method', METHODS, key='opt_method')
+		if own not in profiles:
+			st.caption('Take the Risk Profiler to use your own profile.')
+		if not st.toggle('Build allocation', key='opt_run'):
+			return
+		est, alloc = cached_allocation(load_close(), profile, method)
+		if not est.symbols:
+			st.write(f"Not enough price history; each symbol needs {MIN_DAYS} days.")
+			return
+		limits = PROFILE_LIMITS[profile]
+		cols = st.columns(4)
+		cols[0].metric('Expected return', f"{alloc.expected_return:.1%}", help='Annualised, from historical mean log returns')
+		cols[1].metric('Volatility', f"{alloc.volatility:.1%}", help='Annualised')
+		cols[2].metric(f"VaR 95% ({VAR_HORIZON}d)", f"{alloc.var_95:.1%}", help=f"Limit for {profile}: {PROFILE_VAR_LIMITS[profile]:.0%}")
+		cols[3].metric('Cash', f"{alloc.cash_weight:.0%}")
+		st.caption(
+			f"{len(est.symbols)} symbols, at most {limits['max_weight']:.0%} each. "
+			f"Covariance shrunk {alloc.shrinkage:.0%} towards a common variance (Ledoit-Wolf)."
+		)
+		prices = dict(zip(est.symbols, est.last.tolist()))
+		orders = rebalance_orders(portfolio['positions'], portfolio['cash'], prices, alloc.weights)
+		target = alloc.weights[alloc.weights > 1e-4].sort_values(ascending=False)
+		st.dataframe(
+			pd.DataFrame({'Symbol': target.index, 'Weight %': np.round(target.to_numpy() * 100, 2)}),
+			use_container_width=True,
+			hide_index=True,
+		)
+		if not orders:
+			st.write('Portfolio already matches the target.')
+			return
+		st.write(f"Rebalancing takes {len(orders)} trade(s) at the last close.")
+		if st.button('Rebalance portfolio', key='opt_rebalance'):
+			failed = [(symbol, error) for symbol, qty, price in orders for error in [trade(symbol, qty, price)] if error]
+			if failed:
+				st.warning('; '.join(f"{symbol}: {error}" for symbol, error in failed))
+			else:
+				st.success(f"Placed {len(orders)} trade(s).")
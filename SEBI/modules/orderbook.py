@@ -0,0 +1,330 @@
+import heapq
+import itertools
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+
+ORDER_TYPES = ('market', 'limit', 'stop', 'ioc')
+
+# Default execution model: market and stop fills pay this much past the reference price,
+# and no more than this share of a bar's volume is filled per symbol
+SLIPPAGE_BPS = 5.0
+PARTICIPATION = 0.1
+
+
+class Order:
+	"""A buy (``side=1``) or sell (``side=-1``) order and its fill state."""
+
+	__slots__ = ('id', 'symbol', 'side', 'qty', 'kind', 'price', 'filled', 'status', 'reason', 'seq')
+
+	def __init__(self, id: int, symbol: str, side: int, qty: int, kind: str, price: Optional[float] = None) -> None:
+		self.id = id
+		self.symbol = symbol
+		self.side = side
+		self.qty = qty
+		self.kind = kind
+		self.price = price
+		self.filled = 0
+		self.status = 'open'
+		self.reason = ''
+		self.seq = id
+
+	@property
+	def remaining(self) -> int:
+		return self.qty - self.filled
+
+	def as_row(self) -> dict:
+		return {
+			'ID': self.id,
+			'Symbol': self.symbol,
+			'Side': 'Buy' if self.side > 0 else 'Sell',
+			'Type': self.kind.upper() if self.kind == 'ioc' else self.kind.title(),
+			'Price': self.price,
+			'Qty': self.qty,
+			'Filled': self.filled,
+			'Status': self.status + (f" ({self.reason})" if self.reason else ''),
+		}
+
+
+# (order_id, symbol, signed qty, price, bar timestamp)
+Fill = Tuple[int, str, int, float, object]
+
+# Applies a fill to the account; returns an error message to reject it
+Settle = Callable[[Order, int, float], Optional[str]]
+
+
+class OrderBook:
+	"""Resting orders for one symbol in price-priority heaps (FIFO within a price).
+
+	Buy limits sit in a max-heap and sell limits in a min-heap, so only the
+	orders a bar actually crosses are ever touched. Buy stops trigger from the
+	lowest stop up and sell stops from the highest down. Cancelled orders are
+	dropped lazily when they reach the top of their heap; ``resting`` counts
+	only open orders, so it drops as soon as one is cancelled.
+	"""
+
+	__slots__ = ('symbol', 'last_bar', '_buy_limits', '_sell_limits', '_buy_stops', '_sell_stops', 'resting')
+
+	def __init__(self, symbol: str, last_bar=None) -> None:
+		self.symbol = symbol
+		self.last_bar = last_bar
+		self._buy_limits: List[tuple] = []
+		self._sell_limits: List[tuple] = []
+		self._buy_stops: List[tuple] = []
+		self._sell_stops: List[tuple] = []
+		self.resting = 0
+
+	def add(self, order: Order) -> None:
+		if order.kind == 'stop':
+			heap, key = (self._buy_stops, order.price) if order.side > 0 else (self._sell_stops, -order.price)
+		else:
+			# A market order left over from an earlier bar sorts ahead of every limit
+			price = order.price if order.kind != 'market' else (math.inf if order.side > 0 else 0.0)
+			heap, key = (self._buy_limits, -price) if order.side > 0 else (self._sell_limits, price)
+		heapq.heappush(heap, (key, order.seq, order))
+		self.resting += 1
+
+	def _pop_crossed(self, heap: List[tuple], crossed: Callable[[float], bool]) -> Iterable[Order]:
+		while heap:
+			key, _, order = heap[0]
+			if order.status != 'open':
+				# Cancelled; ``MatchingEngine.cancel`` already took it off ``resting``
+				heapq.heappop(heap)
+				continue
+			if not crossed(key):
+				return
+			yield order
+
+	def _retire(self, heap: List[tuple]) -> None:
+		heapq.heappop(heap)
+		self.resting -= 1
+
+	def match(self, bar: dict, engine: 'MatchingEngine', settle: Settle) -> List[Fill]:
+		"""Fill everything this bar reaches: stops trigger first, then limits in price priority."""
+		o, h, l, ts = bar['Open'], bar['High'], bar['Low'], bar['Date']
+		budget = engine.volume_budget(bar.get('Volume'))
+		fills: List[Fill] = []
+		slip = engine.slippage_bps / 10000.0
+
+		def execute(heap: List[tuple], order: Order, price: float) -> bool:
+			nonlocal budget
+			qty = min(order.remaining, budget)
+			if qty <= 0:
+				return False
+			error = settle(order, order.side * qty, price)
+			if error:
+				order.status, order.reason = 'rejected', error
+			else:
+				order.filled += qty
+				budget -= qty
+				fills.append((order.id, self.symbol, order.side * qty, price, ts))
+				if order.remaining == 0:
+					order.status = 'filled'
+			if order.status != 'open':
+				self._retire(heap)
+			return order.status != 'open'
+
+		# A stop becomes a market order once touched; it fills at the stop, or at the open after a gap
+		for order in self._pop_crossed(self._buy_stops, lambda stop: h >= stop):
+			if not execute(self._buy_stops, order, max(o, order.price) * (1 + slip)):
+				break
+		for order in self._pop_crossed(self._sell_stops, lambda neg_stop: l <= -neg_stop):
+			if not execute(self._sell_stops, order, min(o, order.price) * (1 - slip)):
+				break
+		# Limits never fill worse than their price; an open through the limit fills at the open
+		for order in self._pop_crossed(self._buy_limits, lambda neg_limit: l <= -neg_limit):
+			price = o * (1 + slip) if order.kind == 'market' else min(o, order.price)
+			if not execute(self._buy_limits, order, price):
+				break
+		for order in self._pop_crossed(self._sell_limits, lambda limit: h >= limit):
+			price = o * (1 - slip) if order.kind == 'market' else max(o, order.price)
+			if not execute(self._sell_limits, order, price):
+				break
+		self.last_bar = ts
+		return fills
+
+
+class MatchingEngine:
+	"""Order books for every symbol, matched against bars as the price source delivers them.
+
+	Market and IOC orders execute against the latest bar when submitted; limit
+	and stop orders that cannot fill at once rest in the book and are matched
+	by ``replay`` against each later bar. Fills are capped at ``participation``
+	of a bar's volume (when the source has volume), so large orders fill
+	partially over several bars. ``settle`` applies each fill to the account
+	and may reject it, which cancels the order.
+	"""
+
+	def __init__(self, slippage_bps: float = SLIPPAGE_BPS, participation: float = PARTICIPATION) -> None:
+		self.slippage_bps = slippage_bps
+		self.participation = participation
+		self.books: Dict[str, OrderBook] = {}
+		self.orders: Dict[int, Order] = {}
+		self._ids = itertools.count(1)
+
+	def volume_budget(self, volume) -> int:
+		if volume is None or not math.isfinite(volume) or volume <= 0:
+			return 1 << 62
+		return max(1, int(volume * self.participation))
+
+	def book(self, symbol: str) -> OrderBook:
+		book = self.books.get(symbol)
+		if book is None:
+			book = self.books[symbol] = OrderBook(symbol)
+		return book
+
+	def submit(self, symbol: str, side: int, qty: int, kind: str, price: Optional[float], last_bar: dict, settle: Settle) -> Order:
+		"""Place an order; ``last_bar`` is the newest bar it may execute against immediately."""
+		if kind not in ORDER_TYPES:
+			raise ValueError(f"unknown order type {kind!r}")
+		order = Order(next(self._ids), symbol, 1 if side > 0 else -1, int(qty), kind, None if kind == 'market' else float(price))
+		self.orders[order.id] = order
+		book = self.book(symbol)
+		if book.last_bar is None or last_bar['Date'] > book.last_bar:
+			book.last_bar = last_bar['Date']
+		close = last_bar['Close']
+		slip = self.slippage_bps / 10000.0
+		if kind == 'market':
+			self._fill_now(order, close * (1 + order.side * slip), last_bar, settle)
+		elif kind == 'stop':
+			touched = close >= order.price if order.side > 0 else close <= order.price
+			if touched:
+				self._fill_now(order, close * (1 + order.side * slip), last_bar, settle)
+			else:
+				book.add(order)
+		else:
+			marketable = close <= order.price if order.side > 0 else close >= order.price
+			if marketable:
+				self._fill_now(order, close, last_bar, settle)
+			if order.status == 'open' and order.remaining:
+				if kind == 'ioc':
+					order.status, order.reason = 'cancelled', 'unfilled IOC remainder' if order.filled else 'not marketable'
+				else:
+					book.add(order)
+		return order
+
+	def _fill_now(self, order: Order, price: float, bar: dict, settle: Settle) -> None:
+		qty = min(order.remaining, self.volume_budget(bar.get('Volume')))
+		error = settle(order, order.side * qty, price)
+		if error:
+			order.status, order.reason = 'rejected', error
+			return
+		order.filled += qty
+		if order.remaining == 0:
+			order.status = 'filled'
+		elif order.kind == 'market':
+			# The rest of a market order too big for the bar fills on the next bars at their open
+			self.book(order.symbol).add(order)
+
+	def cancel(self, order_id: int) -> bool:
+		order = self.orders.get(order_id)
+		if order is None or order.status != 'open':
+			return False
+		order.status = 'cancelled'
+		# Every open order rests in its book; the heap entry itself is dropped lazily
+		self.books[order.symbol].resting -= 1
+		return True
+
+	def replay(self, symbol: str, bars: pd.DataFrame, settle: Settle) -> List[Fill]:
+		"""Match resting orders for ``symbol`` against every bar newer than the last one seen."""
+		book = self.books.get(symbol)
+		if book is None or not book.resting or bars.empty:
+			return []
+		if book.last_bar is not None:
+			bars = bars[bars['Date'] > book.last_bar]
+		fills: List[Fill] = []
+		for bar in _bar_records(bars):
+			fills.extend(book.match(bar, self, settle))
+			if not book.resting:
+				break
+		return fills
+
+	def replay_all(self, histories: Dict[str, pd.DataFrame], settle: Settle) -> List[Fill]:
+		fills: List[Fill] = []
+		for symbol, bars in histories.items():
+			fills.extend(self.replay(symbol, bars, settle))
+		return fills
+
+	def resting_symbols(self) -> List[str]:
+		return sorted(sym for sym, book in self.books.items() if book.resting)
+
+	def open_orders(self) -> List[Order]:
+		return [o for o in self.orders.values() if o.status == 'open']
+
+
+def _bar_records(bars: pd.DataFrame) -> List[dict]:
+	# Close-only sources (synthetic data) are treated as bars with O = H = L = C
+	close = bars['Close']
+	frame = pd.DataFrame({
+		'Date': bars['Date'],
+		'Open': bars['Open'].fillna(close) if 'Open' in bars else close,
+		'High': bars['High'].fillna(close) if 'High' in bars else close,
+		'Low': bars['Low'].fillna(close) if 'Low' in bars else close,
+		'Close': close,
+		'Volume': bars['Volume'] if 'Volume' in bars else float('nan'),
+	})
+	return frame.to_dict('records')
+
+
+def last_bar(bars: pd.DataFrame) -> dict:
+	return _bar_records(bars.tail(1))[0]
+
+
+def describe_fill(fill: Fill) -> str:
+	order_id, symbol, qty, price, _ = fill
+	return f"{'Bought' if qty > 0 else 'Sold'} {abs(qty)} {symbol} at {price:.2f} (order #{order_id})"
+
+
+def render_order_ticket(symbol: str, bars: pd.DataFrame, engine: MatchingEngine, settle: Settle) -> None:
+	"""Order type, quantity and price inputs with Buy/Sell buttons for one symbol."""
+	bar = last_bar(bars)
+	kind = st.selectbox(
+		f"Order type for {symbol}", ORDER_TYPES, key=f"type_{symbol}",
+		format_func=lambda k: k.upper() if k == 'ioc' else k.title(),
+	)
+	qty = st.number_input(f"Qty for {symbol}", min_value=1, max_value=10000, value=10, step=1, key=f"qty_{symbol}")
+	price = None
+	if kind != 'market':
+		label = 'Stop price' if kind == 'stop' else 'Limit price'
+		price = st.number_input(f"{label} for {symbol}", min_value=0.01, value=round(float(bar['Close']), 2), step=0.05, key=f"price_{symbol}")
+	c1, c2 = st.columns(2)
+	side = 0
+	with c1:
+		if st.button(f"Buy {symbol}", key=f"buy_{symbol}"):
+			side = 1
+	with c2:
+		if st.button(f"Sell {symbol}", key=f"sell_{symbol}"):
+			side = -1
+	if side:
+		order = engine.submit(symbol, side, qty, kind, price, bar, settle)
+		if order.status == 'rejected':
+			st.error(order.reason)
+		elif order.status == 'cancelled':
+			st.warning(f"{order.as_row()['Type']} order #{order.id} cancelled: {order.reason}")
+		elif order.status == 'open':
+			st.info(f"Order #{order.id} resting: {order.filled} of {order.qty} filled")
+
+
+def render_open_orders(engine: MatchingEngine) -> None:
+	orders = engine.open_orders()
+	with st.expander(f"Open orders ({len(orders)})", expanded=bool(orders)):
+		if not orders:
+			st.write('No resting orders. Limit and stop orders that cannot fill at once wait here for new bars.')
+			return
+		st.dataframe(pd.DataFrame([o.as_row() for o in orders]), use_container_width=True, hide_index=True)
+		c1, c2, c3 = st.columns([2, 1, 1])
+		with c1:
+			order_id = st.number_input('Order ID', min_value=1, value=orders[0].id, step=1, key='cancel_order_id')
+		with c2:
+			if st.button('Cancel order'):
+				if engine.cancel(int(order_id)):
+					st.rerun()
+				st.warning(f"Order #{order_id} is not open")
+		with c3:
+			if st.button('Cancel all'):
+				for order in orders:
+					engine.cancel(order.id)
+				st.rerun()
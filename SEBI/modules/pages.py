@@ -0,0 +1,35 @@
+import os
+from typing import Callable, Dict
+
+import streamlit as st
+
+from modules.metrics import timer
+
+
+def lazy_page(module: str, render: str, **kwargs) -> Callable[[], None]:
+	"""A page renderer that imports its module, and the module's dependencies, only when first shown."""
+
+	def run() -> None:
+		# __import__ rather than importlib.import_module, so the import shows up under python -X importtime
+		getattr(__import__(module, fromlist=[render]), render)(**kwargs)
+
+	return run
+
+
+def admin_enabled() -> bool:
+	"""The metrics page is listed only with ``?admin=<token>`` in the URL, and never unless SEBI_ADMIN_TOKEN is set."""
+	token = os.environ.get('SEBI_ADMIN_TOKEN')
+	return bool(token) and st.query_params.get('admin') == token
+
+
+def render_page(pages: Dict[str, Callable[[], None]], name: str) -> None:
+	with timer('page_render_seconds', page=name):
+		pages[name]()
+
+
+def render_resources() -> None:
+	st.title('Resources')
+	st.markdown('- [SEBI - Investor Education](https://investor.sebi.gov.in)')
+	st.markdown('- [NISM Certifications](https://www.nism.ac.in)')
+	st.markdown('- [NSE Investor](https://www.nseindia.com/invest)')
+	st.markdown('- [BSE Investor](https://www.bseindia.com/investors)')
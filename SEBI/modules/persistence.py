@@ -0,0 +1,77 @@
+import json
+import sqlite3
+
+import streamlit as st
+
+from modules.db import APP_DIR
+from modules.journal import get_journal
+from modules.leaderboard import get_leaderboard
+from modules.state_store import get_state_store, sanitize_user_id
+
+
+_STATE_DIR = APP_DIR
+_STATE_DIR.mkdir(parents=True, exist_ok=True)
+_STATE_FILE = _STATE_DIR / "state.json"  # legacy single-file state, imported once
+_LEADERBOARD_FILE = _STATE_DIR / "leaderboard.json"  # legacy top-25 file, imported once
+
+
+def _user_id() -> str:
+	# A convenience key, not a credential: anyone who knows a profile name can open and save it
+	return sanitize_user_id(st.query_params.get('user', 'default'))
+
+
+def load_state() -> None:
+	# Load once per session; reloading on every rerun would discard unsaved progress
+	if st.session_state.get('_state_loaded'):
+		return
+	st.session_state['_state_loaded'] = True
+	user_id = st.session_state['user_id'] = _user_id()
+	try:
+		store = get_state_store()
+		data, snapshot = store.load(user_id)
+		if data is None and user_id == 'default' and _STATE_FILE.exists():
+			# One-time import of the old single-file state
+			data = json.loads(_STATE_FILE.read_text(encoding='utf-8'))
+			snapshot = store.save(user_id, data)
+			legacy_trades = data.get('portfolio', {}).get('history', [])
+			get_journal().append_many(user_id, ((t['ts'], t['symbol'], t['qty'], t['price']) for t in legacy_trades))
+		if data is not None:
+			st.session_state['progress'] = data.get('progress', {})
+			st.session_state['portfolio'] = data.get('portfolio', st.session_state['portfolio'])
+			st.session_state['portfolio']['history'] = get_journal().recent(user_id)
+			st.session_state['best_quiz_score'] = data.get('best_quiz_score', 0)
+			st.session_state['risk_profile'] = data.get('risk_profile', 'Unprofiled')
+		st.session_state['_saved'] = snapshot
+		board = get_leaderboard()
+		if board.size() == 0 and _LEADERBOARD_FILE.exists():
+			# One-time import of the old top-25 file
+			legacy = json.loads(_LEADERBOARD_FILE.read_text(encoding='utf-8'))
+			board.record_many((row['name'], row['score'], 0.0) for row in legacy)
+		st.session_state['leaderboard'] = board.top(25)
+	except (sqlite3.Error, OSError, ValueError):
+		pass
+
+
+def save_state() -> bool:
+	"""Write only what changed since the last save; returns False if the store is unavailable."""
+	try:
+		payload = {
+			'progress': st.session_state.get('progress', {}),
+			'portfolio': st.session_state.get('portfolio', {}),
+			'best_quiz_score': st.session_state.get('best_quiz_score', 0),
+			'risk_profile': st.session_state.get('risk_profile', 'Unprofiled'),
+		}
+		user_id = st.session_state.get('user_id', 'default')
+		st.session_state['_saved'] = get_state_store().save(user_id, payload, st.session_state.get('_saved'))
+		return True
+	except (sqlite3.Error, OSError, TypeError, ValueError):
+		return False
+
+
+def append_leaderboard_entry(name: str, score: int) -> None:
+	try:
+		board = get_leaderboard()
+		board.record(name.strip() or 'Anonymous', int(score))
+		st.session_state['leaderboard'] = board.top(25)
+	except sqlite3.Error:
+		pass
@@ -0,0 +1,181 @@
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from modules.db import APP_DIR, connect
+from modules.market_data import Provider, fetch_history_batch, synthetic_history
+from modules.metrics import Sample, get_metrics, timer
+
+
+_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+	symbol TEXT NOT NULL,
+	date TEXT NOT NULL,
+	open REAL, high REAL, low REAL, close REAL, volume REAL,
+	PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS refresh (
+	symbol TEXT PRIMARY KEY,
+	fetched_at REAL NOT NULL,
+	covered_from TEXT
+);
+"""
+
+# Keep the earliest date the stored bars are known to cover; a top-up (NULL) leaves it as is
+_MARK_REFRESH = """
+INSERT INTO refresh (symbol, fetched_at, covered_from) VALUES (?, ?, ?)
+ON CONFLICT (symbol) DO UPDATE SET
+	fetched_at = excluded.fetched_at,
+	covered_from = MIN(COALESCE(refresh.covered_from, excluded.covered_from), COALESCE(excluded.covered_from, refresh.covered_from))
+"""
+
+
+class PriceStore:
+	"""Daily OHLCV bars on disk, keyed by (symbol, date).
+
+	Symbols refreshed within ``ttl`` seconds are served from disk; older ones
+	fetch only the bars from their last stored date onwards. A request reaching
+	further back than the stored window (``covered_from``) is a miss and fetches
+	the whole window again.
+	"""
+
+	def __init__(self, path: Optional[Path] = None, ttl: float = 3600.0) -> None:
+		self.path = Path(path) if path is not None else APP_DIR / 'prices.sqlite3'
+		self.ttl = ttl
+		self._lock = threading.Lock()
+		self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'rows_fetched': 0, 'provider_calls': 0}
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+			columns = [row[1] for row in conn.execute('PRAGMA table_info(refresh)')]
+			if 'covered_from' not in columns:
+				# Stores from before the column existed: every symbol backfills once
+				conn.execute('ALTER TABLE refresh ADD COLUMN covered_from TEXT')
+
+	def _conn(self):
+		return connect(self.path)
+
+	def _count(self, key: str, n: int = 1) -> None:
+		with self._lock:
+			self._stats[key] += n
+
+	def stats(self) -> Dict[str, float]:
+		with self._lock:
+			out = dict(self._stats)
+		lookups = out['hits'] + out['misses'] + out['stale']
+		out['hit_rate'] = out['hits'] / lookups if lookups else 0.0
+		return out
+
+	def metric_samples(self) -> List[Sample]:
+		stats = self.stats()
+		samples = [('price_store_lookups_total', {'result': result}, stats[key]) for result, key in (('hit', 'hits'), ('miss', 'misses'), ('stale', 'stale'))]
+		samples.append(('price_store_provider_calls_total', {}, stats['provider_calls']))
+		samples.append(('price_store_rows_fetched_total', {}, stats['rows_fetched']))
+		return samples
+
+	def staleness(self, tickers: Sequence[str]) -> Dict[str, Optional[float]]:
+		"""Seconds since each symbol was last refreshed (None if never)."""
+		now = time.time()
+		fetched = self._fetched_at(tickers)
+		return {t: (now - fetched[t]) if t in fetched else None for t in tickers}
+
+	def _fetched_at(self, tickers: Sequence[str]) -> Dict[str, float]:
+		return {symbol: fetched for symbol, (fetched, _) in self._refresh_marks(tickers).items()}
+
+	def _refresh_marks(self, tickers: Sequence[str]) -> Dict[str, tuple]:
+		marks = ','.join('?' * len(tickers))
+		rows = self._conn().execute(
+			f'SELECT symbol, fetched_at, covered_from FROM refresh WHERE symbol IN ({marks})', list(tickers)
+		)
+		return {symbol: (fetched, covered) for symbol, fetched, covered in rows}
+
+	def _last_dates(self, tickers: Sequence[str]) -> Dict[str, str]:
+		marks = ','.join('?' * len(tickers))
+		rows = self._conn().execute(
+			f'SELECT symbol, MAX(date) FROM bars WHERE symbol IN ({marks}) GROUP BY symbol', list(tickers)
+		)
+		return dict(rows.fetchall())
+
+	def upsert(self, symbol: str, df: pd.DataFrame) -> int:
+		if df.empty:
+			return 0
+		dates = pd.to_datetime(df['Date'])
+		if dates.dt.tz is not None:
+			dates = dates.dt.tz_localize(None)
+		cols = [df[f].astype(float) if f in df.columns else pd.Series(None, index=df.index, dtype=float) for f in _FIELDS]
+		values = pd.concat([dates.dt.strftime('%Y-%m-%d')] + cols, axis=1)
+		values = values.astype(object).where(values.notna(), None)
+		rows = [(symbol, *r) for r in values.itertuples(index=False, name=None)]
+		with self._conn() as conn:
+			conn.executemany('INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+		return len(rows)
+
+	def read(self, symbol: str, days: int) -> pd.DataFrame:
+		since = (date.today() - timedelta(days=days)).isoformat()
+		df = pd.read_sql_query(
+			'SELECT date AS Date, open AS Open, high AS High, low AS Low, close AS Close, volume AS Volume '
+			'FROM bars WHERE symbol = ? AND date >= ? ORDER BY date',
+			self._conn(), params=(symbol, since),
+		)
+		df['Date'] = pd.to_datetime(df['Date'])
+		return df.dropna(axis=1, how='all')
+
+	def get_history(
+		self,
+		tickers: Sequence[str],
+		days: int = 60,
+		provider: Optional[Provider] = None,
+	) -> Dict[str, pd.DataFrame]:
+		unique: List[str] = list(dict.fromkeys(tickers))
+		if not unique:
+			return {}
+		now = time.time()
+		since = (date.today() - timedelta(days=days)).isoformat()
+		marks = self._refresh_marks(unique)
+		last = self._last_dates(unique)
+		fetched = {t: mark[0] for t, mark in marks.items()}
+		covered_from = {t: mark[1] for t, mark in marks.items() if mark[1] is not None}
+		# Never stored, or stored only for a shorter window than this request
+		missing = [t for t in unique if t not in last or t not in covered_from or covered_from[t] > since]
+		stale = [t for t in unique if t not in missing and now - fetched.get(t, 0.0) > self.ttl]
+		self._count('misses', len(missing))
+		self._count('stale', len(stale))
+		self._count('hits', len(unique) - len(missing) - len(stale))
+
+		covered = []
+		if missing:
+			covered += [(t, now, since) for t in self._refresh(missing, days, None, provider)]
+		if stale:
+			# Re-fetch the last stored bar too: it may have been a partial day.
+			start = date.fromisoformat(min(last[t] for t in stale))
+			covered += [(t, now, None) for t in self._refresh(stale, days, start, provider)]
+		if covered:
+			with self._conn() as conn:
+				conn.executemany(_MARK_REFRESH, covered)
+
+		out: Dict[str, pd.DataFrame] = {}
+		for ticker in unique:
+			df = self.read(ticker, days)
+			out[ticker] = df if not df.empty else synthetic_history(days)
+		return out
+
+	def _refresh(self, tickers: List[str], days: int, start: Optional[date], provider: Optional[Provider]) -> List[str]:
+		self._count('provider_calls')
+		with timer('external_call_seconds', service='prices'):
+			frames = fetch_history_batch(tickers, days, provider=provider, start=start, fallback=False)
+		for ticker, df in frames.items():
+			self._count('rows_fetched', self.upsert(ticker, df))
+		return list(frames)
+
+
+@lru_cache(maxsize=None)
+def get_price_store() -> PriceStore:
+	store = PriceStore()
+	get_metrics().register_collector('price_store', store.metric_samples)
+	return store
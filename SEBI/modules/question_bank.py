@@ -0,0 +1,261 @@
+import json
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from modules.db import APP_DIR, connect
+from modules.engine.adaptive import DIFFICULTIES, Mastery, difficulty_for, mastery_mean, pick_topics
+from modules.engine.quiz import QUESTIONS
+from modules.state_store import DB_FILE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+	id INTEGER PRIMARY KEY,
+	lang TEXT NOT NULL,
+	topic TEXT NOT NULL,
+	difficulty INTEGER NOT NULL,
+	question TEXT NOT NULL,
+	options TEXT NOT NULL,
+	answer INTEGER NOT NULL,
+	explanation TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS questions_bucket ON questions (lang, topic, difficulty);
+"""
+
+_MASTERY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quiz_mastery (
+	user_id TEXT NOT NULL,
+	topic TEXT NOT NULL,
+	correct INTEGER NOT NULL,
+	attempts INTEGER NOT NULL,
+	PRIMARY KEY (user_id, topic)
+) WITHOUT ROWID;
+"""
+
+DEFAULT_LANG = 'en'
+
+# Question bodies kept in memory; the id index is always fully loaded
+_CACHE_SIZE = 4096
+
+# Random draws from a bucket before falling back to a scan for an unseen question
+_DRAWS = 8
+
+Buckets = Dict[Tuple[str, int], array]
+
+
+def lesson_topics() -> List[str]:
+	from modules.tutorials import LESSONS
+
+	return [lesson['key'] for lesson in LESSONS]
+
+
+_INSERT = 'INSERT INTO questions (lang, topic, difficulty, question, options, answer, explanation) VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+
+def _rows(questions: Iterable[dict]) -> List[tuple]:
+	topics = set(lesson_topics())
+	rows = []
+	for q in questions:
+		if q['topic'] not in topics:
+			raise ValueError(f"unknown topic {q['topic']!r}; expected one of {sorted(topics)}")
+		if q['difficulty'] not in DIFFICULTIES:
+			raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+		if not 0 <= q['answer'] < len(q['options']):
+			raise ValueError(f"answer {q['answer']} is not an option of {q['q']!r}")
+		rows.append((
+			q.get('lang', DEFAULT_LANG), q['topic'], q['difficulty'], q['q'],
+			json.dumps(q['options'], ensure_ascii=False), q['answer'], q.get('expl', ''),
+		))
+	return rows
+
+
+class QuestionBank:
+	"""Quiz questions on disk, bucketed by (language, topic, difficulty).
+
+	Per language, only the question ids of each bucket are loaded, on first use,
+	into compact integer arrays; question text is read by primary key when a quiz
+	is shown. Topics are the lesson keys from the Tutorials page.
+	"""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		self.path = Path(path) if path is not None else APP_DIR / 'questions.sqlite3'
+		self._lock = threading.Lock()
+		self._buckets: Dict[str, Buckets] = {}
+		self._cache: 'OrderedDict[int, dict]' = OrderedDict()
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+		if self._conn().execute('SELECT 1 FROM questions LIMIT 1').fetchone() is None:
+			self._seed()
+
+	def _conn(self):
+		return connect(self.path)
+
+	def _seed(self) -> None:
+		rows = _rows({**q, 'lang': DEFAULT_LANG} for q in QUESTIONS)
+		conn = self._conn()
+		with conn:
+			# Check again under the write lock, so processes starting together on an empty bank seed it once
+			conn.execute('BEGIN IMMEDIATE')
+			if conn.execute('SELECT 1 FROM questions LIMIT 1').fetchone() is None:
+				conn.executemany(_INSERT, rows)
+
+	def add(self, questions: Iterable[dict]) -> int:
+		"""Insert questions (``q``, ``options``, ``answer``, ``expl``, ``topic``, ``difficulty``, ``lang``); returns how many."""
+		rows = _rows(questions)
+		with self._conn() as conn:
+			conn.executemany(_INSERT, rows)
+		with self._lock:
+			self._buckets.clear()
+		return len(rows)
+
+	def count(self) -> int:
+		return self._conn().execute('SELECT COUNT(*) FROM questions').fetchone()[0]
+
+	def languages(self) -> List[str]:
+		return [row[0] for row in self._conn().execute('SELECT DISTINCT lang FROM questions ORDER BY lang')]
+
+	def buckets(self, lang: str) -> Buckets:
+		with self._lock:
+			buckets = self._buckets.get(lang)
+		if buckets is not None:
+			return buckets
+		buckets = {}
+		# Read straight off the (lang, topic, difficulty) index, which carries the id
+		rows = self._conn().execute('SELECT topic, difficulty, id FROM questions WHERE lang = ? ORDER BY topic, difficulty', (lang,))
+		for topic, difficulty, qid in rows:
+			bucket = buckets.get((topic, difficulty))
+			if bucket is None:
+				bucket = buckets[(topic, difficulty)] = array('q')
+			bucket.append(qid)
+		with self._lock:
+			self._buckets[lang] = buckets
+		return buckets
+
+	def select(
+		self,
+		mastery: Mastery,
+		lang: str = DEFAULT_LANG,
+		n: int = 5,
+		rng: Optional[random.Random] = None,
+		exclude: Sequence[int] = (),
+	) -> List[int]:
+		"""Question ids for a quiz of ``n``, aimed at the learner's weakest topics at a matching difficulty.
+
+		Questions in ``exclude`` (recently seen) are avoided while the bank has
+		others. Topics with no questions in ``lang`` fall back to English.
+		"""
+		rng = rng or random.Random()
+		sources = [self.buckets(lang)]
+		if lang != DEFAULT_LANG:
+			sources.append(self.buckets(DEFAULT_LANG))
+		topics = sorted({topic for buckets in sources for topic, _ in buckets})
+		if not topics:
+			return []
+		taken = set(exclude)
+		chosen: List[int] = []
+		for topic in pick_topics(mastery, topics, n, rng):
+			difficulty = difficulty_for(mastery_mean(*mastery.get(topic, (0, 0))))
+			for buckets in sources:
+				qid = _draw(buckets, topic, difficulty, taken, rng)
+				if qid is not None:
+					chosen.append(qid)
+					taken.add(qid)
+					break
+		if len(chosen) < n:
+			# Small bank or narrow topic: fill from anywhere, repeating seen questions only as a last resort
+			picked = set(chosen)
+			for skip_seen in (True, False):
+				for buckets in sources:
+					for bucket in buckets.values():
+						for qid in bucket:
+							if len(chosen) == n:
+								return chosen
+							if qid in picked or (skip_seen and qid in taken):
+								continue
+							chosen.append(qid)
+							picked.add(qid)
+		return chosen
+
+	def questions(self, ids: Sequence[int]) -> List[dict]:
+		"""Questions by id, in the order given, as dicts like ``modules.engine.quiz.QUESTIONS`` plus ``id`` and ``lang``."""
+		with self._lock:
+			found = {qid: self._cache[qid] for qid in ids if qid in self._cache}
+			for qid in found:
+				self._cache.move_to_end(qid)
+		missing = [qid for qid in ids if qid not in found]
+		if missing:
+			marks = ','.join('?' * len(missing))
+			rows = self._conn().execute(
+				f'SELECT id, lang, topic, difficulty, question, options, answer, explanation FROM questions WHERE id IN ({marks})',
+				missing,
+			)
+			with self._lock:
+				for qid, lang, topic, difficulty, text, options, answer, expl in rows:
+					found[qid] = self._cache[qid] = {
+						'id': qid, 'lang': lang, 'topic': topic, 'difficulty': difficulty,
+						'q': text, 'options': json.loads(options), 'answer': answer, 'expl': expl,
+					}
+				while len(self._cache) > _CACHE_SIZE:
+					self._cache.popitem(last=False)
+		return [found[qid] for qid in ids if qid in found]
+
+
+def _draw(buckets: Buckets, topic: str, difficulty: int, taken: set, rng: random.Random) -> Optional[int]:
+	# Nearest difficulty first: the asked-for one, then easier before harder
+	for level in sorted(DIFFICULTIES, key=lambda d: (abs(d - difficulty), d)):
+		bucket = buckets.get((topic, level))
+		if not bucket:
+			continue
+		for _ in range(_DRAWS):
+			qid = bucket[rng.randrange(len(bucket))]
+			if qid not in taken:
+				return qid
+		for qid in bucket:
+			if qid not in taken:
+				return qid
+	return None
+
+
+class MasteryStore:
+	"""Per-user, per-topic counts of correct answers and attempts, in the app database."""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		self.path = Path(path) if path is not None else DB_FILE
+		with self._conn() as conn:
+			conn.executescript(_MASTERY_SCHEMA)
+
+	def _conn(self):
+		return connect(self.path)
+
+	def get(self, user_id: str) -> Mastery:
+		rows = self._conn().execute('SELECT topic, correct, attempts FROM quiz_mastery WHERE user_id = ?', (user_id,))
+		return {topic: (correct, attempts) for topic, correct, attempts in rows}
+
+	def record(self, user_id: str, results: Iterable[Tuple[str, bool]]) -> None:
+		"""Add one attempt per (topic, correct) pair."""
+		totals: Dict[str, List[int]] = {}
+		for topic, correct in results:
+			counts = totals.setdefault(topic, [0, 0])
+			counts[0] += int(bool(correct))
+			counts[1] += 1
+		with self._conn() as conn:
+			conn.executemany(
+				'INSERT INTO quiz_mastery VALUES (?, ?, ?, ?) ON CONFLICT (user_id, topic) DO UPDATE '
+				'SET correct = correct + excluded.correct, attempts = attempts + excluded.attempts',
+				[(user_id, topic, c, a) for topic, (c, a) in totals.items()],
+			)
+
+
+@lru_cache(maxsize=None)
+def get_question_bank() -> QuestionBank:
+	return QuestionBank()
+
+
+@lru_cache(maxsize=None)
+def get_mastery_store() -> MasteryStore:
+	return MasteryStore()
@@ -1,75 +1,80 @@
+import sqlite3
+
 import streamlit as st
-from modules.utils import append_leaderboard_entry
-
-QUESTIONS = [
-	{
-		'q': 'Which of these best describes diversification?',
-		'options': ['Putting all money in one stock', 'Spreading investments across assets', 'Timing the market', 'Day trading daily'],
-		'answer': 1,
-		'expl': 'Diversification reduces unsystematic risk by spreading exposure.'
-	},
-	{
-		'q': 'Higher expected return usually comes with…',
-		'options': ['Lower risk', 'No risk', 'Higher risk', 'Guaranteed profit'],
-		'answer': 2,
-		'expl': 'Risk-return tradeoff: higher return potential requires higher risk.'
-	},
-	{
-		'q': 'HFT strategies are most sensitive to…',
-		'options': ['Long-term fundamentals', 'Transaction latency', 'P/E ratio', 'Dividend yield'],
-		'answer': 1,
-		'expl': 'HFT depends on low latency infrastructure and microstructure.'
-	},
-	{
-		'q': 'A limit order will…',
-		'options': ['Execute at any price immediately', 'Execute at your specified price or better', 'Never execute', 'Always execute worse than market'],
-		'answer': 1,
-		'expl': 'Limit orders control execution price but may miss fills.'
-	},
-	{
-		'q': 'What helps reduce impact of behavioral biases?',
-		'options': ['Impulse trading', 'No plan', 'Rules-based approach', 'Chasing hot tips'],
-		'answer': 2,
-		'expl': 'Rules and checklists reduce impulsive decisions.'
-	},
-]
+from modules.persistence import append_leaderboard_entry
+from modules.leaderboard import get_leaderboard
+from modules.engine.quiz import QUIZ_LENGTH, grade
+from modules.question_bank import DEFAULT_LANG, get_mastery_store, get_question_bank
+
+
+# Recently shown question ids kept per session, so new quizzes avoid repeats
+SEEN_LIMIT = 200
+
+
+def _user_id() -> str:
+	return st.session_state.get('user_id', 'default')
+
+
+def _new_quiz(lang: str) -> None:
+	mastery = get_mastery_store().get(_user_id())
+	seen = st.session_state.get('quiz_seen', [])
+	st.session_state['quiz_ids'] = get_question_bank().select(mastery, lang, QUIZ_LENGTH, exclude=seen)
+	st.session_state['quiz_lang'] = lang
+	# Identifies this draw, so resubmitting it does not count the answers again
+	st.session_state['quiz_draw'] = st.session_state.get('quiz_draw', 0) + 1
 
 
 def render_quizzes() -> None:
 	st.title('Quizzes')
-	selected = {}
-	for idx, q in enumerate(QUESTIONS):
+	bank = get_question_bank()
+	languages = bank.languages()
+	lang = DEFAULT_LANG
+	if len(languages) > 1:
+		lang = st.selectbox('Language', languages, index=languages.index(DEFAULT_LANG) if DEFAULT_LANG in languages else 0)
+	if 'quiz_ids' not in st.session_state or st.session_state.get('quiz_lang') != lang:
+		_new_quiz(lang)
+	st.button('New questions', on_click=_new_quiz, args=(lang,))
+
+	questions = bank.questions(st.session_state['quiz_ids'])
+	selected = []
+	for idx, q in enumerate(questions):
 		st.subheader(f"Q{idx+1}. {q['q']}")
-		selected[idx] = st.radio('Choose one', q['options'], index=None, key=f"q_{idx}")
+		selected.append(st.radio('Choose one', range(len(q['options'])), format_func=q['options'].__getitem__, index=None, key=f"q_{q['id']}"))
 
 	name = st.text_input('Your name for leaderboard (optional)')
 
 	if st.button('Submit Quiz'):
-		score = 0
-		for idx, q in enumerate(QUESTIONS):
-			choice = selected[idx]
-			if choice is None:
+		score, total, outcomes = grade(selected, questions)
+		for idx, (q, outcome) in enumerate(zip(questions, outcomes)):
+			if outcome is None:
 				st.warning(f"Question {idx+1} not answered")
-				continue
-			if q['options'].index(choice) == q['answer']:
-				score += 1
+			elif outcome:
 				st.success(f"Q{idx+1}: Correct! {q['expl']}")
 			else:
 				correct = q['options'][q['answer']]
 				st.error(f"Q{idx+1}: Incorrect. Correct: {correct}. {q['expl']}")
 
-		st.subheader(f"Score: {score} / {len(QUESTIONS)}")
+		if st.session_state.get('quiz_recorded') != st.session_state['quiz_draw']:
+			st.session_state['quiz_recorded'] = st.session_state['quiz_draw']
+			try:
+				get_mastery_store().record(_user_id(), [(q['topic'], o) for q, o in zip(questions, outcomes) if o is not None])
+			except sqlite3.Error:
+				st.warning('Could not save your topic progress; the next quiz will not adapt to these answers.')
+			st.session_state['quiz_seen'] = (st.session_state.get('quiz_seen', []) + [q['id'] for q in questions])[-SEEN_LIMIT:]
+
+		st.subheader(f"Score: {score} / {total}")
 		best = st.session_state.get('best_quiz_score', 0)
 		if score > best:
 			st.session_state['best_quiz_score'] = score
 			st.balloons()
 			st.info('New best score!')
 		else:
-			st.info(f"Best score so far: {best} / {len(QUESTIONS)}")
+			st.info(f"Best score so far: {best} / {total}")
 
 		if name.strip():
 			append_leaderboard_entry(name, score)
-			st.success('Added to leaderboard!')
+			rank = get_leaderboard().rank_of(name.strip())
+			st.success(f"Added to leaderboard! Your best score ranks #{rank}." if rank else 'Added to leaderboard!')
 
 		# Show leaderboard
 		lb = st.session_state.get('leaderboard', [])
@@ -77,3 +82,12 @@ def render_quizzes() -> None:
 			st.subheader('Leaderboard (Top)')
 			for i, row in enumerate(lb[:10], start=1):
 				st.write(f"{i}. {row['name']} — {row['score']}")
+
+	board = get_leaderboard()
+	total = board.size()
+	if total > 10:
+		with st.expander(f"Full leaderboard ({total} players)"):
+			per_page = 25
+			page = st.number_input('Page', min_value=1, max_value=(total - 1) // per_page + 1, value=1, step=1)
+			for i, row in enumerate(board.page(page, per_page), start=(page - 1) * per_page + 1):
+				st.write(f"{i}. {row['name']} — {row['score']}")
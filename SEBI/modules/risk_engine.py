@@ -0,0 +1,147 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# Largest acceptable 95% VaR, as a fraction of portfolio value over the horizon
+PROFILE_VAR_LIMITS = {
+	'Conservative': 0.05,
+	'Balanced': 0.10,
+	'Aggressive': 0.20,
+}
+
+# Bytes of simulated returns held at once; paths are generated in chunks under this
+_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Daily returns needed for a sample covariance; with fewer it is NaN and so is every VaR
+MIN_RETURNS = 2
+
+_CACHE: 'OrderedDict[str, dict]' = OrderedDict()
+_CACHE_SIZE = 16
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(qty: Dict[str, int], cash: float, close: pd.DataFrame, n_paths: int, horizon: int) -> str:
+	h = hashlib.sha256()
+	h.update(repr((sorted(qty.items()), round(cash, 2), n_paths, horizon)).encode('utf-8'))
+	h.update(pd.util.hash_pandas_object(close, index=True).to_numpy().tobytes())
+	h.update(repr(list(close.columns)).encode('utf-8'))
+	return h.hexdigest()
+
+
+def simulate(
+	values: np.ndarray,
+	log_returns: np.ndarray,
+	cash: float = 0.0,
+	n_paths: int = 100_000,
+	horizon: int = 20,
+	seed: int = 0,
+) -> dict:
+	"""Simulate correlated log-return paths from the historical mean and covariance.
+
+	``values`` is the current market value per holding and ``log_returns`` a
+	(days x holdings) history. Returns VaR/CVaR of the horizon P&L and the
+	distribution of each path's maximum drawdown, both as fractions of the
+	starting value.
+	"""
+	k = len(values)
+	mu = log_returns.mean(axis=0)
+	cov = np.atleast_2d(np.cov(log_returns, rowvar=False))
+	# Small ridge keeps Cholesky stable for collinear or constant series
+	chol = np.linalg.cholesky(cov + np.eye(k) * 1e-12)
+	start = float(values.sum() + cash)
+	rng = np.random.default_rng(seed)
+	chunk = max(1, min(n_paths, _CHUNK_BYTES // (8 * horizon * k)))
+	pnl = np.empty(n_paths)
+	max_dd = np.empty(n_paths)
+	for lo in range(0, n_paths, chunk):
+		n = min(chunk, n_paths - lo)
+		steps = mu + rng.standard_normal((n, horizon, k)) @ chol.T
+		paths = np.exp(np.cumsum(steps, axis=1)) @ values + cash
+		paths = np.concatenate([np.full((n, 1), start), paths], axis=1)
+		pnl[lo:lo + n] = paths[:, -1] / start - 1.0
+		max_dd[lo:lo + n] = (paths / np.maximum.accumulate(paths, axis=1) - 1.0).min(axis=1)
+	out = {'start_value': start, 'n_paths': n_paths, 'horizon': horizon, 'pnl': pnl, 'max_drawdown': max_dd}
+	for level in (0.95, 0.99):
+		cutoff = np.quantile(pnl, 1 - level)
+		out[f"var_{int(level * 100)}"] = float(-cutoff)
+		out[f"cvar_{int(level * 100)}"] = float(-pnl[pnl <= cutoff].mean())
+	out['drawdown_quantiles'] = {q: float(np.quantile(max_dd, 1 - q)) for q in (0.5, 0.95, 0.99)}
+	return out
+
+
+def portfolio_risk(
+	qty: Dict[str, int],
+	cash: float,
+	close: pd.DataFrame,
+	n_paths: int = 100_000,
+	horizon: int = 20,
+) -> dict:
+	"""Cached :func:`simulate` for a set of holdings; unchanged inputs return the stored result.
+
+	Raises ValueError when the holdings have fewer than ``MIN_RETURNS`` days of overlapping returns.
+	"""
+	key = _cache_key(qty, cash, close, n_paths, horizon)
+	with _CACHE_LOCK:
+		result = _CACHE.get(key)
+		if result is not None:
+			_CACHE.move_to_end(key)
+			return result
+	symbols = [s for s in qty if s in close.columns]
+	prices = close[symbols].dropna()
+	log_returns = np.diff(np.log(prices.to_numpy()), axis=0)
+	if len(log_returns) < MIN_RETURNS:
+		raise ValueError(f"{len(prices)} overlapping closes; at least {MIN_RETURNS + 1} are needed")
+	values = prices.iloc[-1].to_numpy() * np.array([qty[s] for s in symbols], dtype=float)
+	result = simulate(values, log_returns, cash, n_paths, horizon)
+	with _CACHE_LOCK:
+		result = _CACHE.setdefault(key, result)
+		while len(_CACHE) > _CACHE_SIZE:
+			_CACHE.popitem(last=False)
+	return result
+
+
+def assess(result: dict, profile: str) -> Tuple[bool, str]:
+	limit = PROFILE_VAR_LIMITS.get(profile)
+	if limit is None:
+		return True, 'Take the Risk Profiler to compare this portfolio with your risk tolerance.'
+	var = result['var_95']
+	if var <= limit:
+		return True, f"95% VaR of {var:.1%} is within the {limit:.0%} suited to a {profile} investor."
+	return False, f"95% VaR of {var:.1%} exceeds the {limit:.0%} suited to a {profile} investor. Consider diversifying or holding more cash."
+
+
+def render_risk_panel(portfolio: dict, close: pd.DataFrame) -> None:
+	with st.expander('Risk analysis (Monte Carlo VaR/CVaR)'):
+		qty = {s: p['qty'] for s, p in portfolio['positions'].items() if s in close.columns}
+		if not qty:
+			st.write('Buy some positions to analyse portfolio risk.')
+			return
+		c1, c2 = st.columns(2)
+		horizon = c1.selectbox('Horizon (trading days)', [1, 5, 20, 60], index=2)
+		n_paths = c2.select_slider('Simulated paths', [10_000, 50_000, 100_000, 250_000], value=100_000)
+		if not st.toggle('Run simulation', key='risk_run'):
+			return
+		try:
+			result = portfolio_risk(qty, portfolio['cash'], close, n_paths, horizon)
+		except ValueError:
+			st.info('Not enough overlapping price history across these holdings to estimate risk yet.')
+			return
+		start = result['start_value']
+		cols = st.columns(4)
+		cols[0].metric('VaR 95%', f"₹{result['var_95'] * start:,.0f}", f"{-result['var_95']:.1%}")
+		cols[1].metric('CVaR 95%', f"₹{result['cvar_95'] * start:,.0f}", f"{-result['cvar_95']:.1%}")
+		cols[2].metric('VaR 99%', f"₹{result['var_99'] * start:,.0f}", f"{-result['var_99']:.1%}")
+		cols[3].metric('Median max drawdown', f"{result['drawdown_quantiles'][0.5]:.1%}")
+		counts, edges = np.histogram(result['pnl'], bins=60)
+		st.bar_chart(pd.DataFrame({'Paths': counts}, index=np.round(edges[:-1] * 100, 2)))
+		ok, message = assess(result, st.session_state.get('risk_profile', 'Unprofiled'))
+		if ok:
+			st.success(message)
+		else:
+			st.warning(message)
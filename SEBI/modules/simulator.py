@@ -1,66 +1,69 @@
 import streamlit as st
+import sqlite3
 import pandas as pd
-import numpy as np
-import yfinance as yf
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from modules.charts import chart_range, plot_price
+from modules.engine.portfolio import apply_trade
+from modules.journal import RECENT_TRADES, record_trade, render_trade_export
+from modules.ledger import PortfolioLedger
+from modules.market_data import close_matrix
+from modules.metrics import cached
+from modules.optimizer import render_optimizer_panel
+from modules.orderbook import MatchingEngine, Settle, describe_fill, render_open_orders, render_order_ticket
+from modules.price_store import get_price_store
+from modules.risk_engine import render_risk_panel
+from modules.watchlist import MAX_EXPANDED, render_watchlist
+
+
+@cached('fetch_history', st.cache_data(show_spinner=False, ttl=3600))
+def _fetch_history_batch(tickers: Tuple[str, ...], days: int = 60) -> Dict[str, pd.DataFrame]:
+	return get_price_store().get_history(tickers, days)
 
 
-@st.cache_data(show_spinner=False, ttl=3600)
 def _fetch_history(ticker: str, days: int = 60) -> pd.DataFrame:
+	return _fetch_history_batch((ticker,), days)[ticker]
+
+
+def _ledger(portfolio: dict) -> PortfolioLedger:
+	# Rebuilt only when the portfolio dict itself is replaced (e.g. by load_state)
+	cached = st.session_state.get('_ledger')
+	if cached is None or cached[0] is not portfolio:
+		cached = (portfolio, PortfolioLedger.from_portfolio(portfolio))
+		st.session_state['_ledger'] = cached
+	return cached[1]
+
+
+def _update_position(portfolio: dict, symbol: str, qty: int, price: float) -> Optional[str]:
+	error = apply_trade(portfolio, _ledger(portfolio), symbol, qty, price)
+	if error:
+		return error
+	ts = datetime.utcnow().isoformat()
 	try:
-		data = yf.download(ticker, period=f"{days}d", interval="1d", progress=False, auto_adjust=True)
-		data = data.reset_index()
-		if data is None or data.empty:
-			raise ValueError('No data')
-		return data
-	except Exception:
-		# Fallback: synthetic random-walk data for demo stability
-		dates = pd.date_range(end=pd.Timestamp.today(), periods=days, freq='D')
-		prices = np.cumprod(1 + np.random.normal(0, 0.01, size=days)) * 100
-		return pd.DataFrame({'Date': dates, 'Close': prices})
-
-
-def _plot_price(df: pd.DataFrame, title: str):
-	if df.empty:
-		st.warning('No data available')
-		return
-	fig = go.Figure()
-	fig.add_trace(go.Scatter(x=df['Date'], y=df['Close'], mode='lines', name='Close'))
-	fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Price')
-	st.plotly_chart(fig, use_container_width=True)
-
-
-def _update_position(portfolio: dict, symbol: str, qty: int, price: float) -> None:
-	positions = portfolio['positions']
-	cash = portfolio['cash']
-	cost = qty * price
-	if qty > 0 and cash < cost:
-		st.error('Not enough cash')
-		return
-	positions.setdefault(symbol, {'qty': 0, 'avg': 0.0})
-	pos = positions[symbol]
-	new_qty = pos['qty'] + qty
-	if new_qty < 0:
-		st.error('Cannot sell more than held')
-		return
-	if qty > 0:
-		pos['avg'] = (pos['avg'] * pos['qty'] + cost) / max(new_qty, 1)
-		portfolio['cash'] -= cost
-	elif qty < 0:
-		portfolio['cash'] -= cost  # qty negative, increases cash
-	pos['qty'] = new_qty
-	if pos['qty'] == 0:
-		positions.pop(symbol, None)
-	portfolio['history'].append({'ts': datetime.utcnow().isoformat(), 'symbol': symbol, 'qty': qty, 'price': price})
+		record_trade(portfolio, ts, symbol, qty, price)
+	except sqlite3.Error:
+		st.warning('Could not write this trade to the journal; it is kept for this session only.')
+	history = portfolio['history']
+	history.append({'ts': ts, 'symbol': symbol, 'qty': qty, 'price': price})
+	del history[:-RECENT_TRADES]
+	return None
+
+
+def _engine() -> MatchingEngine:
+	# Resting orders live for the session
+	if '_orders' not in st.session_state:
+		st.session_state['_orders'] = MatchingEngine()
+	return st.session_state['_orders']
+
+
+def _settle(portfolio: dict) -> Settle:
+	return lambda order, qty, price: _update_position(portfolio, order.symbol, qty, price)
 
 
 def _portfolio_value(portfolio: dict, prices: dict) -> float:
-	value = portfolio['cash']
-	for sym, pos in portfolio['positions'].items():
-		price = prices.get(sym, pos['avg'])
-		value += pos['qty'] * price
-	return float(value)
+	ledger = _ledger(portfolio)
+	ledger.mark(prices)
+	return float(ledger.total_value)
 
 
 def render_simulator() -> None:
@@ -70,44 +73,65 @@ def render_simulator() -> None:
 	symbols = st.text_input('Symbols (comma-separated)', 'INFY.NS, ITC.NS, SBIN.NS')
 	symbol_list = [s.strip() for s in symbols.split(',') if s.strip()]
 
-	prices = {}
+	watchlist_mode = st.toggle(
+		'Watchlist mode', value=len(symbol_list) > MAX_EXPANDED, help='A sortable table of every symbol instead of a chart each'
+	)
+	if watchlist_mode:
+		histories = _fetch_history_batch(tuple(symbol_list), 120)
+		close = close_matrix(histories)
+		prices = {sym: float(p) for sym, p in close.iloc[-1].dropna().items()} if not close.empty else {}
+		shown = render_watchlist(close)
+	else:
+		if len(symbol_list) > MAX_EXPANDED:
+			st.caption(f"Showing the first {MAX_EXPANDED} symbols; switch on watchlist mode to see all {len(symbol_list)}.")
+		shown = symbol_list[:MAX_EXPANDED]
+		prices = {}
+
+	engine, settle = _engine(), _settle(portfolio)
+	pending = engine.resting_symbols()
+	if pending:
+		for fill in engine.replay_all(_fetch_history_batch(tuple(pending), 120), settle):
+			st.toast(describe_fill(fill))
+
+	if shown:
+		span, days = chart_range()
+		histories = _fetch_history_batch(tuple(shown), days)
 	cols = st.columns(2)
-	for i, sym in enumerate(symbol_list[:6]):
+	for i, sym in enumerate(shown):
 		with cols[i % 2]:
-			df = _fetch_history(sym, 120)
+			df = histories[sym]
 			if not df.empty:
 				last_price = float(df['Close'].iloc[-1])
 				prices[sym] = last_price
-				label = f"{sym} last: {last_price:.2f} {'(synthetic)' if 'yfinance' not in str(df.columns) else ''}"
+				label = f"{sym} last: {last_price:.2f} {'(synthetic)' if df.attrs.get('synthetic') else ''}"
 				st.caption(label)
-				_plot_price(df.tail(60), f"{sym} - Last 60 days")
-				qty = st.number_input(f"Qty for {sym}", min_value=1, max_value=10000, value=10, step=1, key=f"qty_{sym}")
-				c1, c2 = st.columns(2)
-				with c1:
-					if st.button(f"Buy {sym}", key=f"buy_{sym}"):
-						_update_position(portfolio, sym, qty, last_price)
-				with c2:
-					if st.button(f"Sell {sym}", key=f"sell_{sym}"):
-						_update_position(portfolio, sym, -qty, last_price)
+				plot_price(df, f"{sym} - Last {span}")
+				render_order_ticket(sym, df, engine, settle)
 			else:
 				st.warning(f"No data for {sym}")
 
 	st.subheader('Portfolio')
+	ledger = _ledger(portfolio)
+	ledger.mark(prices)
 	if portfolio['positions']:
-		rows = []
-		for sym, pos in portfolio['positions'].items():
-			mkt = prices.get(sym, pos['avg'])
-			unreal = (mkt - pos['avg']) * pos['qty']
-			rows.append({'Symbol': sym, 'Qty': pos['qty'], 'Avg Price': round(pos['avg'], 2), 'Market': round(mkt, 2), 'Unrealized PnL': round(unreal, 2)})
-		st.dataframe(rows, use_container_width=True)
+		st.dataframe(ledger.positions_frame(), use_container_width=True, hide_index=True)
 	else:
 		st.write('No positions yet.')
+	render_open_orders(engine)
+
+	held = tuple(sorted(portfolio['positions']))
+	if held:
+		render_risk_panel(portfolio, close_matrix(_fetch_history_batch(held, 365)))
+
+	if symbol_list:
+		# Prices for the whole watchlist are only loaded once the allocation is asked for
+		render_optimizer_panel(
+			portfolio,
+			lambda: close_matrix(_fetch_history_batch(tuple(dict.fromkeys(symbol_list)), 365)),
+			lambda symbol, qty, price: _update_position(portfolio, symbol, qty, price),
+		)
 
-	# Export history
-	hist = pd.DataFrame(portfolio['history'])
-	if not hist.empty:
-		csv = hist.to_csv(index=False).encode('utf-8')
-		st.download_button('Download Trade History (CSV)', data=csv, file_name='trade_history.csv', mime='text/csv')
+	render_trade_export(st.session_state.get('user_id', 'default'))
 
 	total_value = _portfolio_value(portfolio, prices)
 	st.metric('Cash', f"₹{portfolio['cash']:.2f}")
@@ -0,0 +1,119 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from modules.db import APP_DIR, connect
+
+
+DB_FILE = APP_DIR / 'sebi.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_state (
+	user_id TEXT NOT NULL,
+	key TEXT NOT NULL,
+	value TEXT NOT NULL,
+	PRIMARY KEY (user_id, key)
+) WITHOUT ROWID;
+"""
+
+DEFAULT_CASH = 100000.0
+
+
+def sanitize_user_id(user_id: str) -> str:
+	user_id = re.sub(r'[^A-Za-z0-9_.@-]', '', (user_id or '').strip())[:64]
+	return user_id or 'default'
+
+
+def flatten(state: dict) -> Dict[str, str]:
+	"""One JSON-encoded row per progress key, position and scalar; trades live in the journal."""
+	portfolio = state.get('portfolio', {})
+	items = {
+		'best_quiz_score': json.dumps(state.get('best_quiz_score', 0)),
+		'risk_profile': json.dumps(state.get('risk_profile', 'Unprofiled')),
+		'cash': json.dumps(portfolio.get('cash', DEFAULT_CASH)),
+	}
+	for key, done in state.get('progress', {}).items():
+		items[f"progress:{key}"] = json.dumps(done)
+	for sym, pos in portfolio.get('positions', {}).items():
+		items[f"position:{sym}"] = json.dumps(pos)
+	return items
+
+
+def account_items(portfolio: dict, symbols) -> Dict[str, Optional[str]]:
+	"""The ``flatten`` rows for cash and the given positions; None marks a position that is closed."""
+	positions = portfolio.get('positions', {})
+	items: Dict[str, Optional[str]] = {'cash': json.dumps(portfolio.get('cash', DEFAULT_CASH))}
+	for sym in symbols:
+		items[f"position:{sym}"] = json.dumps(positions[sym]) if sym in positions else None
+	return items
+
+
+def unflatten(items: Dict[str, str]) -> dict:
+	state = {'progress': {}, 'portfolio': {'cash': DEFAULT_CASH, 'positions': {}, 'history': []}}
+	for key, raw in items.items():
+		value = json.loads(raw)
+		if key.startswith('progress:'):
+			state['progress'][key[len('progress:'):]] = value
+		elif key.startswith('position:'):
+			state['portfolio']['positions'][key[len('position:'):]] = value
+		elif key == 'cash':
+			state['portfolio']['cash'] = value
+		else:
+			state[key] = value
+	return state
+
+
+class StateStore:
+	"""Per-user progress and portfolio in SQLite (trades are in ``modules.journal``).
+
+	``save`` diffs against the snapshot returned by the previous ``load``/``save``
+	and writes only changed keys, in one transaction. When the quiz score or
+	lesson progress changes, the cohort counters in ``modules.cohort`` are
+	adjusted in the same transaction.
+	"""
+
+	def __init__(self, path: Optional[Path] = None) -> None:
+		from modules.cohort import CohortStats
+
+		self.path = Path(path) if path is not None else DB_FILE
+		with self._conn() as conn:
+			conn.executescript(_SCHEMA)
+		CohortStats(self.path)
+
+	def _conn(self):
+		return connect(self.path)
+
+	def load(self, user_id: str) -> Tuple[Optional[dict], dict]:
+		items = dict(self._conn().execute('SELECT key, value FROM user_state WHERE user_id = ?', (user_id,)).fetchall())
+		if not items:
+			return None, {'items': {}}
+		return unflatten(items), {'items': items}
+
+	def save(self, user_id: str, state: dict, snapshot: Optional[dict] = None) -> dict:
+		from modules import cohort
+
+		previous = (snapshot or {'items': {}})['items']
+		current = flatten(state)
+		changed = [(user_id, k, v) for k, v in current.items() if previous.get(k) != v]
+		removed = [(user_id, k) for k in previous if k not in current]
+		with self._conn() as conn:
+			if any(cohort.tracked(row[1]) for row in changed + removed):
+				# Read the old values under the write lock so concurrent saves cannot both count them
+				conn.execute('BEGIN IMMEDIATE')
+				before = cohort.tracked_items(conn, user_id)
+				# What the rows will be once written, which with a stale snapshot is not just ``current``
+				after = dict(before)
+				after.update((k, v) for _, k, v in changed if cohort.tracked(k))
+				for _, k in removed:
+					after.pop(k, None)
+				cohort.apply(conn, cohort.deltas(cohort.summarize(before), cohort.summarize(after)))
+			conn.executemany('INSERT OR REPLACE INTO user_state VALUES (?, ?, ?)', changed)
+			conn.executemany('DELETE FROM user_state WHERE user_id = ? AND key = ?', removed)
+		return {'items': current}
+
+
+@lru_cache(maxsize=None)
+def get_state_store() -> StateStore:
+	return StateStore()
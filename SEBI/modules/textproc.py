@@ -0,0 +1,187 @@
+import codecs
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.content_cache import get_content_cache
+from modules.metrics import observe
+from modules.translation import translate_document
+
+
+_session_lock = threading.Lock()
+_session = None
+
+
+def http_session() -> requests.Session:
+	"""Process-wide session so repeated fetches reuse pooled keep-alive connections."""
+	global _session
+	with _session_lock:
+		if _session is None:
+			session = requests.Session()
+			adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=2)
+			session.mount('http://', adapter)
+			session.mount('https://', adapter)
+			_session = session
+	return _session
+
+
+# Text kept per page, and the most bytes read to find it
+MAX_CHARS = 100_000
+MAX_BYTES = 8 * 1024 * 1024
+
+_SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+_CHARSET = re.compile(r'charset=["\']?([\w-]+)', re.I)
+
+
+class _TextExtractor(HTMLParser):
+	"""Incremental visible-text extractor; set ``full`` once ``max_chars`` of text are collected."""
+
+	def __init__(self, max_chars: int) -> None:
+		super().__init__(convert_charrefs=True)
+		self.max_chars = max_chars
+		self.words = []
+		self.chars = 0
+		self.full = False
+		self._skip = 0
+		# Text can be handed over split mid-word at a feed boundary; hold the tail until a tag or space
+		self._partial = ''
+
+	def _add(self, words) -> None:
+		for word in words:
+			self.words.append(word)
+			self.chars += len(word) + 1
+			if self.chars > self.max_chars:
+				self.full = True
+				return
+
+	def _flush(self) -> None:
+		if self._partial:
+			self._add([self._partial])
+			self._partial = ''
+
+	def handle_starttag(self, tag, attrs) -> None:
+		self._flush()
+		if tag in _SKIP_TAGS:
+			self._skip += 1
+
+	def handle_endtag(self, tag) -> None:
+		self._flush()
+		if tag in _SKIP_TAGS and self._skip:
+			self._skip -= 1
+
+	def handle_data(self, data) -> None:
+		if self._skip or self.full:
+			return
+		words = (self._partial + data).split()
+		self._partial = words.pop() if words and not data[-1].isspace() else ''
+		self._add(words)
+
+	def close(self) -> None:
+		super().close()
+		self._flush()
+
+	def text(self) -> str:
+		return ' '.join(self.words)[:self.max_chars]
+
+
+def fetch_text_with_stats(
+	url: str,
+	session: requests.Session = None,
+	max_chars: int = MAX_CHARS,
+	max_bytes: int = MAX_BYTES,
+	chunk_size: int = 64 * 1024,
+) -> Tuple[str, dict]:
+	"""Stream a page and extract its visible text, stopping at ``max_chars`` of text or ``max_bytes`` read.
+
+	Returns ``(text, stats)``; stats has ``bytes``, ``chars``, ``truncated`` and
+	``timings`` (seconds waiting for headers, reading the body, and parsing).
+	Errors come back as ``'ERROR: ...'`` text, as from fetch_text.
+	"""
+	stats = {'bytes': 0, 'chars': 0, 'truncated': False, 'timings': {'connect': 0.0, 'download': 0.0, 'parse': 0.0}}
+	timings = stats['timings']
+	try:
+		t0 = time.perf_counter()
+		with (session or http_session()).get(url, timeout=15, stream=True) as resp:
+			timings['connect'] = time.perf_counter() - t0
+			resp.raise_for_status()
+			# requests assumes ISO-8859-1 for text/* without a charset; pages without one are nearly always UTF-8
+			charset = _CHARSET.search(resp.headers.get('Content-Type', ''))
+			decoder = codecs.getincrementaldecoder(charset.group(1) if charset else 'utf-8')(errors='replace')
+			extractor = _TextExtractor(max_chars)
+			chunks = resp.iter_content(chunk_size)
+			while not extractor.full:
+				t0 = time.perf_counter()
+				chunk = next(chunks, b'')
+				timings['download'] += time.perf_counter() - t0
+				if not chunk:
+					break
+				stats['bytes'] += len(chunk)
+				t0 = time.perf_counter()
+				extractor.feed(decoder.decode(chunk))
+				timings['parse'] += time.perf_counter() - t0
+				if stats['bytes'] >= max_bytes:
+					stats['truncated'] = True
+					break
+			t0 = time.perf_counter()
+			if not extractor.full:
+				extractor.feed(decoder.decode(b'', final=True))
+				extractor.close()
+			timings['parse'] += time.perf_counter() - t0
+		stats['truncated'] = stats['truncated'] or extractor.full
+		text = extractor.text()
+		stats['chars'] = len(text)
+		return text, stats
+	except Exception as e:
+		return f'ERROR: {e}', stats
+	finally:
+		observe('external_call_seconds', timings['connect'] + timings['download'], service='web')
+
+
+def fetch_text(url: str, session: requests.Session = None) -> str:
+	return fetch_text_with_stats(url, session)[0]
+
+
+SUMMARIZERS = {
+	'lsa': 'LSA (sumy, exact SVD)',
+	'fast': 'Fast (sparse TF-IDF, randomized SVD)',
+}
+
+
+def _summary(text: str, sentences: int, method: str) -> str:
+	"""The summary, or '' when none could be made (e.g. NLTK tokenizer data missing)."""
+	# Imported here so loading the Learn Hub does not pay for NumPy/NLTK until a summary is needed
+	try:
+		if method == 'fast':
+			from modules import fast_summary
+			return fast_summary.summarize(text, sentences)
+		from sumy.parsers.plaintext import PlaintextParser
+		from sumy.nlp.tokenizers import Tokenizer
+		from sumy.summarizers.lsa import LsaSummarizer
+		parser = PlaintextParser.from_string(text, Tokenizer('english'))
+		summarizer = LsaSummarizer()
+		summary_sentences = summarizer(parser.document, sentences)
+		return ' '.join(str(s) for s in summary_sentences)
+	except Exception:
+		return ''
+
+
+def summarize_text(text: str, sentences: int = 5, method: str = 'lsa') -> str:
+	return _summary(text, sentences, method) or text[:1500]
+
+
+def summarize(text: str, sentences: int = 5, method: str = 'lsa') -> str:
+	"""summarize_text through the shared on-disk cache; the first-1500-characters fallback is never stored."""
+	summary = get_content_cache().get_or_compute(
+		'summary', text, lambda: _summary(text, sentences, method), store_if=bool, sentences=sentences, method=method
+	)
+	return summary or text[:1500]
+
+
+def translate(text: str, target_lang: str) -> str:
+	"""Translate text of any length; each chunk is cached separately."""
+	return translate_document(text, target_lang)
@@ -0,0 +1,143 @@
+import os
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from modules.content_cache import ContentCache, get_content_cache
+from modules.metrics import timer
+
+
+class GoogleBackend:
+	name = 'google'
+	# GoogleTranslator rejects requests over 5000 characters
+	max_chars = 4500
+
+	def translate(self, text: str, target_lang: str) -> str:
+		from deep_translator import GoogleTranslator
+		return GoogleTranslator(source='auto', target=target_lang).translate(text)
+
+
+class LocalBackend:
+	"""Offline stand-in: tags each chunk with the target language after an optional delay."""
+
+	name = 'local'
+
+	def __init__(self, latency: float = 0.0, max_chars: int = 4500) -> None:
+		self.latency = latency
+		self.max_chars = max_chars
+		self.calls = 0
+
+	def translate(self, text: str, target_lang: str) -> str:
+		self.calls += 1
+		if self.latency:
+			time.sleep(self.latency)
+		return f"[{target_lang}] {text}"
+
+
+_BACKENDS = {
+	'google': GoogleBackend,
+	'local': LocalBackend,
+}
+
+
+def get_backend():
+	return _BACKENDS.get(os.environ.get('SEBI_TRANSLATOR', 'google'), GoogleBackend)()
+
+
+# A sentence ending or a paragraph break, kept so chunks reassemble to the original spacing
+_BREAK = re.compile(r'((?<=[.!?।])\s+|\n\s*\n)')
+
+# Minimum chunk size before a content-defined boundary may close it
+_MIN_CHUNK = 2000
+
+
+def _units(text: str, max_chars: int) -> List[str]:
+	parts = _BREAK.split(text)
+	units = [parts[i] + (parts[i + 1] if i + 1 < len(parts) else '') for i in range(0, len(parts), 2)]
+	out = []
+	for unit in units:
+		while len(unit) > max_chars:
+			cut = unit.rfind(' ', 0, max_chars)
+			cut = cut if cut > 0 else max_chars
+			out.append(unit[:cut])
+			unit = unit[cut:]
+		if unit:
+			out.append(unit)
+	return out
+
+
+def split_chunks(text: str, max_chars: int = 4500) -> List[str]:
+	"""Cut text at sentence boundaries into chunks of at most ``max_chars``.
+
+	Past ``_MIN_CHUNK`` characters a chunk ends at a paragraph break or after a
+	sentence whose checksum hits a fixed residue. Boundaries therefore depend
+	only on nearby text, so an edit changes only the chunk around it and the
+	rest stay cached. Joining the chunks gives back the original text.
+	"""
+	chunks: List[str] = []
+	current = ''
+	for unit in _units(text, max_chars):
+		if current and len(current) + len(unit) > max_chars:
+			chunks.append(current)
+			current = ''
+		current += unit
+		if len(current) >= _MIN_CHUNK and ('\n' in unit or zlib.crc32(unit.strip().encode('utf-8')) % 4 == 0):
+			chunks.append(current)
+			current = ''
+	if current:
+		chunks.append(current)
+	return chunks
+
+
+def _with_retry(backend, text: str, target_lang: str, retries: int, backoff: float) -> str:
+	for attempt in range(retries + 1):
+		try:
+			with timer('external_call_seconds', service='translate'):
+				return backend.translate(text, target_lang)
+		except Exception:
+			if attempt == retries:
+				raise
+			time.sleep(backoff * 2 ** attempt)
+
+
+def translate_document(
+	text: str,
+	target_lang: str,
+	backend=None,
+	max_workers: int = 4,
+	retries: int = 3,
+	backoff: float = 0.5,
+	cache: Optional[ContentCache] = None,
+) -> str:
+	"""Translate text of any length chunk by chunk, concurrently, caching each chunk.
+
+	Returns ``'Translation error: ...'`` if a chunk still fails after retries.
+	"""
+	backend = backend or get_backend()
+	cache = cache or get_content_cache()
+	chunks = split_chunks(text, backend.max_chars)
+	if not chunks:
+		return ''
+
+	def translate_chunk(chunk: str) -> str:
+		body = chunk.strip()
+		if not body:
+			return chunk
+		translated = cache.get_or_compute(
+			'translation', body, lambda: _with_retry(backend, body, target_lang, retries, backoff),
+			target_lang=target_lang, backend=backend.name,
+		)
+		# Keep the original whitespace around the chunk (paragraph breaks in particular)
+		lead = chunk[:len(chunk) - len(chunk.lstrip())]
+		tail = chunk[len(chunk.rstrip()):]
+		return lead + translated + tail
+
+	try:
+		if len(chunks) == 1:
+			return translate_chunk(chunks[0]).strip()
+		with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+			return ''.join(pool.map(translate_chunk, chunks)).strip()
+	except Exception as e:
+		return f'Translation error: {e}'
@@ -0,0 +1,81 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+PAGE_SIZE = 50
+SPARK_DAYS = 30
+TRADING_DAYS = 252
+
+# Full charts (and trade controls) open at once from the watchlist
+MAX_EXPANDED = 6
+
+_SORTS = {
+	'Symbol': ('Symbol', True),
+	'Top gainers': ('Change %', False),
+	'Top losers': ('Change %', True),
+	'Most volatile': ('Volatility %', False),
+	'Highest price': ('Last', False),
+}
+
+
+def watchlist_stats(close: pd.DataFrame, spark_days: int = SPARK_DAYS) -> pd.DataFrame:
+	"""Last price, day change, annualised volatility and sparkline for every column of a date x symbol matrix."""
+	values = close.to_numpy(dtype=float)
+	if values.shape[0] == 0:
+		return pd.DataFrame(columns=['Symbol', 'Last', 'Change %', 'Volatility %', 'Trend'])
+	last = values[-1]
+	prev = values[-2] if values.shape[0] > 1 else np.full_like(last, np.nan)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		change = (last / prev - 1.0) * 100.0
+		log_returns = np.diff(np.log(values), axis=0)
+	counts = np.sum(~np.isnan(log_returns), axis=0)
+	vol = np.full_like(last, np.nan)
+	enough = counts > 1
+	if enough.any():
+		vol[enough] = np.nanstd(log_returns[:, enough], axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100.0
+	return pd.DataFrame({
+		'Symbol': close.columns.astype(str),
+		'Last': np.round(last, 2),
+		'Change %': np.round(change, 2),
+		'Volatility %': np.round(vol, 1),
+		'Trend': np.round(values[-spark_days:].T, 2).tolist(),
+	})
+
+
+def render_watchlist(close: pd.DataFrame, key: str = 'watchlist') -> List[str]:
+	"""Sortable, paginated table of every symbol; returns the symbols picked for a full chart."""
+	stats = watchlist_stats(close)
+	c1, c2, c3 = st.columns([2, 2, 1])
+	with c1:
+		order = st.selectbox('Sort by', list(_SORTS), key=f"{key}_sort")
+	with c2:
+		query = st.text_input('Filter symbols', key=f"{key}_filter").strip().upper()
+	if query:
+		stats = stats[stats['Symbol'].str.upper().str.contains(query, regex=False)]
+	column, ascending = _SORTS[order]
+	stats = stats.sort_values(column, ascending=ascending, na_position='last', kind='stable')
+	pages = max(1, -(-len(stats) // PAGE_SIZE))
+	with c3:
+		page = st.number_input('Page', min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+	shown = stats.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+	st.caption(f"{len(stats)} symbols • page {page} of {pages}")
+	st.dataframe(
+		shown,
+		use_container_width=True,
+		hide_index=True,
+		column_config={
+			'Last': st.column_config.NumberColumn(format='%.2f'),
+			'Change %': st.column_config.NumberColumn(format='%+.2f%%'),
+			'Volatility %': st.column_config.NumberColumn(format='%.1f%%', help='Annualised, from daily log returns'),
+			'Trend': st.column_config.LineChartColumn(f"Last {SPARK_DAYS} days"),
+		},
+	)
+	return st.multiselect(
+		'Open charts and trade',
+		list(close.columns),
+		max_selections=MAX_EXPANDED,
+		key=f"{key}_expanded",
+	)